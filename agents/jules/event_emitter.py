@@ -0,0 +1,75 @@
+"""
+Buffered event emitter: collects agent events and posts them to the backend's
+/events/batch endpoint in one request per flush instead of one request per event.
+
+    emitter = BufferedEventEmitter(BACKEND, "agent:jules", max_batch=100, flush_interval=1.0)
+    emitter.emit("update", {"progress": 50})
+    ...
+    emitter.close()  # flushes what is left
+"""
+import threading
+import requests
+
+class BufferedEventEmitter:
+    def __init__(self, backend: str, actor: str, max_batch: int = 100, flush_interval: float = 1.0,
+                 session=None, timeout: float = 30):
+        self.url = f"{backend}/events/batch"
+        self.actor = actor
+        self.max_batch = max_batch
+        # Seconds a buffered event may wait before a background flush; None disables time-based flushing
+        self.flush_interval = flush_interval
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.results = []  # Server responses ({event_id, signature, ts}) in emit order
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._timer = None
+        if flush_interval:
+            self._timer = threading.Thread(target=self._flush_periodically, name="event-emitter", daemon=True)
+            self._timer.start()
+
+    def emit(self, action: str, payload: dict):
+        with self._lock:
+            self._buffer.append({"actor": self.actor, "action": action, "payload": payload})
+            full = len(self._buffer) >= self.max_batch
+        if full:
+            self.flush()
+
+    def flush(self) -> list:
+        """Posts all buffered events; returns their results. Failed events stay buffered for the next flush."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return []
+            try:
+                r = self.session.post(self.url, json=batch, timeout=self.timeout)
+                r.raise_for_status()
+            except Exception:
+                with self._lock:
+                    self._buffer[:0] = batch
+                raise
+            results = r.json()
+            self.results.extend(results)
+            return results
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Event flush failed (will retry): {e}")
+
+    def close(self):
+        self._closed.set()
+        if self._timer:
+            self._timer.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
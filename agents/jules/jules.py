@@ -3,7 +3,7 @@ Jules agent: announces intent, calls backend /submit (simulated),
 creates simple SymPy check, emits signed events to /events.
 Replace OPENAI placeholder later.
 """
-import os, time, json, requests, hmac, hashlib, uuid
+import os, sys, time, json, random, requests, hmac, hashlib, uuid
 from sympy import symbols, Integral
 from sympy import simplify
 from pathlib import Path
@@ -11,6 +11,9 @@ from pathlib import Path
 BACKEND = os.environ.get("BACKEND_URL", "http://backend:8000")
 AGENT_ID = "agent:jules"
 SECRET = os.environ.get("EFAIAGENTSECRET", "dev-secret")  # same secret as backend
+# Delay before reconnecting to the event stream: doubles per reconnect without new events, up to the max
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 60.0
 
 def sign(payload: str) -> str:
     return hmac.new(SECRET.encode(), payload.encode(), hashlib.sha256).hexdigest()
@@ -24,22 +27,64 @@ def post_event(action: str, payload: dict):
 
 def get_latest_submission():
     """Fetches the latest submission event from the backend."""
-    url = f"{BACKEND}/events?limit=100"
-    r = requests.get(url)
+    return latest_submission()[0]
+
+def latest_submission():
+    """(claim, stream cursor) of the latest submission; the claim is None when there is none yet."""
+    url = f"{BACKEND}/events/latest"
+    r = requests.get(url, params={"action": "submission"})
+    if r.status_code == 404:
+        return None, r.headers.get("X-Stream-Cursor")
     r.raise_for_status()
-    events = r.json()
-    for event in events:
-        if event["action"] == "submission":
-            # Reconstruct the claim from the payload
-            doc = event["payload"]
-            claim = {
-                "claim_id": str(uuid.uuid4()), # The original claim_id is not in the event
-                "canonical_text": doc.get("text", "")[:200],
-                "stubsympy": "Integral(Phiconst, (t, ti, tf)) >= rho_infl * V6",
-                "fixtures": doc.get("fixtures", [{"Phiconst": 1e-5, "V6": 1e60, "rhoinfl": 1e-30, "ti": 1e-36, "tf": 1e-34}]),
-            }
-            return claim
-    return None
+    return claim_from_submission(r.json()), r.headers.get("X-Stream-Cursor")
+
+def stream_events(action=None, actor=None, cursor=None):
+    """Yields (cursor, event) from the backend's server-sent event feed; blocks until events arrive."""
+    params = {k: v for k, v in {"action": action, "actor": actor, "cursor": cursor}.items() if v}
+    with requests.get(f"{BACKEND}/events/stream", params=params, stream=True, timeout=(10, None)) as r:
+        r.raise_for_status()
+        event_id, data = None, None
+        for line in r.iter_lines(decode_unicode=True):
+            if line.startswith("id: "):
+                event_id = line[4:]
+            elif line.startswith("data: "):
+                data = line[6:]
+            elif line == "" and data is not None:
+                if event_id:
+                    yield event_id, json.loads(data)
+                event_id, data = None, None
+
+def watch_submissions(cursor=None, sleep=time.sleep):
+    """
+    Yields a claim for every submission after `cursor` (a stream position, e.g. from
+    latest_submission(); None means from now on), resuming from the last seen one after
+    disconnects. Every reconnect (error or the server closing the stream) waits with jittered
+    exponential backoff; the delay resets once an event arrives.
+    """
+    delay = RECONNECT_MIN_SECONDS
+    while True:
+        try:
+            for cursor, event in stream_events(action="submission", cursor=cursor):
+                delay = RECONNECT_MIN_SECONDS
+                yield claim_from_submission(event)
+            reason = "stream closed"
+        except requests.RequestException as e:
+            reason = f"stream interrupted ({e})"
+        wait = random.uniform(delay / 2, delay)
+        print(f"Event {reason}; reconnecting in {wait:.1f}s")
+        sleep(wait)
+        delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+def claim_from_submission(event):
+    # Reconstruct the claim from the payload
+    doc = event["payload"]
+    claim = {
+        "claim_id": str(uuid.uuid4()), # The original claim_id is not in the event
+        "canonical_text": doc.get("text", "")[:200],
+        "stubsympy": "Integral(Phiconst, (t, ti, tf)) >= rho_infl * V6",
+        "fixtures": doc.get("fixtures", [{"Phiconst": 1e-5, "V6": 1e60, "rhoinfl": 1e-30, "ti": 1e-36, "tf": 1e-34}]),
+    }
+    return claim
 
 def run_sympy_check(claim):
     # parse the stub and run a numeric check on the fixture
@@ -104,18 +149,31 @@ def execute_plan_tasks(plan_path="agents/jules/PLAN.md"):
                 print("  -> (Placeholder) Writing unit tests...")
 
 
-def main():
+def main(watch=False):
+    """Processes the latest submission, or with `watch` (--watch) every new one from the event stream."""
     print("Jules agent bootstrap starting")
 
     # Read and execute tasks from the PLAN.md file
     execute_plan_tasks()
 
+    if watch:
+        # Handle a submission posted before we started, then follow the stream from it
+        claim, cursor = latest_submission()
+        if claim:
+            process_claim(claim)
+        for claim in watch_submissions(cursor):
+            process_claim(claim)
+        return
+
     # Fetch the latest submission instead of creating a new one
     claim = get_latest_submission()
     if not claim:
         print("No submission found. Exiting.")
         return
+    process_claim(claim)
+    print("Jules finished")
 
+def process_claim(claim):
     print("Claim received:", claim)
     trace = run_sympy_check(claim)
     print("Numeric trace:", trace)
@@ -133,7 +191,6 @@ def main():
     checkpoint_artifact()
     # open PR stub
     open_pr_stub("agent/jules/bootstrap", "bootstrap pipeline test")
-    print("Jules finished")
 
 if __name__ == "__main__":
-    main()
+    main(watch="--watch" in sys.argv[1:])
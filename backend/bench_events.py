@@ -0,0 +1,60 @@
+"""
+Event insert throughput: connection-per-request (the previous handlers) vs the pooled WAL
+EventStore with and without group commit.
+
+    python bench_events.py --threads 32 --events 200
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse, json, os, sqlite3, tempfile, time, uuid
+from event_store import EventStore, INSERT_EVENT, SCHEMA
+
+def make_row(i: int):
+    return (str(uuid.uuid4()), "agent:bench", "intent", json.dumps({"i": i}), "0" * 64, time.time())
+
+def insert_connect_per_request(path: str):
+    def insert(row):
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute(INSERT_EVENT, row)
+        conn.commit()
+        conn.close()
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    conn.close()
+    return insert, lambda: None
+
+def insert_pooled(path: str, group_commit: bool, synchronous: str):
+    store = EventStore(path, synchronous=synchronous, group_commit=group_commit)
+    return store.insert, store.close
+
+def run(insert, threads: int, events: int) -> float:
+    def worker(t):
+        for i in range(events):
+            insert(make_row(t * events + i))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, range(threads)))
+    return threads * events / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32, help="Concurrent writers (simulated requests)")
+    parser.add_argument("--events", type=int, default=200, help="Events per writer")
+    parser.add_argument("--synchronous", default="NORMAL", help="SQLite synchronous pragma for the pooled store")
+    args = parser.parse_args()
+
+    setups = {
+        "connect-per-request": lambda path: insert_connect_per_request(path),
+        "pooled WAL": lambda path: insert_pooled(path, False, args.synchronous),
+        "pooled WAL + group commit": lambda path: insert_pooled(path, True, args.synchronous),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, setup in setups.items():
+            insert, close = setup(os.path.join(tmp, f"{uuid.uuid4().hex}.db"))
+            try:
+                rate = run(insert, args.threads, args.events)
+            finally:
+                close()
+            print(f"{name:<28} {rate:>10.0f} events/sec")
+
+if __name__ == "__main__":
+    main()
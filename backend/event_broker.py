@@ -0,0 +1,69 @@
+"""
+In-process fanout of committed events to streaming subscribers (GET /events/stream).
+
+Each subscriber owns an asyncio queue on its event loop; publish() may be called from any
+thread and hands each event to the matching subscribers' loops. A subscriber that falls more
+than `max_queue` events behind is cut off (its queue receives None) and is expected to
+reconnect with its last cursor, replaying the gap from the database instead.
+"""
+from typing import Any, Dict, Iterable, Optional, Set
+import asyncio
+import threading
+
+class Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, actor: Optional[str], action: Optional[str], max_queue: int):
+        self.loop = loop
+        self.actor = actor
+        self.action = action
+        self.max_queue = max_queue
+        self.queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+        self.overflowed = False
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        return (self.actor is None or event["actor"] == self.actor) and (self.action is None or event["action"] == self.action)
+
+    def _offer(self, event: Dict[str, Any]):
+        # Runs on the subscriber's loop
+        if self.overflowed:
+            return
+        if self.queue.qsize() >= self.max_queue:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return
+        self.queue.put_nowait(event)
+
+class EventBroker:
+    def __init__(self, max_queue: int = 1000):
+        self.max_queue = max_queue
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, actor: Optional[str] = None, action: Optional[str] = None) -> Subscription:
+        """Must be called from the event loop that will consume the subscription."""
+        subscription = Subscription(asyncio.get_running_loop(), actor, action, self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, events: Iterable[Dict[str, Any]]):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+        for event in events:
+            for subscription in subscribers:
+                if subscription.matches(event):
+                    try:
+                        subscription.loop.call_soon_threadsafe(subscription._offer, event)
+                    except RuntimeError:
+                        self.unsubscribe(subscription)  # Its loop is closed
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
@@ -0,0 +1,213 @@
+"""
+Pooled SQLite event store for the provenance backend.
+
+Connections are opened once, in WAL mode (readers never block the writer), and reused, so
+each statement string is compiled once per connection (sqlite3's statement cache) instead of
+once per request. With group commit enabled, inserts from concurrent requests are handed to a
+single writer thread that commits them together in one transaction.
+"""
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Sequence, Tuple
+import queue
+import sqlite3
+import threading
+import time
+
+EventRow = Tuple[str, str, str, str, str, float]  # event_id, actor, action, payload, signature, ts
+
+SCHEMA = """CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY, actor TEXT, action TEXT, payload TEXT, signature TEXT, ts REAL
+)"""
+# Filtered scans walk an index newest-first; rowid (present in every index) breaks ts ties
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts)",
+    "CREATE INDEX IF NOT EXISTS idx_events_action_ts ON events(action, ts)",
+    "CREATE INDEX IF NOT EXISTS idx_events_actor_ts ON events(actor, ts)",
+)
+INSERT_EVENT = "INSERT INTO events(event_id, actor, action, payload, signature, ts) VALUES(?,?,?,?,?,?)"
+EVENT_COLUMNS = "rowid, event_id, actor, action, payload, signature, ts"
+
+class EventStore:
+    def __init__(self, path: str = "provenance.db", pool_size: int = 8, synchronous: str = "NORMAL",
+                 group_commit: bool = True, max_batch: int = 512, max_delay: float = 0.0):
+        self.path = path
+        self.synchronous = synchronous
+        self.group_commit = group_commit
+        self.max_batch = max_batch
+        # Extra time the writer waits for more inserts after the first one of a batch (seconds).
+        # 0 commits whatever queued up during the previous commit, which already batches under load.
+        self.max_delay = max_delay
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")  # Persistent: set once for the database file
+        conn.execute(SCHEMA)
+        for statement in INDEXES:
+            conn.execute(statement)
+        conn.commit()
+
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._pool.put(conn)
+        for _ in range(pool_size - 1):
+            self._pool.put(self._connect())
+
+        self._writes: "queue.Queue[Optional[Tuple[Sequence[EventRow], Future]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        if group_commit:
+            self._writer = threading.Thread(target=self._write_loop, name="event-store-writer", daemon=True)
+            self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, cached_statements=256)
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrows a pooled connection (blocks while all are in use)."""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    # --- Writes ---
+
+    def insert_many(self, rows: Sequence[EventRow]):
+        """Inserts rows in one transaction on a pooled connection."""
+        with self.connection() as conn, conn:
+            conn.executemany(INSERT_EVENT, rows)
+
+    def submit(self, rows: Sequence[EventRow]) -> Future:
+        """
+        Queues rows for the group-commit writer. The future resolves once the transaction holding
+        them has committed (or fails with its error). Without group commit the rows are inserted
+        immediately and a completed future is returned.
+        """
+        future: Future = Future()
+        if not self.group_commit:
+            try:
+                self.insert_many(rows)
+                future.set_result(len(rows))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        self._writes.put((rows, future))
+        return future
+
+    def insert(self, row: EventRow):
+        """Inserts one row and returns once it is committed."""
+        self.submit([row]).result()
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            item = self._writes.get()
+            if item is None:
+                break
+            batch = [item]
+            count = len(item[0])
+            # Gather whatever else is queued (or arrives within max_delay)
+            deadline = time.monotonic() + self.max_delay
+            while count < self.max_batch:
+                try:
+                    item = self._writes.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._writes.put(None)  # Finish this batch, then stop
+                    break
+                batch.append(item)
+                count += len(item[0])
+            self._commit_batch(conn, batch)
+        conn.close()
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: List[Tuple[Sequence[EventRow], Future]]):
+        try:
+            with conn:
+                conn.executemany(INSERT_EVENT, [row for rows, _ in batch for row in rows])
+        except sqlite3.Error:
+            # One bad request (e.g. a duplicate event_id) must not fail the others: retry one by one
+            for rows, future in batch:
+                try:
+                    with conn:
+                        conn.executemany(INSERT_EVENT, rows)
+                    future.set_result(len(rows))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+        for rows, future in batch:
+            future.set_result(len(rows))
+
+    # --- Reads ---
+
+    def query_events(self, actor: Optional[str] = None, action: Optional[str] = None,
+                     since: Optional[float] = None, until: Optional[float] = None,
+                     before: Optional[Tuple[float, int]] = None, limit: int = 100) -> List[tuple]:
+        """
+        Newest-first page of events as (rowid, event_id, actor, action, payload, signature, ts).
+        `before` is the (ts, rowid) of the last row of the previous page (keyset pagination), so
+        deep pages cost the same as the first one.
+        """
+        clauses, params = [], []
+        if actor is not None:
+            clauses.append("actor = ?")
+            params.append(actor)
+        if action is not None:
+            clauses.append("action = ?")
+            params.append(action)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        if before is not None:
+            clauses.append("(ts < ? OR (ts = ? AND rowid < ?))")
+            params.extend([before[0], before[0], before[1]])
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        sql = f"SELECT {EVENT_COLUMNS} FROM events {where}ORDER BY ts DESC, rowid DESC LIMIT ?"
+        return self.query(sql, params + [limit])
+
+    def query_events_after(self, actor: Optional[str] = None, action: Optional[str] = None,
+                           after: Optional[int] = None, limit: int = 500) -> List[tuple]:
+        """
+        Events with a rowid greater than `after`, in rowid order, in the same column layout as
+        query_events. SQLite has a single writer, so rowid order is commit order: a reader that
+        has seen rowid N never sees a smaller rowid committed later (unlike ts, which is
+        assigned before the write is queued).
+        """
+        clauses, params = [], []
+        if actor is not None:
+            clauses.append("actor = ?")
+            params.append(actor)
+        if action is not None:
+            clauses.append("action = ?")
+            params.append(action)
+        if after is not None:
+            clauses.append("rowid > ?")
+            params.append(after)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        sql = f"SELECT {EVENT_COLUMNS} FROM events {where}ORDER BY rowid LIMIT ?"
+        return self.query(sql, params + [limit])
+
+    def last_rowid(self) -> int:
+        """Rowid of the most recently committed event (0 when there is none)."""
+        return self.query("SELECT COALESCE(MAX(rowid), 0) FROM events")[0][0]
+
+    def rowid_of(self, event_id: str) -> Optional[int]:
+        rows = self.query("SELECT rowid FROM events WHERE event_id = ?", (event_id,))
+        return rows[0][0] if rows else None
+
+    def query(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with self.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def close(self):
+        if self._writer:
+            self._writes.put(None)
+            self._writer.join()
+            self._writer = None
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
@@ -0,0 +1,251 @@
+"""
+Hash chain and signed Merkle checkpoints over the events table.
+
+Events are chained in insertion (rowid) order: leaf = sha256 of the stored row,
+chain[n] = sha256(chain[n-1] || leaf[n]). Every `checkpoint_every` events a checkpoint records
+the chain head and the Merkle root of the segment's leaves, HMAC-signed with the backend secret.
+Because each checkpoint pins the chain hash a segment starts from, segments verify
+independently: the API re-checks only what follows the latest checkpoint, and the bulk
+verifier (verify_log.py) checks all segments in parallel.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+GENESIS = "0" * 64
+
+CHAIN_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS event_chain (
+        seq INTEGER PRIMARY KEY, event_id TEXT NOT NULL, leaf_hash TEXT NOT NULL, chain_hash TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS chain_checkpoints (
+        seq INTEGER PRIMARY KEY, start_seq INTEGER NOT NULL, count INTEGER NOT NULL,
+        chain_hash TEXT NOT NULL, merkle_root TEXT NOT NULL, signature TEXT NOT NULL, ts REAL NOT NULL
+    )""",
+)
+
+# (seq, event_id, actor, action, payload, signature, ts, chain_hash)
+ChainedRow = Tuple[int, str, str, str, str, str, float, Optional[str]]
+CHAINED_ROWS_SQL = """SELECT e.rowid, e.event_id, e.actor, e.action, e.payload, e.signature, e.ts, c.chain_hash
+    FROM events e LEFT JOIN event_chain c ON c.seq = e.rowid WHERE e.rowid > ? AND e.rowid <= ? ORDER BY e.rowid LIMIT ?"""
+
+# --- Hashing primitives ---
+
+def leaf_hash(event_id: str, actor: str, action: str, payload: str, signature: str, ts: float) -> str:
+    return hashlib.sha256(json.dumps([event_id, actor, action, payload, signature, ts]).encode()).hexdigest()
+
+def chain_step(prev_hash: str, leaf: str) -> str:
+    return hashlib.sha256(bytes.fromhex(prev_hash) + bytes.fromhex(leaf)).hexdigest()
+
+def merkle_root(leaves: Sequence[str]) -> str:
+    if not leaves:
+        return GENESIS
+    level = [bytes.fromhex(leaf) for leaf in leaves]
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+    return level[0].hex()
+
+def checkpoint_signature(secret: str, seq: int, chain_hash: str, root: str) -> str:
+    return hmac.new(secret.encode(), f"{seq}:{chain_hash}:{root}".encode(), hashlib.sha256).hexdigest()
+
+def verify_segment(rows: Sequence[ChainedRow], prev_hash: str, secret: str,
+                   checkpoint: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Verifies consecutive rows starting from chain hash `prev_hash`: each event's HMAC, each stored
+    chain hash and, if given, the checkpoint closing the segment (head hash, Merkle root,
+    signature). Pure function of its arguments, so segments can be checked in worker processes.
+    """
+    signer = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+    chain, leaves = prev_hash, []
+    for seq, event_id, actor, action, payload, signature, ts, stored_chain in rows:
+        # Same message as main.sign_event
+        expected_sig = signer.copy()
+        expected_sig.update((payload + actor + action + str(ts)).encode())
+        if not hmac.compare_digest(expected_sig.hexdigest(), signature):
+            return {"ok": False, "seq": seq, "error": f"Bad signature on event {event_id}", "count": len(leaves)}
+        leaf = leaf_hash(event_id, actor, action, payload, signature, ts)
+        chain = chain_step(chain, leaf)
+        if stored_chain is not None and stored_chain != chain:
+            return {"ok": False, "seq": seq, "error": f"Chain hash mismatch at event {event_id}", "count": len(leaves)}
+        leaves.append(leaf)
+
+    if checkpoint is not None:
+        seq = checkpoint["seq"]
+        if len(leaves) != checkpoint["count"] or chain != checkpoint["chain_hash"]:
+            return {"ok": False, "seq": seq, "error": f"Segment does not match checkpoint {seq}", "count": len(leaves)}
+        if merkle_root(leaves) != checkpoint["merkle_root"]:
+            return {"ok": False, "seq": seq, "error": f"Merkle root mismatch at checkpoint {seq}", "count": len(leaves)}
+        expected = checkpoint_signature(secret, seq, checkpoint["chain_hash"], checkpoint["merkle_root"])
+        if not hmac.compare_digest(expected, checkpoint["signature"]):
+            return {"ok": False, "seq": seq, "error": f"Bad signature on checkpoint {seq}", "count": len(leaves)}
+    return {"ok": True, "count": len(leaves), "head_hash": chain}
+
+def checkpoint_dict(row: tuple) -> Dict[str, Any]:
+    seq, start_seq, count, chain_hash, root, signature, ts = row
+    return {"seq": seq, "start_seq": start_seq, "count": count, "chain_hash": chain_hash,
+            "merkle_root": root, "signature": signature, "ts": ts}
+
+class HashChain:
+    """
+    Maintains event_chain/chain_checkpoints for an EventStore. extend() chains all events not yet
+    chained; with start() it runs on a background thread whenever notify() is called, so
+    request handlers never wait for hashing.
+    """
+    def __init__(self, store, secret: str, checkpoint_every: int = 1000):
+        self.store = store
+        self.secret = secret
+        self.checkpoint_every = checkpoint_every
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        with store.connection() as conn, conn:
+            for statement in CHAIN_SCHEMA:
+                conn.execute(statement)
+
+    # --- Background extension ---
+
+    def start(self, interval: float = 1.0):
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="event-hash-chain", daemon=True)
+        self._thread.start()
+
+    def notify(self):
+        self._wakeup.set()
+
+    def _run(self, interval: float):
+        while not self._stopped.is_set():
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            try:
+                self.extend()
+            except Exception:
+                logger.exception("Hash chain extension failed (will retry)")
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.extend()
+
+    # --- Chain maintenance ---
+
+    def head(self) -> Tuple[int, str]:
+        rows = self.store.query("SELECT seq, chain_hash FROM event_chain ORDER BY seq DESC LIMIT 1")
+        return rows[0] if rows else (0, GENESIS)
+
+    def checkpoints(self) -> List[Dict[str, Any]]:
+        rows = self.store.query("SELECT seq, start_seq, count, chain_hash, merkle_root, signature, ts FROM chain_checkpoints ORDER BY seq")
+        return [checkpoint_dict(r) for r in rows]
+
+    def extend(self, batch_size: int = 5000) -> int:
+        """Chains every unchained event (in rowid order) and writes due checkpoints; returns how many."""
+        chained = 0
+        with self._lock:
+            while True:
+                head_seq, head_hash = self.head()
+                rows = self.store.query(
+                    "SELECT rowid, event_id, actor, action, payload, signature, ts FROM events WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (head_seq, batch_size))
+                if not rows:
+                    return chained
+                links = []
+                for seq, event_id, actor, action, payload, signature, ts in rows:
+                    leaf = leaf_hash(event_id, actor, action, payload, signature, ts)
+                    head_hash = chain_step(head_hash, leaf)
+                    links.append((seq, event_id, leaf, head_hash))
+                with self.store.connection() as conn, conn:
+                    conn.executemany("INSERT INTO event_chain(seq, event_id, leaf_hash, chain_hash) VALUES(?,?,?,?)", links)
+                    self._write_due_checkpoints(conn)
+                chained += len(links)
+
+    def _write_due_checkpoints(self, conn):
+        while True:
+            row = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM chain_checkpoints").fetchone()
+            last = row[0]
+            segment = conn.execute("SELECT seq, leaf_hash, chain_hash FROM event_chain WHERE seq > ? ORDER BY seq LIMIT ?",
+                                   (last, self.checkpoint_every)).fetchall()
+            if len(segment) < self.checkpoint_every:
+                return
+            seq, chain_hash = segment[-1][0], segment[-1][2]
+            root = merkle_root([leaf for _, leaf, _ in segment])
+            signature = checkpoint_signature(self.secret, seq, chain_hash, root)
+            conn.execute("INSERT INTO chain_checkpoints(seq, start_seq, count, chain_hash, merkle_root, signature, ts) VALUES(?,?,?,?,?,?,?)",
+                         (seq, segment[0][0], len(segment), chain_hash, root, signature, time.time()))
+
+    # --- Verification ---
+
+    def verify(self, full: bool = False, from_seq: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Verifies the log from the latest checkpoint (or, with `from_seq`, the last checkpoint at or
+        before it; with `full`, from the first event) to the head. All checkpoint signatures are
+        checked as well, since they vouch for the segments that are skipped.
+        """
+        self.extend()
+        checkpoints = self.checkpoints()
+        for checkpoint in checkpoints:
+            expected = checkpoint_signature(self.secret, checkpoint["seq"], checkpoint["chain_hash"], checkpoint["merkle_root"])
+            if not hmac.compare_digest(expected, checkpoint["signature"]):
+                return {"ok": False, "seq": checkpoint["seq"], "error": f"Bad signature on checkpoint {checkpoint['seq']}",
+                        "verified_events": 0}
+
+        if full:
+            start = None
+        elif from_seq is not None:
+            start = next((c for c in reversed(checkpoints) if c["seq"] <= from_seq), None)
+        else:
+            start = checkpoints[-1] if checkpoints else None
+        start_seq, prev_hash = (start["seq"], start["chain_hash"]) if start else (0, GENESIS)
+
+        head_seq, _ = self.head()
+        verified = 0
+        by_end = {c["seq"]: c for c in checkpoints if c["seq"] > start_seq}
+        for segment_start, segment_end in self._segments(start_seq, head_seq, checkpoints):
+            rows = self.store.query(CHAINED_ROWS_SQL, (segment_start, segment_end, -1))
+            result = verify_segment(rows, prev_hash, self.secret, by_end.get(segment_end))
+            verified += result["count"]
+            if not result["ok"]:
+                return {**result, "verified_events": verified}
+            if (rows[-1][0] if rows else segment_start) != segment_end:
+                return {"ok": False, "seq": segment_end, "error": f"Chained event {segment_end} is missing", "verified_events": verified}
+            prev_hash = result["head_hash"]
+        return {"ok": True, "verified_events": verified, "from_seq": start_seq, "head_seq": head_seq,
+                "head_hash": prev_hash, "checkpoints": len(checkpoints)}
+
+    @staticmethod
+    def _segments(start_seq: int, head_seq: int, checkpoints: List[Dict[str, Any]]) -> Iterator[Tuple[int, int]]:
+        """(exclusive start, inclusive end) seq ranges split at checkpoints after start_seq."""
+        bounds = [c["seq"] for c in checkpoints if start_seq < c["seq"] <= head_seq]
+        if not bounds or bounds[-1] != head_seq:
+            bounds.append(head_seq)
+        previous = start_seq
+        for bound in bounds:
+            if bound > previous:
+                yield previous, bound
+            previous = bound
+
+    def export(self) -> Iterator[Dict[str, Any]]:
+        """NDJSON-ready records: every chained event in order, each checkpoint after its last event."""
+        self.extend()
+        checkpoints = {c["seq"]: c for c in self.checkpoints()}
+        head_seq, _ = self.head()
+        last = 0
+        while True:
+            rows = self.store.query(CHAINED_ROWS_SQL, (last, head_seq, 5000))
+            if not rows:
+                return
+            for seq, event_id, actor, action, payload, signature, ts, chain_hash in rows:
+                yield {"type": "event", "seq": seq, "event_id": event_id, "actor": actor, "action": action,
+                       "payload": payload, "signature": signature, "ts": ts, "chain_hash": chain_hash}
+                if seq in checkpoints:
+                    yield {"type": "checkpoint", **checkpoints[seq]}
+            last = rows[-1][0]
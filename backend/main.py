@@ -1,22 +1,67 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import Any, Dict, List
-import sqlite3, json, os, hmac, hashlib, time, uuid
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+from typing import Any, Dict, List, Optional, Union
+import asyncio, base64, json, os, hmac, hashlib, time, uuid
+from event_store import EventStore, EventRow
+from event_broker import EventBroker
+from hash_chain import HashChain
 
 app = FastAPI()
-DB = "provenance.db"
+DB = os.environ.get("EFAI_EVENTS_DB", "provenance.db")
 SECRET = os.environ.get("EFAIAGENTSECRET", "dev-secret")  # replace in prod
+# Event store tuning: pooled WAL connections; group commit batches concurrent inserts into one transaction
+DB_POOL_SIZE = int(os.environ.get("EFAI_DB_POOL_SIZE", "8"))
+DB_SYNCHRONOUS = os.environ.get("EFAI_DB_SYNCHRONOUS", "NORMAL")
+GROUP_COMMIT = os.environ.get("EFAI_GROUP_COMMIT", "1") == "1"
+EVENTS_BATCH_MAX = int(os.environ.get("EFAI_EVENTS_BATCH_MAX", "10000"))
+EVENTS_PAGE_MAX = 1000
+# Streaming feed: comment line sent when idle (also detects disconnected clients), replay page size
+STREAM_HEARTBEAT_SECONDS = float(os.environ.get("EFAI_STREAM_HEARTBEAT_SECONDS", "15"))
+STREAM_REPLAY_PAGE = 500
+# Hash chain over the event log with a signed Merkle checkpoint every N events
+HASH_CHAIN = os.environ.get("EFAI_HASH_CHAIN", "1") == "1"
+CHAIN_CHECKPOINT_EVERY = int(os.environ.get("EFAI_CHAIN_CHECKPOINT_EVERY", "1000"))
+
+store: Optional[EventStore] = None
+chain: Optional[HashChain] = None
+broker = EventBroker()
 
 def init_db():
-    conn = sqlite3.connect(DB)
-    conn.execute("""CREATE TABLE IF NOT EXISTS events (
-        event_id TEXT PRIMARY KEY, actor TEXT, action TEXT, payload TEXT, signature TEXT, ts REAL
-    )""")
-    conn.commit()
-    conn.close()
+    global store, chain
+    if store is None:
+        store = EventStore(DB, pool_size=DB_POOL_SIZE, synchronous=DB_SYNCHRONOUS, group_commit=GROUP_COMMIT)
+        if HASH_CHAIN:
+            chain = HashChain(store, SECRET, checkpoint_every=CHAIN_CHECKPOINT_EVERY)
+            chain.start()
+
+# Keyed once; each signature copies the prepared HMAC state instead of re-deriving the key pads
+_SIGNER = hmac.new(SECRET.encode(), digestmod=hashlib.sha256)
 
 def sign_event(payload: str) -> str:
-    return hmac.new(SECRET.encode(), payload.encode(), hashlib.sha256).hexdigest()
+    signer = _SIGNER.copy()
+    signer.update(payload.encode())
+    return signer.hexdigest()
+
+def make_event(actor: str, action: str, payload: Dict[str, Any]) -> EventRow:
+    event_id = str(uuid.uuid4())
+    ts = time.time()
+    payloadjson = json.dumps(payload, sort_keys=True)
+    signature = sign_event(payloadjson + actor + action + str(ts))
+    return (event_id, actor, action, payloadjson, signature, ts)
+
+async def write_events(rows: List[EventRow]):
+    # Returns once the rows are committed; never blocks the event loop
+    if store.group_commit:
+        await asyncio.wrap_future(store.submit(rows))
+    else:
+        await run_in_threadpool(store.insert_many, rows)
+    if chain is not None:
+        chain.notify()  # Hashing happens on the chain's own thread
+    # Push to stream subscribers only after commit, so they never see an event that was rolled back
+    broker.publish({"event_id": r[0], "actor": r[1], "action": r[2], "payload": json.loads(r[3]), "signature": r[4], "ts": r[5]}
+                   for r in rows)
 
 class EventIn(BaseModel):
     actor: str
@@ -27,41 +72,210 @@ class EventIn(BaseModel):
 def startup():
     init_db()
 
+@app.on_event("shutdown")
+def shutdown():
+    global store, chain
+    if chain is not None:
+        chain.stop()
+        chain = None
+    if store is not None:
+        store.close()
+        store = None
+
 @app.post("/events")
-def post_event(e: EventIn):
-    event_id = str(uuid.uuid4())
-    ts = time.time()
-    payloadjson = json.dumps(e.payload, sort_keys=True)
-    signature = sign_event(payloadjson + e.actor + e.action + str(ts))
-    conn = sqlite3.connect(DB)
-    conn.execute("INSERT INTO events(event_id, actor, action, payload, signature, ts) VALUES(?,?,?,?,?,?)",
-                 (event_id, e.actor, e.action, payloadjson, signature, ts))
-    conn.commit()
-    conn.close()
+async def post_event(e: EventIn):
+    row = make_event(e.actor, e.action, e.payload)
+    await write_events([row])
+    event_id, _, _, _, signature, ts = row
     return {"event_id": event_id, "signature": signature, "ts": ts}
 
+def parse_batch_item(index: int, item: Any) -> EventIn:
+    if not isinstance(item, dict):
+        raise HTTPException(status_code=422, detail={"index": index, "errors": "Expected an event object"})
+    try:
+        return EventIn(**item)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail={"index": index, "errors": json.loads(e.json())})
+
+async def read_batch(request: Request) -> List[EventIn]:
+    """Reads a JSON array body, or an NDJSON body (one event per line) parsed as it streams in."""
+    events: List[EventIn] = []
+    if request.headers.get("content-type", "").startswith(("application/x-ndjson", "application/jsonl")):
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    events.append(parse_batch_item(len(events), parse_json(line, len(events))))
+            if len(events) > EVENTS_BATCH_MAX:
+                raise HTTPException(status_code=413, detail=f"Batch exceeds {EVENTS_BATCH_MAX} events")
+        if buffer.strip():
+            events.append(parse_batch_item(len(events), parse_json(buffer, len(events))))
+    else:
+        items = parse_json(await request.body(), None)
+        if not isinstance(items, list):
+            raise HTTPException(status_code=422, detail="Expected a JSON array of events")
+        events = [parse_batch_item(i, item) for i, item in enumerate(items)]
+    if len(events) > EVENTS_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {EVENTS_BATCH_MAX} events")
+    return events
+
+def parse_json(data: bytes, index: Optional[int]) -> Any:
+    try:
+        return json.loads(data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"index": index, "error": f"Invalid JSON: {e}"})
+
+@app.post("/events/batch")
+async def post_events_batch(request: Request):
+    # One HTTP round trip and one transaction for many events; results are returned in input order
+    events = await read_batch(request)
+    rows = [make_event(e.actor, e.action, e.payload) for e in events]
+    if rows:
+        await write_events(rows)
+    return [{"event_id": event_id, "signature": signature, "ts": ts} for event_id, _, _, _, signature, ts in rows]
+
+def event_to_dict(r) -> Dict[str, Any]:
+    # r: (rowid, event_id, actor, action, payload, signature, ts) as returned by EventStore.query_events
+    return {"event_id": r[1], "actor": r[2], "action": r[3], "payload": json.loads(r[4]), "signature": r[5], "ts": r[6]}
+
+def encode_cursor(row) -> str:
+    # Opaque keyset position: (ts, rowid) of the last event on the page
+    return base64.urlsafe_b64encode(json.dumps([row[6], row[0]]).encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        ts, rowid = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(ts), int(rowid)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @app.get("/events")
-def get_events(limit: int = 100):
-    conn = sqlite3.connect(DB)
-    rows = conn.execute("SELECT event_id, actor, action, payload, signature, ts FROM events ORDER BY ts DESC LIMIT ?", (limit,)).fetchall()
-    conn.close()
-    return [{"event_id": r[0], "actor": r[1], "action": r[2], "payload": json.loads(r[3]), "signature": r[4], "ts": r[5]} for r in rows]
+def get_events(response: Response, limit: int = Query(100, ge=1, le=EVENTS_PAGE_MAX), actor: Optional[str] = None,
+               action: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None,
+               cursor: Optional[str] = None):
+    """
+    Newest-first events, optionally filtered by actor, action and time range (since <= ts < until).
+    When more events match, the X-Next-Cursor header holds the cursor for the next page.
+    """
+    before = decode_cursor(cursor) if cursor else None
+    # One extra row tells whether another page exists
+    rows = store.query_events(actor=actor, action=action, since=since, until=until, before=before, limit=limit + 1)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1])
+    return [event_to_dict(r) for r in rows]
+
+@app.get("/events/latest")
+def get_latest_event(response: Response, action: Optional[str] = None, actor: Optional[str] = None):
+    """
+    The newest matching event. X-Stream-Cursor holds a /events/stream position to follow on from
+    (the event's, or with no match the head of the log), so nothing committed later is missed.
+    """
+    head = store.last_rowid()
+    rows = store.query_events(actor=actor, action=action, limit=1)
+    if not rows:
+        raise HTTPException(status_code=404, detail="No matching event",
+                            headers={"X-Stream-Cursor": encode_stream_cursor(head)})
+    response.headers["X-Stream-Cursor"] = encode_stream_cursor(rows[0][0])
+    return event_to_dict(rows[0])
+
+@app.get("/events/verify")
+async def verify_events(full: bool = False, from_seq: Optional[int] = None):
+    """
+    Verifies the hash chain from the latest signed checkpoint (or the last one at or before
+    from_seq) to the head, including every event's HMAC. full=true re-verifies the whole log.
+    """
+    if chain is None:
+        raise HTTPException(status_code=404, detail="Hash chain is disabled (EFAI_HASH_CHAIN=0)")
+    return await run_in_threadpool(chain.verify, full, from_seq)
+
+@app.get("/events/export")
+def export_events():
+    """The chained log as NDJSON (events in order, each checkpoint after its last event) for verify_log.py."""
+    if chain is None:
+        raise HTTPException(status_code=404, detail="Hash chain is disabled (EFAI_HASH_CHAIN=0)")
+    return StreamingResponse((json.dumps(record) + "\n" for record in chain.export()), media_type="application/x-ndjson")
+
+def encode_stream_cursor(rowid: int) -> str:
+    # Stream positions are rowids, i.e. commit order (see EventStore.query_events_after)
+    return base64.urlsafe_b64encode(json.dumps([rowid]).encode()).decode()
+
+def decode_stream_cursor(cursor: str) -> Union[int, str]:
+    """The rowid of a stream cursor; cursors issued before rowid positions yield their event_id."""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(position) == 1:
+            return int(position[0])
+        ts, event_id = position
+        return str(event_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid stream cursor")
+
+def format_sse(r) -> str:
+    event = event_to_dict(r)
+    return f"id: {encode_stream_cursor(r[0])}\nevent: {event['action']}\ndata: {json.dumps(event)}\n\n"
+
+async def event_stream(request: Request, actor: Optional[str], action: Optional[str], after: Optional[int]):
+    # Subscribe before reading the start position, so nothing committed after it is missed
+    subscription = broker.subscribe(actor=actor, action=action)
+    try:
+        if after is None:
+            after = await run_in_threadpool(store.last_rowid)
+
+        while True:
+            # Events are always read from the store in commit order; published events only wake
+            # the stream up. Sending them as published could deliver a later commit first, and a
+            # client reconnecting from its id would then skip the earlier one.
+            rows = await run_in_threadpool(store.query_events_after, actor, action, after, STREAM_REPLAY_PAGE)
+            for r in rows:
+                yield format_sse(r)
+            if rows:
+                after = rows[-1][0]
+            if len(rows) == STREAM_REPLAY_PAGE:
+                continue
+
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+            # One read picks up everything published meanwhile
+            while event is not None and not subscription.queue.empty():
+                event = subscription.queue.get_nowait()
+            if event is None:
+                # Fell too far behind; the client reconnects with its last id and replays the gap
+                yield "event: overflow\ndata: {}\n\n"
+                break
+    finally:
+        broker.unsubscribe(subscription)
+
+@app.get("/events/stream")
+async def stream_events(request: Request, actor: Optional[str] = None, action: Optional[str] = None,
+                        cursor: Optional[str] = None, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-sent events for new events matching actor/action. Each message id is a stream cursor;
+    passing it back as `cursor` (or the Last-Event-ID header EventSource sends on reconnect)
+    first replays everything committed after that position.
+    """
+    position = cursor or last_event_id
+    after = decode_stream_cursor(position) if position else None
+    if isinstance(after, str):
+        after = await run_in_threadpool(store.rowid_of, after)
+        if after is None:
+            raise HTTPException(status_code=400, detail="Unknown stream cursor")
+    return StreamingResponse(event_stream(request, actor, action, after), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.post("/submit")
-def submit(doc: Dict[str, Any]):
+async def submit(doc: Dict[str, Any]):
     # Simple echo: create a 'submission' event and return claim placeholder
-    actor = "agent:frontend"
-    action = "submission"
-    import time, uuid, json
-    ts = time.time()
-    event_id = str(uuid.uuid4())
-    payloadjson = json.dumps(doc, sort_keys=True)
-    signature = sign_event(payloadjson + actor + action + str(ts))
-    conn = sqlite3.connect(DB)
-    conn.execute("INSERT INTO events(event_id, actor, action, payload, signature, ts) VALUES(?,?,?,?,?,?)",
-                 (event_id, actor, action, payloadjson, signature, ts))
-    conn.commit()
-    conn.close()
+    row = make_event("agent:frontend", "submission", doc)
+    await write_events([row])
+    event_id = row[0]
     # return minimal claim object for downstream agents
     claim = {
         "claim_id": str(uuid.uuid4()),
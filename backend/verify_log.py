@@ -0,0 +1,91 @@
+"""
+Parallel bulk verifier for the hash-chained event log.
+
+Reads an export (NDJSON from GET /events/export) or the SQLite database itself, splits the log
+at its signed checkpoints and verifies the segments in worker processes. Each segment starts
+from the chain hash pinned by the previous checkpoint, so segments do not depend on each other.
+
+    python verify_log.py --export events.ndjson --workers 8
+    python verify_log.py --db provenance.db
+"""
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import argparse, json, os, sqlite3, sys, time
+from hash_chain import CHAINED_ROWS_SQL, GENESIS, checkpoint_dict, verify_segment
+
+Segment = Tuple[List[tuple], str, Optional[Dict[str, Any]]]  # rows, start hash, closing checkpoint
+
+def segments_from_export(path: str) -> Iterator[Segment]:
+    rows, prev_hash = [], GENESIS
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record["type"] == "event":
+                rows.append((record["seq"], record["event_id"], record["actor"], record["action"], record["payload"],
+                             record["signature"], record["ts"], record["chain_hash"]))
+            elif record["type"] == "checkpoint":
+                checkpoint = {k: v for k, v in record.items() if k != "type"}
+                yield rows, prev_hash, checkpoint
+                rows, prev_hash = [], checkpoint["chain_hash"]
+    if rows:
+        yield rows, prev_hash, None
+
+def segments_from_db(path: str) -> Iterator[Segment]:
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        checkpoints = [checkpoint_dict(r) for r in conn.execute(
+            "SELECT seq, start_seq, count, chain_hash, merkle_root, signature, ts FROM chain_checkpoints ORDER BY seq")]
+        head = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM event_chain").fetchone()[0]
+        start, prev_hash = 0, GENESIS
+        for checkpoint in checkpoints:
+            yield conn.execute(CHAINED_ROWS_SQL, (start, checkpoint["seq"], -1)).fetchall(), prev_hash, checkpoint
+            start, prev_hash = checkpoint["seq"], checkpoint["chain_hash"]
+        if head > start:
+            yield conn.execute(CHAINED_ROWS_SQL, (start, head, -1)).fetchall(), prev_hash, None
+    finally:
+        conn.close()
+
+def verify_segments(segments: Iterator[Segment], secret: str, workers: int) -> Dict[str, Any]:
+    """Verifies segments in parallel (at most 2 x workers in memory); returns a summary with the first failure."""
+    verified, count, failures = 0, 0, []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        for rows, prev_hash, checkpoint in segments:
+            in_flight.add(pool.submit(verify_segment, rows, prev_hash, secret, checkpoint))
+            count += 1
+            if len(in_flight) >= workers * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    verified += result["count"]
+                    if not result["ok"]:
+                        failures.append(result)
+        for future in in_flight:
+            result = future.result()
+            verified += result["count"]
+            if not result["ok"]:
+                failures.append(result)
+    failures.sort(key=lambda r: r["seq"])
+    return {"ok": not failures, "segments": count, "verified_events": verified,
+            "first_failure": failures[0] if failures else None}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify the hash-chained provenance event log.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--export", help="NDJSON export from GET /events/export")
+    source.add_argument("--db", help="SQLite database of the backend (opened read-only)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    secret = os.environ.get("EFAIAGENTSECRET", "dev-secret")
+    segments = segments_from_export(args.export) if args.export else segments_from_db(args.db)
+    started = time.perf_counter()
+    summary = verify_segments(segments, secret, args.workers)
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    print(json.dumps(summary, indent=2))
+    return 0 if summary["ok"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,8 +25,12 @@
           pymupdf # (fitz)
           # LLM, Structured Output & Observability
           openai
-          instructor
+          instructor # 1.3.x: fsa.extraction.service.compile_response_model relies on its internals
           langfuse
+          # Checkpoint encodings (orjson, msgpack formats and zstd compression)
+          orjson
+          msgpack
+          zstandard
         ]);
 
       in {
@@ -2,6 +2,11 @@
 from fsa.orchestration.abstractions import Agent, WorkflowStep, ResiliencePolicy
 from fsa.orchestration.state import WorkflowState
 from fsa.extraction.service import ClaimExtractionService
+from fsa.extraction.rate_limiter import AsyncRateLimiter
+from fsa.extraction.cache import ExtractionCache
+from fsa.extraction.chunking import plan_chunks
+from fsa.extraction.usage import TokenUsage, track_usage
+from fsa.extraction.backends import backend_from_config
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,32 +23,147 @@ class ExtractorAgent(Agent):
 # --- Steps ---
 
 class ExtractClaimsStep(WorkflowStep):
+    inputs = ("document", "sections")
+    # Per-section progress and token usage are written too; process-mode execution only keeps declared outputs
+    outputs = ("claims", "extraction_progress", "metrics")
+
+    SKIPPED_SECTION_TITLES = ("references", "acknowledgments", "appendix")
+
     def __init__(self, agent: ExtractorAgent):
         super().__init__("Extract_Atomic_Claims", agent)
         # Initialize the service (handles LLM client setup)
-        model = agent.environment.config.get("llm_model", "gpt-4o")
-        self.service = ClaimExtractionService(model=model)
+        config = agent.environment.config
+        model = config.get("llm_model", "gpt-4o")
+        # Sections are extracted concurrently (async client) when > 1, within the provider's rate limits
+        self.concurrency = config.get("extraction_concurrency", 1)
+        rate_limiter = AsyncRateLimiter(
+            requests_per_minute=config.get("llm_requests_per_minute"),
+            tokens_per_minute=config.get("llm_tokens_per_minute"),
+        )
+        # Token budget (section text) per request: larger sections are split on paragraph boundaries and
+        # small adjacent sections are packed together, up to extraction_pack_sections per request.
+        # Set extraction_chunk_tokens to None to send every section as its own request.
+        self.chunk_tokens = config.get("extraction_chunk_tokens", 3000)
+        self.pack_sections = config.get("extraction_pack_sections", 8)
+        # Content-addressed response cache (set extraction_cache_path to None to disable)
+        cache_path = config.get("extraction_cache_path", "./cache/extraction_cache.sqlite3")
+        cache = ExtractionCache(cache_path, max_bytes=config.get("extraction_cache_max_mb", 256) * 1024 * 1024) if cache_path else None
+        self.service = ClaimExtractionService(
+            model=model, rate_limiter=rate_limiter, cache=cache,
+            bypass_cache=config.get("bypass_extraction_cache", False),
+            # llm_backend: "openai" (default) or "stub" (deterministic offline backend, options in llm_stub)
+            backend=backend_from_config(config),
+        )
 
     def execute(self, state: WorkflowState) -> WorkflowState:
         if not state.sections or not state.document:
             raise RuntimeError("Parsed sections or document ID missing in state. Ensure Parse step completed.")
 
-        # Implementation Note: If this step takes a long time (many sections), it benefits from the Engine's retries.
-        # However, if it fails mid-way, it currently restarts from the first section upon retry.
-        # Future improvements could include intra-step checkpointing.
+        # Intra-step checkpointing: every processed section is recorded in state.extraction_progress
+        # and checkpointed, so a retry (or a resumed run) only pays for the sections still outstanding.
+        progress = state.extraction_progress
+        outstanding = [section for section in state.sections if str(section.section_id) not in progress]
+        if len(outstanding) < len(state.sections):
+            logger.info(f"Resuming claim extraction: {len(state.sections) - len(outstanding)} of {len(state.sections)} sections already processed.")
+        logger.info(f"Starting claim extraction across {len(outstanding)} sections.")
 
-        all_claims = []
-        logger.info(f"Starting claim extraction across {len(state.sections)} sections.")
+        # Offloaded section text is read from the artifact store once for the whole step, not per access
+        with state.holding_section_content(outstanding):
+            to_extract = []
+            for section in outstanding:
+                # Basic filtering
+                if len(section.content) < 50 or section.title.lower() in self.SKIPPED_SECTION_TITLES:
+                    progress[str(section.section_id)] = []
+                else:
+                    to_extract.append(section)
 
-        for section in state.sections:
-            # Basic filtering
-            if len(section.content) < 50 or section.title.lower() in ["references", "acknowledgments", "appendix"]:
-                continue
+            # Token usage of this run, accumulated across retries (provider prompt-cache hits included)
+            usage = TokenUsage.from_dict(state.metrics.get("extraction_tokens"))
+            try:
+                with track_usage(usage):
+                    if self.chunk_tokens:
+                        failed_sections = self._extract_chunked(state, to_extract)
+                    elif self.concurrency > 1:
+                        failed_sections = self._extract_concurrently(state, to_extract)
+                    else:
+                        failed_sections = self._extract_serially(state, to_extract)
+            finally:
+                state.metrics["extraction_tokens"] = usage.as_dict()
 
-            # This call integrates Langfuse tracing internally via the service implementation (PR 8)
-            claims = self.service.extract_claims(state.document.id, section)
-            all_claims.extend(claims)
+        if failed_sections:
+            # Raise so the engine retries; the retry only processes the failed sections
+            raise RuntimeError(f"Claim extraction failed for {len(failed_sections)} section(s): {failed_sections}")
 
-        state.claims = all_claims
-        logger.info(f"Total claims extracted: {len(all_claims)}")
+        # Reassemble claims in document order
+        state.claims = [claim for section in state.sections for claim in progress.get(str(section.section_id), [])]
+        logger.info(f"Total claims extracted: {len(state.claims)}")
+        logger.info(f"Extraction token usage: {state.metrics['extraction_tokens']}")
+        if self.service.cache:
+            logger.info(f"Extraction cache stats: {self.service.cache.stats}")
         return state
+
+    def _record_section(self, state: WorkflowState, section, claims):
+        state.extraction_progress[str(section.section_id)] = claims
+        state.checkpoint_progress()
+
+    def _extract_serially(self, state: WorkflowState, sections) -> list:
+        """Extracts one section at a time; returns the titles of the sections that failed."""
+        failed_sections = []
+        for section in sections:
+            try:
+                # This call integrates Langfuse tracing internally via the service implementation (PR 8)
+                claims = self.service.extract_claims(state.document.id, section, raise_on_error=True)
+            except Exception:
+                # Leave the section outstanding; the remaining sections are still processed
+                failed_sections.append(section.title)
+                continue
+            self._record_section(state, section, claims)
+        return failed_sections
+
+    def _extract_concurrently(self, state: WorkflowState, sections) -> list:
+        """Fans sections out over the async client; progress is recorded as each section completes."""
+        results = self.service.extract_claims_concurrently(
+            state.document.id, sections, max_concurrency=self.concurrency,
+            on_section_done=lambda section, claims: self._record_section(state, section, claims),
+            raise_on_error=True,
+        )
+        return [section.title for section, result in zip(sections, results) if isinstance(result, Exception)]
+
+    def _extract_chunked(self, state: WorkflowState, sections) -> list:
+        """
+        Extracts token-budgeted chunks (split or packed sections). A section is recorded once all
+        of its pieces are done, with their claims in order; returns the titles of failed sections.
+        """
+        chunks = plan_chunks(sections, self.chunk_tokens, max_sections=self.pack_sections)
+        logger.info(f"Packed {len(sections)} sections into {len(chunks)} extraction requests.")
+        collected = {}
+
+        def on_chunk_done(chunk, claims_per_piece):
+            for piece, claims in zip(chunk.pieces, claims_per_piece):
+                pieces = collected.setdefault(piece.section.section_id, [None] * piece.count)
+                pieces[piece.index] = claims
+                if all(p is not None for p in pieces):
+                    self._record_section(state, piece.section, [claim for p in pieces for claim in p])
+
+        failed = []
+        if self.concurrency > 1:
+            results = self.service.extract_chunks_concurrently(
+                state.document.id, chunks, max_concurrency=self.concurrency,
+                on_chunk_done=on_chunk_done, raise_on_error=True,
+            )
+            failed = [chunk for chunk, result in zip(chunks, results) if isinstance(result, Exception)]
+        else:
+            for chunk in chunks:
+                try:
+                    claims_per_piece = self.service.extract_chunk_claims(state.document.id, chunk, raise_on_error=True)
+                except Exception:
+                    failed.append(chunk)
+                    continue
+                on_chunk_done(chunk, claims_per_piece)
+
+        failed_sections = []
+        for chunk in failed:
+            for section in chunk.sections:
+                if section.title not in failed_sections:
+                    failed_sections.append(section.title)
+        return failed_sections
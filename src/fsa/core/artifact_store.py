@@ -0,0 +1,261 @@
+# src/fsa/core/artifact_store.py
+from typing import Optional, Union
+from functools import lru_cache
+import hashlib
+import logging
+import mmap
+import os
+import threading
+import time
+import uuid
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency: only needed for compression="zstd"
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+class ArtifactStore:
+    """
+    Content-addressed blob store shared by all runs.
+    Blobs live at `<root>/blobs/<h[:2]>/<h[2:4]>/<sha256>` (with a `.zst` suffix when compressed),
+    so the same PDF fetched by many runs is stored once. Runs register references as marker
+    files under `<root>/refs/`; gc() removes blobs no run references any more.
+    """
+    # Read/hash block size for streamed blobs
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, root: str = "./artifacts", compression: Optional[str] = None, compression_level: int = 3):
+        if compression not in (None, "zstd"):
+            raise ValueError(f"Unknown artifact compression '{compression}'. Expected None or 'zstd'.")
+        if compression == "zstd" and zstandard is None:
+            raise RuntimeError("zstd artifact compression requires the 'zstandard' package.")
+        self.root = root
+        self.compression = compression
+        self.compression_level = compression_level
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def for_root(root: str) -> 'ArtifactStore':
+        """Shared default (uncompressed) store per root directory."""
+        return ArtifactStore(root)
+
+    # --- Paths ---
+
+    def _blob_path(self, digest: str, compressed: bool) -> str:
+        name = f"{digest}.zst" if compressed else digest
+        return os.path.join(self.root, "blobs", digest[:2], digest[2:4], name)
+
+    def _ref_dir(self, digest: str) -> str:
+        return os.path.join(self.root, "refs", digest[:2], digest)
+
+    def path(self, digest: str) -> Optional[str]:
+        """Returns the on-disk path of a blob (compressed or not), or None if it is not stored."""
+        for compressed in (False, True):
+            candidate = self._blob_path(digest, compressed)
+            if os.path.exists(candidate):
+                return candidate
+        return None
+
+    def exists(self, digest: str) -> bool:
+        return self.path(digest) is not None
+
+    def _refresh(self, digest: str) -> bool:
+        """
+        On a dedup hit, bumps the existing blob's mtime so gc() treats it as freshly stored until
+        the caller registers its reference. Returns False when the blob is not (or no longer) stored.
+        """
+        path = self.path(digest)
+        if path is None:
+            return False
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False  # Collected in the meantime: store it again
+
+    # --- Writes ---
+
+    def put(self, content: bytes) -> str:
+        """Stores `content` (once) and returns its SHA-256 hex digest."""
+        digest = hashlib.sha256(content).hexdigest()
+        if self._refresh(digest):
+            return digest
+
+        data = content
+        if self.compression == "zstd":
+            data = zstandard.ZstdCompressor(level=self.compression_level).compress(content)
+        self._write_blob(digest, data)
+        return digest
+
+    def _write_blob(self, digest: str, data: bytes):
+        path = self._blob_path(digest, self.compression == "zstd")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename: concurrent writers of the same content race harmlessly
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def temp_path(self) -> str:
+        """A fresh path on the store's filesystem for staging a blob (see put_file)."""
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        return os.path.join(tmp_dir, uuid.uuid4().hex)
+
+    def open_writer(self) -> 'BlobWriter':
+        """Streams a blob of unknown size into the store, hashing it incrementally."""
+        return BlobWriter(self)
+
+    def put_file(self, path: str) -> str:
+        """
+        Moves a complete (uncompressed) file into the store and returns its digest. The file must
+        be on the store's filesystem, e.g. a temp_path(); it is consumed either way.
+        """
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                sha.update(block)
+        digest = sha.hexdigest()
+
+        if self.compression != "zstd":
+            self._install(path, digest, compressed=False)
+            return digest
+
+        with self.open_writer() as writer:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                    writer.write(block)
+            writer.commit()
+        os.remove(path)
+        return digest
+
+    def _install(self, tmp_path: str, digest: str, compressed: bool):
+        """Renames a fully written temp file into place (or drops it if the blob already exists)."""
+        if self._refresh(digest):
+            os.remove(tmp_path)
+            return
+        path = self._blob_path(digest, compressed)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+
+    # --- Reads ---
+
+    def get(self, digest: str) -> bytes:
+        path = self.path(digest)
+        if path is None:
+            raise FileNotFoundError(f"Artifact {digest} not found in store {self.root}")
+        if not path.endswith(".zst"):
+            with open(path, 'rb') as f:
+                return f.read()
+        if zstandard is None:
+            raise RuntimeError("Reading a zstd-compressed artifact requires the 'zstandard' package.")
+        # Streamed frames (BlobWriter) do not record the content size, so decompress as a stream
+        with open(path, 'rb') as f, zstandard.ZstdDecompressor().stream_reader(f) as reader:
+            return reader.read()
+
+    def open_view(self, digest: str) -> Union[memoryview, bytes]:
+        """
+        Returns the blob as a read-only buffer. Uncompressed blobs are memory-mapped, so large
+        PDFs can be handed to PyMuPDF without reading a full copy into Python memory.
+        """
+        path = self.path(digest)
+        if path is None:
+            raise FileNotFoundError(f"Artifact {digest} not found in store {self.root}")
+        if path.endswith(".zst") or os.path.getsize(path) == 0:
+            return self.get(digest)
+        with open(path, 'rb') as f:
+            # The mapping stays valid after the file is closed; it is released with the view
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    # --- References and garbage collection ---
+
+    def add_ref(self, digest: str, owner: str):
+        """Records that `owner` (e.g. a run ID) uses the blob."""
+        ref_dir = self._ref_dir(digest)
+        os.makedirs(ref_dir, exist_ok=True)
+        open(os.path.join(ref_dir, owner), 'a').close()
+
+    def release(self, digest: str, owner: str):
+        try:
+            os.remove(os.path.join(self._ref_dir(digest), owner))
+        except FileNotFoundError:
+            pass
+
+    def refcount(self, digest: str) -> int:
+        try:
+            return len(os.listdir(self._ref_dir(digest)))
+        except FileNotFoundError:
+            return 0
+
+    def gc(self, min_age_seconds: float = 3600) -> int:
+        """
+        Deletes blobs without references. Blobs younger than `min_age_seconds` are kept, so a blob
+        stored by a run that has not registered its reference yet is not collected.
+        Returns the number of blobs removed.
+        """
+        removed = 0
+        cutoff = time.time() - min_age_seconds
+        for dirpath, _, files in os.walk(os.path.join(self.root, "blobs")):
+            for name in files:
+                if ".tmp-" in name:
+                    continue
+                digest = name[:-4] if name.endswith(".zst") else name
+                path = os.path.join(dirpath, name)
+                if self.refcount(digest) == 0 and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+        logger.info(f"Artifact store GC removed {removed} unreferenced blobs from {self.root}.")
+        return removed
+
+class BlobWriter:
+    """
+    Incremental writer returned by ArtifactStore.open_writer(). Chunks are hashed and written
+    (compressed if the store compresses) to a temp file; commit() moves it to its content address.
+    Used as a context manager, the temp file is removed if commit() was not reached.
+    """
+    def __init__(self, store: ArtifactStore):
+        self.store = store
+        self.size = 0
+        self._sha = hashlib.sha256()
+        self._tmp_path = store.temp_path()
+        self._file = open(self._tmp_path, 'wb')
+        self._compressed = store.compression == "zstd"
+        if self._compressed:
+            self._sink = zstandard.ZstdCompressor(level=store.compression_level).stream_writer(self._file, closefd=False)
+        else:
+            self._sink = self._file
+        self._digest: Optional[str] = None
+
+    def write(self, chunk: bytes):
+        self._sha.update(chunk)
+        self._sink.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> str:
+        if self._digest is None:
+            if self._compressed:
+                self._sink.close()
+            self._file.close()
+            digest = self._sha.hexdigest()
+            self.store._install(self._tmp_path, digest, self._compressed)
+            self._digest = digest
+        return self._digest
+
+    def abort(self):
+        if self._digest is None:
+            self._file.close()
+            if os.path.exists(self._tmp_path):
+                os.remove(self._tmp_path)
+
+    def __enter__(self) -> 'BlobWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.abort()
@@ -1,9 +1,10 @@
 # src/fsa/core/models.py
-from pydantic import BaseModel, Field, HttpUrl, UUID4
+from pydantic import BaseModel, Field, HttpUrl, UUID4, PrivateAttr, ValidationInfo, field_validator, model_validator, model_serializer
 from enum import Enum
 from typing import List, Dict, Optional, Any
 import uuid
 from datetime import datetime
+from fsa.core.artifact_store import ArtifactStore
 
 # --- Enums ---
 
@@ -35,12 +36,99 @@ class Document(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 class ParsedSection(BaseModel):
-    """A structured section of the parsed document."""
+    """
+    A structured section of the parsed document.
+    `content` is held inline until offload() moves it into the content-addressed ArtifactStore;
+    from then on only `content_hash` is serialized and the text is read from the store on access.
+    """
     section_id: UUID4 = Field(default_factory=uuid.uuid4)
     document_id: UUID4
     title: str
-    content: str
     level: int # e.g., 1 for H1
+    # SHA-256 of the UTF-8 content in the ArtifactStore, once offloaded
+    content_hash: Optional[str] = None
+
+    _content: Optional[str] = PrivateAttr(default=None)
+    _store: Optional[ArtifactStore] = PrivateAttr(default=None)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _split_content(cls, data: Any, handler):
+        # `content` is accepted like a field (inline sections, older checkpoints) but kept private
+        content = None
+        if isinstance(data, dict) and "content" in data:
+            data = dict(data)
+            content = data.pop("content")
+            if content is not None and not isinstance(content, str):
+                raise ValueError("content must be a string")
+        section = handler(data)
+        if content is not None:
+            section._content = content
+        if section._content is None and section.content_hash is None:
+            raise ValueError("ParsedSection requires either content or content_hash")
+        return section
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler):
+        data = handler(self)
+        if self.content_hash is None and isinstance(data, dict):
+            data["content"] = self._content
+        return data
+
+    @property
+    def content(self) -> str:
+        """
+        The section text. For an offloaded section every access reads (and, in a compressed store,
+        decompresses) the blob again: read it into a local, or hold() it while it is used repeatedly.
+        """
+        if self._content is not None:
+            return self._content
+        if self._store is None:
+            raise RuntimeError(f"Section '{self.title}' is offloaded but no ArtifactStore is bound; pass "
+                               f"artifact_store to WorkflowState.load_checkpoint or call bind_store().")
+        # Not cached: the text is only held while a caller uses it
+        return self._store.get(self.content_hash).decode("utf-8")
+
+    @content.setter
+    def content(self, value: str):
+        self._content = value
+        self.content_hash = None
+
+    def hold(self) -> bool:
+        """Keeps offloaded text in memory until release(). Returns False if it already was in memory."""
+        if self._content is not None:
+            return False
+        self._content = self.content
+        return True
+
+    def release(self):
+        """Drops text kept by hold(); an offloaded section reads it from the store again."""
+        if self.content_hash is not None:
+            self._content = None
+
+    @classmethod
+    def trusted(cls, document_id: UUID4, title: str, content: str, level: int) -> 'ParsedSection':
+        """
+        Builds a section without validation (model_construct), for values produced by our own
+        code (PDFParser, the section cache). Skips _split_content, which validated construction
+        runs in Python; see fsa.core.models_benchmark.
+        """
+        section = cls.model_construct(section_id=uuid.uuid4(), document_id=document_id, title=title, level=level)
+        section._content = content
+        return section
+
+    def offload(self, store: ArtifactStore) -> str:
+        """Moves the text into `store` (deduplicated by hash) and returns its digest."""
+        if self.content_hash is None:
+            self.content_hash = store.put(self._content.encode("utf-8"))
+        self._content = None
+        self._store = store
+        return self.content_hash
+
+    def bind_store(self, store: ArtifactStore):
+        """Sets the store offloaded content is read from, unless one is already bound."""
+        if self._store is None:
+            self._store = store
 
 # --- Extraction Models (Used by Instructor for structured LLM output) ---
 
@@ -50,6 +138,24 @@ class ExtractedClaim(BaseModel):
     claim_type: ClaimType = Field(..., description="The classification of the claim.")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence (0.0-1.0) that this is a substantive, atomic claim.")
 
+
 class ClaimExtractionResult(BaseModel):
     """The structured response from the claim extraction module."""
     claims: List[ExtractedClaim]
+
+class PackedExtractedClaim(ExtractedClaim):
+    """A claim from a request covering several sections, tagged with the part it came from."""
+    part: int = Field(..., ge=1, description="The number N of the [Part N] the claim was extracted from.")
+
+    @field_validator("part")
+    @classmethod
+    def _part_in_request(cls, part: int, info: ValidationInfo) -> int:
+        # The number of parts is passed as validation context, so a bad tag triggers an LLM retry
+        parts = (info.context or {}).get("parts")
+        if parts is not None and part > parts:
+            raise ValueError(f"part must be between 1 and {parts}")
+        return part
+
+class PackedClaimExtractionResult(BaseModel):
+    """The structured response for a request covering several sections."""
+    claims: List[PackedExtractedClaim]
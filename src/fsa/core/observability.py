@@ -1,19 +1,195 @@
 # src/fsa/core/observability.py
+from abc import ABC, abstractmethod
+import atexit
 import logging
+import os
+import queue
+import threading
+import time
 from langfuse import Langfuse
 from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional
 
 logger = logging.getLogger(__name__)
 
 @lru_cache(maxsize=1)
 def get_langfuse_client():
-    """Initializes and returns the Langfuse client singleton."""
+    """
+    Initializes and returns the Langfuse client singleton, or None when Langfuse is not
+    configured. Does not contact the server: LangfuseSink checks authentication lazily on the
+    exporter thread, so startup never blocks on the tracing backend.
+    """
+    # Requires LANGFUSE_SECRET_KEY, LANGFUSE_PUBLIC_KEY env vars
+    if not (os.environ.get("LANGFUSE_PUBLIC_KEY") and os.environ.get("LANGFUSE_SECRET_KEY")):
+        logger.warning("Langfuse keys are not configured. Tracing will be disabled.")
+        return None
     try:
-        # Requires LANGFUSE_SECRET_KEY, LANGFUSE_PUBLIC_KEY env vars
-        client = Langfuse()
-        client.auth_check()
-        logger.info("Langfuse initialized and authenticated.")
-        return client
+        return Langfuse()
     except Exception as e:
-        logger.warning(f"Langfuse initialization or authentication failed: {e}. Tracing will be disabled.")
+        logger.warning(f"Langfuse initialization failed: {e}. Tracing will be disabled.")
+        return None
+
+class TelemetryEvent(NamedTuple):
+    # "trace", "span", "span_end", "score" or "generation"
+    kind: str
+    # Keyword arguments of the matching Langfuse call, captured when the event happened
+    data: Dict[str, Any]
+
+class TelemetrySink(ABC):
+    """Destination of exported telemetry batches. export() runs on the exporter thread."""
+    @abstractmethod
+    def export(self, events: List[TelemetryEvent]):
+        pass
+
+    def close(self):
+        pass
+
+class InMemorySink(TelemetrySink):
+    """Keeps every exported event, e.g. for tests."""
+    def __init__(self):
+        self.events: List[TelemetryEvent] = []
+        self.batches = 0
+        self._lock = threading.Lock()
+
+    def export(self, events: List[TelemetryEvent]):
+        with self._lock:
+            self.events.extend(events)
+            self.batches += 1
+
+    def of_kind(self, kind: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [event.data for event in self.events if event.kind == kind]
+
+class LangfuseSink(TelemetrySink):
+    """
+    Replays events against a Langfuse client (which batches its own HTTP ingestion). The client's
+    credentials are checked on the first export; if that fails, later events are dropped.
+    """
+    # Spans are ended by re-sending the span with the same id (Langfuse upserts observations by id)
+    _METHODS = {"trace": "trace", "span": "span", "span_end": "span", "score": "score", "generation": "generation"}
+
+    def __init__(self, client: Langfuse):
+        self.client = client
+        self._authenticated: Optional[bool] = None
+
+    def export(self, events: List[TelemetryEvent]):
+        if self._authenticated is None:
+            try:
+                self._authenticated = bool(self.client.auth_check())
+                logger.info("Langfuse authenticated.")
+            except Exception as e:
+                self._authenticated = False
+                logger.warning(f"Langfuse authentication failed: {e}. Tracing events will be dropped.")
+        if not self._authenticated:
+            return
+        for event in events:
+            getattr(self.client, self._METHODS[event.kind])(**event.data)
+
+    def close(self):
+        if self._authenticated:
+            self.client.flush()
+
+class TelemetryExporter:
+    """
+    Ships telemetry off the hot path: emit() only enqueues (never blocks; events are dropped
+    when the bounded queue is full) and a background thread hands batches of up to
+    `batch_size` events to the sink at least every `flush_interval_seconds`.
+    """
+    def __init__(self, sink: TelemetrySink, max_queue_size: int = 10000, batch_size: int = 100,
+                 flush_interval_seconds: float = 1.0):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.exported = 0
+        self.dropped = 0
+        self.failed_batches = 0
+        self._queue: "queue.Queue[Optional[TelemetryEvent]]" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+    def emit(self, kind: str, **data) -> bool:
+        """Queues one event; returns False when it was dropped (queue full or exporter closed)."""
+        if self._closed:
+            return False
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(TelemetryEvent(kind, data))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"Telemetry queue full; {self.dropped} events dropped so far.")
+            return False
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="fsa-telemetry", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch: List[TelemetryEvent] = []
+            deadline = time.monotonic() + self.flush_interval_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    event = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if event is None:  # Sentinel from close()
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(event)
+            if batch:
+                try:
+                    self.sink.export(batch)
+                    self.exported += len(batch)
+                except Exception as e:
+                    self.failed_batches += 1
+                    logger.warning(f"Failed to export {len(batch)} telemetry events: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Waits until every queued event has been handed to the sink; False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._thread is None:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Exports what is queued (within `timeout`), stops the thread and closes the sink."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self.flush(timeout)
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+        self.sink.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {"queued": self._queue.qsize(), "exported": self.exported, "dropped": self.dropped,
+                "failed_batches": self.failed_batches}
+
+@lru_cache(maxsize=1)
+def get_telemetry_exporter() -> Optional[TelemetryExporter]:
+    """Process-wide exporter to Langfuse (None when Langfuse is not configured); flushed at exit."""
+    client = get_langfuse_client()
+    if client is None:
         return None
+    exporter = TelemetryExporter(LangfuseSink(client))
+    atexit.register(exporter.close)
+    return exporter
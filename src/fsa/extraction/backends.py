@@ -0,0 +1,162 @@
+# src/fsa/extraction/backends.py
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, NamedTuple, Optional
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+from openai.types.completion_usage import CompletionUsage, PromptTokensDetails
+from pydantic import BaseModel
+
+from fsa.core.models import ClaimType, PackedClaimExtractionResult
+from fsa.extraction.rate_limiter import estimate_tokens
+
+class LLMResult(NamedTuple):
+    output: BaseModel
+    # Raw token usage of the request, as reported by OpenAI (recorded into TokenUsage)
+    usage: Optional[CompletionUsage] = None
+
+class LLMBackend(ABC):
+    """
+    Executes one structured extraction request: the keyword arguments ClaimExtractionService
+    builds (model, response_model, messages, validation_context, ...). Must return an instance
+    of request["response_model"]. ClaimExtractionService uses OpenAI via Instructor when no
+    backend is given.
+    """
+    @abstractmethod
+    def complete(self, request: Dict[str, Any]) -> LLMResult:
+        pass
+
+    async def acomplete(self, request: Dict[str, Any]) -> LLMResult:
+        return await asyncio.to_thread(self.complete, request)
+
+class StubLLMError(RuntimeError):
+    """An injected failure of the StubLLMBackend."""
+
+class StubLLMBackend(LLMBackend):
+    """
+    Deterministic local stand-in for the LLM, for offline runs and throughput benchmarks.
+    Responses (claims picked from the request's own sentences, latency and token counts) depend
+    only on the request and `seed`; failures are drawn from a seeded stream at `failure_rate`,
+    so a retried request can succeed.
+    """
+    _PART = re.compile(r"\[Part (\d+)\]\nTitle: [^\n]*\nContent:\n\n")
+    _SENTENCE = re.compile(r"(?<=[.!?])\s+")
+
+    def __init__(self, latency_seconds: float = 0.05, latency_jitter: float = 0.0, failure_rate: float = 0.0,
+                 claims_per_part: int = 3, completion_tokens_per_claim: int = 30, cached_prompt_tokens: int = 0,
+                 seed: int = 0):
+        self.latency_seconds = latency_seconds
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self.claims_per_part = claims_per_part
+        self.completion_tokens_per_claim = completion_tokens_per_claim
+        # Reported as served from the provider's prompt cache (capped at the prompt size)
+        self.cached_prompt_tokens = cached_prompt_tokens
+        self.seed = seed
+        self.requests = 0
+        self.failures = 0
+        self._failures = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _request_rng(self, request: Dict[str, Any]) -> random.Random:
+        digest = hashlib.sha256(json.dumps([self.seed, request["messages"]], sort_keys=True).encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            failed = self.failure_rate > 0 and self._failures.random() < self.failure_rate
+            self.failures += failed
+            return failed
+
+    def _delay(self, rng: random.Random) -> float:
+        return max(0.0, self.latency_seconds + rng.uniform(-self.latency_jitter, self.latency_jitter))
+
+    def complete(self, request: Dict[str, Any]) -> LLMResult:
+        rng = self._request_rng(request)
+        time.sleep(self._delay(rng))
+        if self._should_fail():
+            raise StubLLMError("Injected stub LLM failure")
+        return self._respond(request, rng)
+
+    async def acomplete(self, request: Dict[str, Any]) -> LLMResult:
+        rng = self._request_rng(request)
+        await asyncio.sleep(self._delay(rng))
+        if self._should_fail():
+            raise StubLLMError("Injected stub LLM failure")
+        return self._respond(request, rng)
+
+    def _claims(self, text: str, rng: random.Random) -> List[Dict[str, Any]]:
+        sentences = [s.strip() for s in self._SENTENCE.split(text) if len(s.strip()) > 20]
+        picked = rng.sample(sentences, min(self.claims_per_part, len(sentences)))
+        return [{"claim_text": sentence, "claim_type": rng.choice(list(ClaimType)).value,
+                 "confidence": round(rng.uniform(0.5, 1.0), 2)} for sentence in picked]
+
+    def _respond(self, request: Dict[str, Any], rng: random.Random) -> LLMResult:
+        response_model = request["response_model"]
+        # Section text only: drop the closing instruction of the user prompt
+        prompt = request["messages"][-1]["content"].rsplit("\n\nExtract the atomic claims", 1)[0]
+        if issubclass(response_model, PackedClaimExtractionResult):
+            pieces = self._PART.split(prompt)[1:]
+            claims = [dict(claim, part=int(number))
+                      for number, text in zip(pieces[::2], pieces[1::2]) for claim in self._claims(text, rng)]
+        else:
+            claims = self._claims(prompt.split("Content:\n\n", 1)[-1], rng)
+        output = response_model.model_validate({"claims": claims}, context=request.get("validation_context"))
+
+        prompt_tokens = sum(estimate_tokens(m["content"]) for m in request["messages"])
+        completion_tokens = self.completion_tokens_per_claim * len(claims) + 10
+        usage = CompletionUsage(
+            prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, total_tokens=prompt_tokens + completion_tokens,
+            prompt_tokens_details=PromptTokensDetails(cached_tokens=min(self.cached_prompt_tokens, prompt_tokens)),
+        )
+        return LLMResult(output, usage)
+
+class BackendClient:
+    """Exposes an LLMBackend through the `client.chat.completions.create(**request)` shape the service calls."""
+    def __init__(self, backend: LLMBackend, on_result, is_async: bool = False):
+        self.chat = _BackendChat(_BackendCompletions(backend, on_result, is_async))
+
+    async def close(self):
+        pass
+
+class _BackendChat:
+    def __init__(self, completions: '_BackendCompletions'):
+        self.completions = completions
+
+class _BackendCompletions:
+    def __init__(self, backend: LLMBackend, on_result, is_async: bool):
+        self.backend = backend
+        self.on_result = on_result
+        self.is_async = is_async
+
+    def create(self, **request):
+        if self.is_async:
+            return self._acreate(request)
+        result = self.backend.complete(request)
+        self.on_result(result)
+        return result.output
+
+    async def _acreate(self, request: Dict[str, Any]):
+        result = await self.backend.acomplete(request)
+        self.on_result(result)
+        return result.output
+
+def backend_from_config(config: Dict[str, Any]) -> Optional[LLMBackend]:
+    """
+    The backend selected by `llm_backend`: "openai" (default, returns None) or "stub", configured
+    by the `llm_stub` mapping (StubLLMBackend arguments). An LLMBackend instance is used as is.
+    """
+    backend = config.get("llm_backend", "openai")
+    if isinstance(backend, LLMBackend):
+        return backend
+    if backend == "openai":
+        return None
+    if backend == "stub":
+        return StubLLMBackend(**config.get("llm_stub", {}))
+    raise ValueError(f"Unknown LLM backend '{backend}'. Expected 'openai' or 'stub'.")
@@ -0,0 +1,99 @@
+# src/fsa/extraction/cache.py
+from typing import List, Dict, Optional, Type
+from functools import lru_cache
+from pydantic import TypeAdapter
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from fsa.core.models import ExtractedClaim
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def _claim_list_adapter(claim_model: Type[ExtractedClaim]) -> TypeAdapter:
+    return TypeAdapter(List[claim_model])
+
+class ExtractionCache:
+    """
+    Persistent, content-addressed cache of claim extraction results.
+    Entries are keyed by a hash of the rendered messages, the model and the prompt version, and
+    are evicted least-recently-used once the stored results exceed `max_bytes`.
+    Backed by SQLite so it can be shared by threads and by concurrent processes.
+    """
+    def __init__(self, path: str = "./cache/extraction_cache.sqlite3", max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""CREATE TABLE IF NOT EXISTS extraction_cache (
+            key TEXT PRIMARY KEY, model TEXT, claims TEXT, size INTEGER, created REAL, last_access REAL
+        )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_extraction_cache_last_access ON extraction_cache(last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, messages: List[dict], prompt_version: str) -> str:
+        """Hashes everything that determines the LLM response."""
+        payload = json.dumps({"model": model, "messages": messages, "prompt_version": prompt_version},
+                             sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, claim_model: Type[ExtractedClaim] = ExtractedClaim) -> Optional[List[ExtractedClaim]]:
+        with self._lock:
+            row = self._conn.execute("SELECT claims FROM extraction_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self._conn.execute("UPDATE extraction_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.stats["hits"] += 1
+        # Validated straight from the stored JSON by pydantic-core (no intermediate dicts)
+        return _claim_list_adapter(claim_model).validate_json(row[0])
+
+    def put(self, key: str, model: str, claims: List[ExtractedClaim]):
+        data = json.dumps([claim.model_dump(mode="json") for claim in claims])
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extraction_cache(key, model, claims, size, created, last_access) VALUES(?,?,?,?,?,?)",
+                (key, model, data, len(data), now, now))
+            self._conn.commit()
+            self.stats["writes"] += 1
+            self._evict()
+
+    def _evict(self):
+        """Drops least-recently-used entries until the cache fits in max_bytes. Caller holds the lock."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM extraction_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        to_free = total - self.max_bytes
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM extraction_cache ORDER BY last_access"):
+            victims.append((key,))
+            to_free -= size
+            if to_free <= 0:
+                break
+        self._conn.executemany("DELETE FROM extraction_cache WHERE key = ?", victims)
+        self._conn.commit()
+        self.stats["evictions"] += len(victims)
+        logger.info(f"Evicted {len(victims)} extraction cache entries to stay under {self.max_bytes} bytes.")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM extraction_cache")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
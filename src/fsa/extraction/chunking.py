@@ -0,0 +1,116 @@
+# src/fsa/extraction/chunking.py
+from typing import Iterator, List, NamedTuple, Optional, Sequence
+import re
+
+from fsa.core.models import ParsedSection
+from fsa.extraction.rate_limiter import estimate_tokens
+
+# Boundaries tried in order when a section is too large for one request, with the separator
+# used to re-join units that fit together
+_SPLIT_PATTERNS = (
+    (re.compile(r"\n\s*\n"), "\n\n"),      # Paragraphs
+    (re.compile(r"\n"), "\n"),              # Lines (PDF text often has no blank lines)
+    (re.compile(r"(?<=[.!?])\s+"), " "),    # Sentences
+)
+# Prompt tokens added per packed section ("[Part N]" marker and title line)
+PART_OVERHEAD_TOKENS = 16
+
+class SectionPiece(NamedTuple):
+    """A section, or one piece of a section that was split across requests."""
+    section: ParsedSection
+    text: str
+    index: int = 0  # Position of the piece within its section
+    count: int = 1  # Number of pieces the section was split into
+
+    @property
+    def is_split(self) -> bool:
+        return self.count > 1
+
+class ExtractionChunk(NamedTuple):
+    """The pieces sent together in one extraction request, in document order."""
+    pieces: List[SectionPiece]
+
+    @classmethod
+    def of(cls, section: ParsedSection) -> 'ExtractionChunk':
+        return cls([SectionPiece(section, section.content)])
+
+    @property
+    def is_packed(self) -> bool:
+        return len(self.pieces) > 1
+
+    @property
+    def sections(self) -> List[ParsedSection]:
+        seen, sections = set(), []
+        for piece in self.pieces:
+            if piece.section.section_id not in seen:
+                seen.add(piece.section.section_id)
+                sections.append(piece.section)
+        return sections
+
+def split_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Splits `text` into pieces of at most `max_tokens` (estimated), cutting on paragraph
+    boundaries where possible, then on lines, then sentences, and as a last resort mid-text.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    return list(_split(text, max_tokens, 0))
+
+def _split(text: str, max_tokens: int, level: int) -> Iterator[str]:
+    if level == len(_SPLIT_PATTERNS):
+        # No usable boundary left: hard cut at the character budget
+        width = max(1, (max_tokens - 1) * 4)  # Inverse of estimate_tokens
+        for start in range(0, len(text), width):
+            yield text[start:start + width]
+        return
+
+    pattern, separator = _SPLIT_PATTERNS[level]
+    current = ""
+    for unit in pattern.split(text):
+        if not unit.strip():
+            continue
+        if estimate_tokens(unit) > max_tokens:
+            if current:
+                yield current
+                current = ""
+            yield from _split(unit, max_tokens, level + 1)
+            continue
+        candidate = f"{current}{separator}{unit}" if current else unit
+        if estimate_tokens(candidate) > max_tokens:
+            yield current
+            current = unit
+        else:
+            current = candidate
+    if current:
+        yield current
+
+def plan_chunks(sections: Sequence[ParsedSection], max_tokens: int, max_sections: Optional[int] = 8) -> List[ExtractionChunk]:
+    """
+    Groups sections into extraction requests of at most `max_tokens` of section text: sections
+    over the budget are split into several requests, and runs of small adjacent sections are
+    packed into one request (at most `max_sections` each, None for no limit; 1 disables packing).
+    """
+    chunks: List[ExtractionChunk] = []
+    pack: List[SectionPiece] = []
+    pack_tokens = 0
+
+    def flush():
+        nonlocal pack, pack_tokens
+        if pack:
+            chunks.append(ExtractionChunk(pack))
+        pack, pack_tokens = [], 0
+
+    for section in sections:
+        content = section.content
+        tokens = estimate_tokens(content) + PART_OVERHEAD_TOKENS
+        if tokens > max_tokens:
+            flush()
+            texts = split_text(content, max_tokens)
+            chunks.extend(ExtractionChunk([SectionPiece(section, text, i, len(texts))]) for i, text in enumerate(texts))
+            continue
+        if pack and (pack_tokens + tokens > max_tokens or (max_sections is not None and len(pack) >= max_sections)):
+            flush()
+        pack.append(SectionPiece(section, content))
+        pack_tokens += tokens
+    flush()
+    return chunks
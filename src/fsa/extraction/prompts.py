@@ -1,5 +1,8 @@
 # src/fsa/extraction/prompts.py
 
+# Bump whenever the prompts below change meaningfully; part of the extraction cache key.
+CLAIM_EXTRACTION_PROMPT_VERSION = "v2"
+
 CLAIM_EXTRACTION_SYSTEM_PROMPT = """
 You are a Forensic Semiotic Auditor specialized in analyzing scientific and technical documents.
 Your task is to identify and extract atomic claims made within a given text section.
@@ -13,7 +16,7 @@ RULES:
 4. Maintain the original phrasing as closely as possible while ensuring clarity.
 5. Classify the claim type strictly according to the definitions provided in the output schema (THEOREM, EMPIRICAL, PREDICTION, DEFINITION, ASSERTION).
 
-You MUST use the provided Pydantic schema (ClaimExtractionResult) to structure your output. Do not invent information.
+You MUST use the provided tool schema to structure your output. Do not invent information.
 """
 
 CLAIM_EXTRACTION_USER_TEMPLATE = """
@@ -26,3 +29,19 @@ Content:
 
 Extract the atomic claims according to the required schema.
 """
+
+# Several small sections packed into one request (see fsa.extraction.chunking)
+CLAIM_EXTRACTION_PACKED_USER_TEMPLATE = """
+Analyze the following sections of the document. Each section starts with a [Part N] marker.
+
+{parts}
+
+Extract the atomic claims according to the required schema. For every claim, set `part` to the number N of the section it comes from.
+"""
+
+CLAIM_EXTRACTION_PART_TEMPLATE = """[Part {number}]
+Title: {section_title}
+Content:
+
+{section_content}
+"""
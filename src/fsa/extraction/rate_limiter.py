@@ -0,0 +1,80 @@
+# src/fsa/extraction/rate_limiter.py
+from typing import Callable, Optional
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text), used for budgeting only."""
+    return len(text) // 4 + 1
+
+class _TokenBucket:
+    """A bucket holding up to `per_minute` units that refills continuously."""
+    def __init__(self, per_minute: int, now: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = now
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        # Requests larger than the whole budget are clamped, otherwise they could never run
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+class AsyncRateLimiter:
+    """
+    Enforces requests-per-minute and tokens-per-minute budgets for LLM calls.
+    Either budget may be None (unlimited). State is guarded by a thread lock rather than
+    asyncio primitives, so one limiter can be shared by event loops running in different threads
+    (e.g. concurrent workflow runs that share a ClaimExtractionService).
+    """
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        now = clock()
+        self._requests = _TokenBucket(requests_per_minute, now) if requests_per_minute else None
+        self._tokens = _TokenBucket(tokens_per_minute, now) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Takes capacity if available and returns 0, otherwise returns the seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            if now < self._paused_until:
+                return self._paused_until - now
+
+            wait = 0.0
+            for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+                if bucket:
+                    bucket.refill(now)
+                    wait = max(wait, bucket.wait_time(amount))
+            if wait > 0:
+                return wait
+
+            if self._requests:
+                self._requests.level -= 1
+            if self._tokens:
+                self._tokens.level -= min(tokens, self._tokens.capacity)
+            return 0.0
+
+    async def acquire(self, tokens: int = 0):
+        """Waits until one request consuming `tokens` tokens fits within both budgets."""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Blocks all acquisitions for `seconds` (e.g. after the provider answered 429 with Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+        logger.warning(f"LLM rate limit hit; pausing new requests for {seconds:.1f}s.")
@@ -1,68 +1,379 @@
 # src/fsa/extraction/service.py
 import openai
 import instructor
+import asyncio
+import inspect
 import logging
-from typing import List
-# Import the Langfuse-patched OpenAI client for automatic tracing
-from langfuse.openai import openai as langfuse_openai
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Type, Union
+from instructor.function_calls import openai_schema
+from instructor.utils import classproperty
+from pydantic import BaseModel
 
-from fsa.core.models import ParsedSection, ClaimExtractionResult, ExtractedClaim, UUID4
-from fsa.extraction.prompts import CLAIM_EXTRACTION_SYSTEM_PROMPT, CLAIM_EXTRACTION_USER_TEMPLATE
-from fsa.core.observability import get_langfuse_client
+from fsa.core.models import ParsedSection, ClaimExtractionResult, ExtractedClaim, PackedClaimExtractionResult, PackedExtractedClaim, UUID4
+from fsa.extraction.prompts import (CLAIM_EXTRACTION_SYSTEM_PROMPT, CLAIM_EXTRACTION_USER_TEMPLATE, CLAIM_EXTRACTION_PROMPT_VERSION,
+                                    CLAIM_EXTRACTION_PACKED_USER_TEMPLATE, CLAIM_EXTRACTION_PART_TEMPLATE)
+from fsa.extraction.chunking import ExtractionChunk
+from fsa.core.observability import get_langfuse_client, get_telemetry_exporter
+from fsa.extraction.rate_limiter import AsyncRateLimiter, estimate_tokens
+from fsa.extraction.cache import ExtractionCache
+from fsa.extraction.usage import TokenUsage, current_usage
+from fsa.extraction.backends import BackendClient, LLMBackend
 
 logger = logging.getLogger(__name__)
 
+# Tags of the per-document Langfuse trace of extraction requests
+EXTRACTION_TRACE_TAGS = ["extraction", "fsa_phase1", "instructor"]
+# OpenAI's limit on the length of a request metadata value
+METADATA_VALUE_MAX_CHARS = 512
+
+# compile_response_model relies on Instructor internals (openai_schema() classes and their
+# `openai_schema` classproperty, which handle_response_model uses as is). Verified against this
+# release series; tests/fsa/test_prompt_prefix.py fails if they change.
+INSTRUCTOR_VERSION_SERIES = "1.3."
+
+@lru_cache(maxsize=None)
+def compile_response_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Instructor's tool definition for `model`, built once per process. Given a plain model,
+    Instructor creates a wrapper class and regenerates its JSON schema on every request
+    (~2.5 ms); the compiled class also renders byte-identical tool JSON for every request,
+    which keeps the prompt prefix cacheable by the provider.
+    """
+    compiled = openai_schema(model)
+    if not isinstance(inspect.getattr_static(compiled, "openai_schema", None), classproperty):
+        raise RuntimeError(f"Unsupported instructor version: openai_schema() classes changed (tested with "
+                           f"{INSTRUCTOR_VERSION_SERIES}x); update compile_response_model.")
+    schema = compiled.openai_schema
+    compiled.openai_schema = classproperty(lambda cls: schema)
+    return compiled
+
 class ClaimExtractionService:
-    def __init__(self, model="gpt-4o"):
+    # Rough allowance for the completion when budgeting tokens-per-minute
+    COMPLETION_TOKEN_ALLOWANCE = 1000
+    # How often a request rejected with HTTP 429 is retried after pausing the limiter
+    MAX_RATE_LIMIT_RETRIES = 3
+
+    def __init__(self, model="gpt-4o", rate_limiter: Optional[AsyncRateLimiter] = None,
+                 cache: Optional[ExtractionCache] = None, bypass_cache: bool = False,
+                 prompt_cache_key: Optional[str] = None, backend: Optional[LLMBackend] = None):
         self.model = model
         self.langfuse_client = get_langfuse_client()
+        # Completions are traced as Langfuse generations through the background exporter (off the request path)
+        self.telemetry = get_telemetry_exporter() if self.langfuse_client else None
+        # Shared by every concurrent extraction issued through this service
+        self.rate_limiter = rate_limiter or AsyncRateLimiter()
+        # Response cache; with bypass_cache, lookups are skipped but fresh results still refresh it
+        self.cache = cache
+        self.bypass_cache = bypass_cache
 
-        # Initialize the Instructor-patched client.
-        # We use the Langfuse-patched client as the base for Instructor, combining both capabilities.
-        if self.langfuse_client:
-            logger.info("Initializing Instructor with Langfuse-patched OpenAI client.")
-            self.client = instructor.from_openai(langfuse_openai)
-        else:
-            # Fallback if Langfuse is not configured
-            logger.warning("Initializing Instructor with standard OpenAI client (no tracing).")
-            self.client = instructor.from_openai(openai.OpenAI())
+        # Routes requests with the same static prefix to the same provider cache shard
+        self.prompt_cache_key = prompt_cache_key or f"fsa-claim-extraction-{CLAIM_EXTRACTION_PROMPT_VERSION}"
+        # Token usage (incl. provider-cached prompt tokens) of every request made through this service
+        self.usage = TokenUsage()
+        self.response_models = {
+            False: compile_response_model(ClaimExtractionResult),
+            True: compile_response_model(PackedClaimExtractionResult),
+        }
 
-    def extract_claims(self, document_id: UUID4, section: ParsedSection) -> List[ExtractedClaim]:
-        """Extracts claims from a ParsedSection using an LLM with structured output enforcement."""
+        # Requests go to this backend instead of OpenAI when given (e.g. StubLLMBackend for offline runs)
+        self.backend = backend
+        if backend is not None:
+            logger.info(f"Using LLM backend {type(backend).__name__}.")
+            self.client = BackendClient(backend, self._record_usage)
+            return
 
-        # Define metadata for Langfuse
-        trace_name = f"FSA_ClaimExtraction_Doc{str(document_id)[:8]}"
-        metadata = {"document_id": str(document_id), "section_id": str(section.section_id), "section_title": section.title}
+        # Initialize the Instructor-patched client
+        if not self.telemetry:
+            logger.warning("Langfuse is not configured; LLM calls will not be traced.")
+        base_client = openai.OpenAI()
+        self._record_usage_of(base_client, is_async=False)
+        self.client = instructor.from_openai(base_client)
 
-        user_prompt = CLAIM_EXTRACTION_USER_TEMPLATE.format(
-            section_title=section.title,
-            section_content=section.content
+    def _record_usage_of(self, base_client, is_async: bool):
+        """
+        Wraps the raw completions endpoint so every response's usage is recorded (and traced).
+        Instructor only reports summed prompt/completion tokens on its result and drops the
+        cached-token details.
+        """
+        completions = base_client.chat.completions
+        create = completions.create
+        if is_async:
+            async def recording_create(*args, **kwargs):
+                started = datetime.now(timezone.utc)
+                response = await create(*args, **kwargs)
+                self._record_usage(response)
+                self._trace_generation(kwargs, response, started)
+                return response
+        else:
+            def recording_create(*args, **kwargs):
+                started = datetime.now(timezone.utc)
+                response = create(*args, **kwargs)
+                self._record_usage(response)
+                self._trace_generation(kwargs, response, started)
+                return response
+        completions.create = recording_create
+
+    def _trace_generation(self, request: dict, response, started: datetime):
+        """Queues a Langfuse generation for a raw completion; a no-op without tracing."""
+        if not self.telemetry:
+            return
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        choices = getattr(response, "choices", None)
+        metadata = request.get("metadata") or {}
+        # One trace per document (upserted by id), grouping the generations of all its requests
+        document_id = metadata.get("document_id", "unknown")
+        trace_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"fsa-claim-extraction/{document_id}"))
+        self.telemetry.emit("trace", id=trace_id, name=f"FSA_ClaimExtraction_Doc{document_id[:8]}",
+                            tags=EXTRACTION_TRACE_TAGS, metadata={"document_id": document_id})
+        self.telemetry.emit(
+            "generation", trace_id=trace_id, name="claim_extraction", model=request.get("model"), start_time=started,
+            end_time=datetime.now(timezone.utc), input=request.get("messages"),
+            output=choices[0].message if choices else None,
+            usage={"input": usage.prompt_tokens, "output": usage.completion_tokens, "total": usage.total_tokens} if usage else None,
+            metadata={**metadata, "prompt_cache_key": request.get("prompt_cache_key"),
+                      "cached_prompt_tokens": getattr(details, "cached_tokens", None) if details else None},
         )
 
-        messages = [
+    def _record_usage(self, response):
+        self.usage.record(response)
+        run_usage = current_usage()
+        if run_usage is not None:
+            run_usage.record(response)
+
+    def _build_messages(self, section: ParsedSection) -> List[dict]:
+        return self._build_chunk_messages(ExtractionChunk.of(section))
+
+    def _build_chunk_messages(self, chunk: ExtractionChunk) -> List[dict]:
+        if chunk.is_packed:
+            parts = "\n".join(
+                CLAIM_EXTRACTION_PART_TEMPLATE.format(number=number, section_title=piece.section.title, section_content=piece.text)
+                for number, piece in enumerate(chunk.pieces, start=1)
+            )
+            user_prompt = CLAIM_EXTRACTION_PACKED_USER_TEMPLATE.format(parts=parts)
+        else:
+            # A whole section renders exactly as before chunking existed (same cache keys)
+            piece = chunk.pieces[0]
+            title = piece.section.title
+            if piece.is_split:
+                title = f"{title} (part {piece.index + 1} of {piece.count})"
+            user_prompt = CLAIM_EXTRACTION_USER_TEMPLATE.format(
+                section_title=title,
+                section_content=piece.text
+            )
+
+        return [
             {"role": "system", "content": CLAIM_EXTRACTION_SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt}
         ]
 
+    @staticmethod
+    def _describe(chunk: ExtractionChunk) -> str:
+        if chunk.is_packed:
+            return "sections " + ", ".join(f"'{piece.section.title}'" for piece in chunk.pieces)
+        piece = chunk.pieces[0]
+        suffix = f" (part {piece.index + 1} of {piece.count})" if piece.is_split else ""
+        return f"section '{piece.section.title}'{suffix}"
+
+    def _request_kwargs(self, document_id: UUID4, chunk: ExtractionChunk) -> dict:
+        # Request metadata (OpenAI accepts up to 16 string values of at most 512 characters);
+        # also attached to the Langfuse trace of the document (see _trace_generation)
+        sections = chunk.sections
+        metadata = {"document_id": str(document_id),
+                    "section_id": ",".join(str(s.section_id) for s in sections)[:METADATA_VALUE_MAX_CHARS],
+                    "section_title": ", ".join(s.title for s in sections)[:METADATA_VALUE_MAX_CHARS]}
+
+        # Call the LLM, requesting the specific Pydantic model (ClaimExtractionResult, precompiled).
+        # Instructor handles parsing, validation, and retries.
+        # The tools and system prompt are identical for every request: the provider caches that prefix.
+        request = dict(
+            model=self.model,
+            response_model=self.response_models[chunk.is_packed],
+            messages=self._build_chunk_messages(chunk),
+            prompt_cache_key=self.prompt_cache_key,
+            temperature=0.0, # Deterministic output
+            max_retries=3,   # Instructor provides built-in retries for validation failures
+            metadata=metadata,
+        )
+        if chunk.is_packed:
+            # Lets PackedExtractedClaim reject part numbers outside this request
+            request["validation_context"] = {"parts": len(chunk.pieces)}
+        return request
+
+    def _cache_key(self, request: dict) -> Optional[str]:
+        if not self.cache:
+            return None
+        return ExtractionCache.make_key(self.model, request["messages"], CLAIM_EXTRACTION_PROMPT_VERSION)
+
+    def _cached_claims(self, cache_key: Optional[str], chunk: ExtractionChunk) -> Optional[List[ExtractedClaim]]:
+        if not cache_key or self.bypass_cache:
+            return None
+        claims = self.cache.get(cache_key, PackedExtractedClaim if chunk.is_packed else ExtractedClaim)
+        if claims is not None:
+            logger.info(f"Loaded {len(claims)} cached claims for {self._describe(chunk)}.")
+        return claims
+
+    def _store_claims(self, cache_key: Optional[str], claims: List[ExtractedClaim]):
+        if cache_key:
+            try:
+                self.cache.put(cache_key, self.model, claims)
+            except Exception as e:
+                # The cache is an optimization; never fail extraction because of it
+                logger.warning(f"Failed to store extraction result in cache: {e}")
+
+    @staticmethod
+    def _claims_per_piece(chunk: ExtractionChunk, claims: List[ExtractedClaim]) -> List[List[ExtractedClaim]]:
+        """Maps a response back onto the chunk's pieces (packed claims carry their part number)."""
+        if not chunk.is_packed:
+            return [claims]
+        per_piece: List[List[ExtractedClaim]] = [[] for _ in chunk.pieces]
+        for claim in claims:
+            # Out-of-range parts only occur in cached entries written by other code; clamp them
+            index = min(max(claim.part, 1), len(chunk.pieces)) - 1
+            per_piece[index].append(ExtractedClaim(claim_text=claim.claim_text, claim_type=claim.claim_type, confidence=claim.confidence))
+        return per_piece
+
+    def extract_claims(self, document_id: UUID4, section: ParsedSection, raise_on_error: bool = False) -> List[ExtractedClaim]:
+        """
+        Extracts claims from a ParsedSection using an LLM with structured output enforcement.
+        Errors are logged and yield no claims, unless `raise_on_error` is set.
+        """
+        return self.extract_chunk_claims(document_id, ExtractionChunk.of(section), raise_on_error=raise_on_error)[0]
+
+    def extract_chunk_claims(self, document_id: UUID4, chunk: ExtractionChunk, raise_on_error: bool = False) -> List[List[ExtractedClaim]]:
+        """Like extract_claims, for a chunk (see fsa.extraction.chunking); returns the claims of each piece."""
+        request = self._request_kwargs(document_id, chunk)
+        cache_key = self._cache_key(request)
+        cached = self._cached_claims(cache_key, chunk)
+        if cached is not None:
+            return self._claims_per_piece(chunk, cached)
+
         try:
-            # Call the LLM, requesting the specific Pydantic model (ClaimExtractionResult).
-            # Instructor handles the JSON schema definition, parsing, validation, and retries.
-            extracted_result: ClaimExtractionResult = self.client.chat.completions.create(
-                model=self.model,
-                response_model=ClaimExtractionResult,
-                messages=messages,
-                temperature=0.0, # Deterministic output
-                max_retries=3,   # Instructor provides built-in retries for validation failures
-                # Langfuse specific arguments (passed via the patched client if available)
-                metadata=metadata,
-                tags=["extraction", "fsa_phase1", "instructor"],
-                name=trace_name
-            )
+            extracted_result = self.client.chat.completions.create(**request)
 
-            logger.info(f"Extracted {len(extracted_result.claims)} claims from section '{section.title}'.")
-            return extracted_result.claims
+            logger.info(f"Extracted {len(extracted_result.claims)} claims from {self._describe(chunk)}.")
+            self._store_claims(cache_key, extracted_result.claims)
+            return self._claims_per_piece(chunk, extracted_result.claims)
 
         except Exception as e:
             # Catches OpenAI errors and Instructor validation errors (if retries fail)
-            logger.error(f"Error during claim extraction for section {section.section_id}: {e}")
-            return []
+            logger.error(f"Error during claim extraction for {self._describe(chunk)}: {e}")
+            if raise_on_error:
+                raise
+            return [[] for _ in chunk.pieces]
+
+    # --- Async extraction path ---
+
+    def _create_async_client(self):
+        """
+        Creates an Instructor-patched async client. The underlying HTTP pool is bound to the
+        event loop, so a client is created per extraction batch rather than per service.
+        """
+        if self.backend is not None:
+            client = BackendClient(self.backend, self._record_usage, is_async=True)
+            return client, client
+        base_client = openai.AsyncOpenAI()
+        self._record_usage_of(base_client, is_async=True)
+        return base_client, instructor.from_openai(base_client)
+
+    async def aextract_claims(self, client, document_id: UUID4, section: ParsedSection, raise_on_error: bool = False) -> List[ExtractedClaim]:
+        """Async counterpart of extract_claims; waits on the rate limiter before each request."""
+        return (await self.aextract_chunk_claims(client, document_id, ExtractionChunk.of(section), raise_on_error=raise_on_error))[0]
+
+    async def aextract_chunk_claims(self, client, document_id: UUID4, chunk: ExtractionChunk, raise_on_error: bool = False) -> List[List[ExtractedClaim]]:
+        """Async counterpart of extract_chunk_claims."""
+        request = self._request_kwargs(document_id, chunk)
+        cache_key = self._cache_key(request)
+        cached = self._cached_claims(cache_key, chunk)
+        if cached is not None:
+            return self._claims_per_piece(chunk, cached)
+
+        tokens = sum(estimate_tokens(m["content"]) for m in request["messages"]) + self.COMPLETION_TOKEN_ALLOWANCE
+
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(tokens)
+            try:
+                extracted_result = await client.chat.completions.create(**request)
+                logger.info(f"Extracted {len(extracted_result.claims)} claims from {self._describe(chunk)}.")
+                self._store_claims(cache_key, extracted_result.claims)
+                return self._claims_per_piece(chunk, extracted_result.claims)
+
+            except openai.RateLimitError as e:
+                attempt += 1
+                if attempt <= self.MAX_RATE_LIMIT_RETRIES:
+                    retry_after = e.response.headers.get("retry-after") if e.response is not None else None
+                    self.rate_limiter.pause(float(retry_after) if retry_after else 2.0 ** attempt)
+                    continue
+                logger.error(f"Error during claim extraction for {self._describe(chunk)}: {e}")
+                if raise_on_error:
+                    raise
+                return [[] for _ in chunk.pieces]
+
+            except Exception as e:
+                logger.error(f"Error during claim extraction for {self._describe(chunk)}: {e}")
+                if raise_on_error:
+                    raise
+                return [[] for _ in chunk.pieces]
+
+    async def aextract_claims_for_sections(
+        self, document_id: UUID4, sections: Sequence[ParsedSection], max_concurrency: int = 8,
+        on_section_done: Optional[Callable[[ParsedSection, List[ExtractedClaim]], None]] = None,
+        raise_on_error: bool = False,
+    ) -> List[Union[List[ExtractedClaim], Exception]]:
+        """
+        Extracts claims from many sections concurrently (bounded by `max_concurrency` and the
+        rate limiter). Results are returned in the order of `sections`; with `raise_on_error`,
+        a failed section yields its exception in place of a claim list.
+        `on_section_done` is called for every successful section as soon as it completes.
+        """
+        on_chunk_done = None
+        if on_section_done:
+            on_chunk_done = lambda chunk, claims: on_section_done(chunk.pieces[0].section, claims[0])
+        results = await self.aextract_claims_for_chunks(
+            document_id, [ExtractionChunk.of(section) for section in sections], max_concurrency=max_concurrency,
+            on_chunk_done=on_chunk_done, raise_on_error=raise_on_error,
+        )
+        return [result if isinstance(result, Exception) else result[0] for result in results]
+
+    async def aextract_claims_for_chunks(
+        self, document_id: UUID4, chunks: Sequence[ExtractionChunk], max_concurrency: int = 8,
+        on_chunk_done: Optional[Callable[[ExtractionChunk, List[List[ExtractedClaim]]], None]] = None,
+        raise_on_error: bool = False,
+    ) -> List[Union[List[List[ExtractedClaim]], Exception]]:
+        """aextract_claims_for_sections for chunks: each result holds the claims of every piece."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        base_client, client = self._create_async_client()
+
+        async def run(chunk: ExtractionChunk):
+            async with semaphore:
+                claims = await self.aextract_chunk_claims(client, document_id, chunk, raise_on_error=raise_on_error)
+            if on_chunk_done:
+                on_chunk_done(chunk, claims)
+            return claims
+
+        try:
+            return await asyncio.gather(*(run(chunk) for chunk in chunks), return_exceptions=raise_on_error)
+        finally:
+            await base_client.close()
+
+    def extract_claims_concurrently(self, document_id: UUID4, sections: Sequence[ParsedSection], max_concurrency: int = 8,
+                                    on_section_done: Optional[Callable[[ParsedSection, List[ExtractedClaim]], None]] = None,
+                                    raise_on_error: bool = False) -> List[Union[List[ExtractedClaim], Exception]]:
+        """Synchronous entry point for aextract_claims_for_sections (runs its own event loop)."""
+        return asyncio.run(self.aextract_claims_for_sections(
+            document_id, sections, max_concurrency=max_concurrency,
+            on_section_done=on_section_done, raise_on_error=raise_on_error,
+        ))
+
+    def extract_chunks_concurrently(self, document_id: UUID4, chunks: Sequence[ExtractionChunk], max_concurrency: int = 8,
+                                    on_chunk_done: Optional[Callable[[ExtractionChunk, List[List[ExtractedClaim]]], None]] = None,
+                                    raise_on_error: bool = False) -> List[Union[List[List[ExtractedClaim]], Exception]]:
+        """Synchronous entry point for aextract_claims_for_chunks (runs its own event loop)."""
+        return asyncio.run(self.aextract_claims_for_chunks(
+            document_id, chunks, max_concurrency=max_concurrency,
+            on_chunk_done=on_chunk_done, raise_on_error=raise_on_error,
+        ))
@@ -0,0 +1,63 @@
+# src/fsa/extraction/usage.py
+from typing import Any, Dict, Iterator, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+
+class TokenUsage:
+    """
+    Token counts of LLM completions, including prompt tokens the provider served from its
+    prompt cache (usage.prompt_tokens_details.cached_tokens). Thread-safe.
+    """
+    def __init__(self):
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'TokenUsage':
+        """Resumes counting from as_dict() output (e.g. kept in WorkflowState.metrics across retries)."""
+        usage = cls()
+        for name in ("requests", "prompt_tokens", "cached_prompt_tokens", "completion_tokens"):
+            setattr(usage, name, (data or {}).get(name, 0))
+        return usage
+
+    def record(self, completion: Any):
+        """Adds the usage reported on a raw chat completion (ignored when it carries none)."""
+        usage = getattr(completion, "usage", None)
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += usage.prompt_tokens or 0
+            self.completion_tokens += usage.completion_tokens or 0
+            self.cached_prompt_tokens += (getattr(details, "cached_tokens", None) or 0) if details else 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_prompt_tokens": self.cached_prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "cached_prompt_ratio": round(self.cached_prompt_tokens / self.prompt_tokens, 4) if self.prompt_tokens else 0.0,
+            }
+
+# Usage of the workflow run whose extraction executes in this context (thread or asyncio task;
+# tasks inherit it, so it also covers the concurrent extraction path)
+_CURRENT_USAGE: ContextVar[Optional[TokenUsage]] = ContextVar("fsa_current_token_usage", default=None)
+
+@contextmanager
+def track_usage(usage: TokenUsage) -> Iterator[TokenUsage]:
+    """Additionally records every LLM response received inside the block into `usage`."""
+    token = _CURRENT_USAGE.set(usage)
+    try:
+        yield usage
+    finally:
+        _CURRENT_USAGE.reset(token)
+
+def current_usage() -> Optional[TokenUsage]:
+    return _CURRENT_USAGE.get()
@@ -1,51 +1,197 @@
 # src/fsa/ingestion/arxiv_fetcher.py
 import arxiv
 import hashlib
-import requests
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import lru_cache
 from tenacity import retry, stop_after_attempt, wait_exponential
 from fsa.core.models import Document, DocumentSource
+from fsa.core.artifact_store import ArtifactStore
+from fsa.ingestion.downloader import PDFDownloader
+from fsa.ingestion.metadata_cache import ArxivMetadataCache
 import logging
-from typing import Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# The arXiv API accepts up to this many IDs per id_list query (one result page)
+ARXIV_MAX_BATCH_SIZE = 100
+_VERSION_SUFFIX = re.compile(r"v\d+$")
+# arxiv.Client is not thread-safe; requests through the shared client are serialized
+_ARXIV_CLIENT_LOCK = threading.Lock()
+
+@lru_cache(maxsize=1)
+def get_arxiv_client() -> arxiv.Client:
+    """
+    Process-wide arXiv API client. The client spaces its requests by `delay_seconds`, so sharing
+    one instance enforces the API's polite rate across all fetchers and batch runs.
+    """
+    return arxiv.Client(page_size=ARXIV_MAX_BATCH_SIZE, delay_seconds=3.0, num_retries=3)
+
 class ArxivFetcher:
-    def __init__(self):
-        self.client = arxiv.Client()
+    def __init__(self, downloader: Optional[PDFDownloader] = None, metadata_cache: Optional[ArxivMetadataCache] = None,
+                 client: Optional[arxiv.Client] = None):
+        self.client = client or get_arxiv_client()
+        # Pooled keep-alive session, streaming and range/conditional downloads
+        self.downloader = downloader or PDFDownloader()
+        self.metadata_cache = metadata_cache
 
     @retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=4, max=10))
     def _fetch_pdf_content(self, pdf_url: str) -> bytes:
         """Fetches the PDF content from the URL with retries."""
-        response = requests.get(pdf_url)
+        response = self.downloader.session.get(pdf_url, timeout=self.downloader.timeout)
         response.raise_for_status()
         return response.content
 
-    def fetch_by_id(self, arxiv_id: str) -> Tuple[Document, bytes]:
-        """Fetches metadata and the PDF content for a given arXiv ID."""
-        search = arxiv.Search(id_list=[arxiv_id])
+    @retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=4, max=10))
+    def _fetch_pdf_to_store(self, pdf_url: str, store: ArtifactStore) -> str:
+        """Streams the PDF into the artifact store with retries; returns its SHA-256 digest."""
+        return self.downloader.download(pdf_url, store)
+
+    # --- Metadata ---
+
+    @staticmethod
+    def _to_record(arxiv_id: str, paper: arxiv.Result) -> Dict[str, Any]:
+        """The subset of arxiv.Result the pipeline needs, as a JSON-serializable record."""
+        return {
+            "arxiv_id": arxiv_id,
+            "entry_id": paper.entry_id,
+            "title": paper.title,
+            "authors": [author.name for author in paper.authors],
+            "published": paper.published.isoformat(),
+            "summary": paper.summary,
+            "pdf_url": paper.pdf_url,
+        }
+
+    def _query_batch(self, arxiv_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """One id_list query for up to ARXIV_MAX_BATCH_SIZE IDs; returns records by requested ID."""
+        search = arxiv.Search(id_list=arxiv_ids, max_results=len(arxiv_ids))
         try:
-            paper = next(self.client.results(search))
-        except StopIteration:
-            raise ValueError(f"ArXiv paper with ID {arxiv_id} not found.")
+            with _ARXIV_CLIENT_LOCK:
+                papers = list(self.client.results(search))
         except Exception as e:
-            logger.error(f"Error fetching ArXiv metadata for {arxiv_id}: {e}")
+            logger.error(f"Error fetching ArXiv metadata for {len(arxiv_ids)} IDs: {e}")
             raise
 
-        logger.info(f"Fetching PDF for {arxiv_id} from {paper.pdf_url}")
-        pdf_content = self._fetch_pdf_content(paper.pdf_url)
+        # Results carry versioned short IDs (1706.03762v7); match requests with or without a version
+        by_short_id = {}
+        for paper in papers:
+            short_id = paper.get_short_id()
+            by_short_id[short_id] = paper
+            by_short_id.setdefault(_VERSION_SUFFIX.sub("", short_id), paper)
+        return {arxiv_id: self._to_record(arxiv_id, by_short_id[arxiv_id])
+                for arxiv_id in arxiv_ids if arxiv_id in by_short_id}
 
-        # Calculate hash for immutability/provenance
-        content_hash = hashlib.sha256(pdf_content).hexdigest()
+    def iter_metadata(self, arxiv_ids: Iterable[str], batch_size: int = ARXIV_MAX_BATCH_SIZE) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Yields (arxiv_id, record) in input order; record is None for IDs arXiv does not know.
+        IDs are consumed lazily in batches: cached records are served from disk and the rest of
+        each batch is resolved with a single id_list query.
+        """
+        batch_size = min(batch_size, ARXIV_MAX_BATCH_SIZE)
+        ids = iter(arxiv_ids)
+        while True:
+            batch = [arxiv_id for _, arxiv_id in zip(range(batch_size), ids)]
+            if not batch:
+                return
+
+            records = {}
+            if self.metadata_cache:
+                for arxiv_id in batch:
+                    cached = self.metadata_cache.get(arxiv_id)
+                    if cached is not None:
+                        records[arxiv_id] = cached
+            missing = list(dict.fromkeys(arxiv_id for arxiv_id in batch if arxiv_id not in records))
+            if missing:
+                fetched = self._query_batch(missing)
+                logger.info(f"Fetched ArXiv metadata for {len(fetched)}/{len(missing)} IDs in one query.")
+                if self.metadata_cache:
+                    for arxiv_id, record in fetched.items():
+                        self.metadata_cache.put(arxiv_id, record)
+                records.update(fetched)
+
+            for arxiv_id in batch:
+                yield arxiv_id, records.get(arxiv_id)
+
+    def _fetch_record(self, arxiv_id: str) -> Dict[str, Any]:
+        _, record = next(self.iter_metadata([arxiv_id]))
+        if record is None:
+            raise ValueError(f"ArXiv paper with ID {arxiv_id} not found.")
+        return record
 
-        doc = Document(
-            source_url=paper.entry_id,
-            title=paper.title,
-            authors=[author.name for author in paper.authors],
+    def _build_document(self, record: Dict[str, Any], content_hash: str) -> Document:
+        return Document(
+            source_url=record["entry_id"],
+            title=record["title"],
+            authors=record["authors"],
             source_type=DocumentSource.ARXIV,
             raw_content_hash=content_hash,
             metadata={
-                "published": paper.published.isoformat(),
-                "summary": paper.summary,
+                "arxiv_id": record["arxiv_id"],
+                "published": record["published"],
+                "summary": record["summary"],
             }
         )
-        return doc, pdf_content
+
+    # --- Fetching ---
+
+    def fetch_by_id(self, arxiv_id: str) -> Tuple[Document, bytes]:
+        """Fetches metadata and the PDF content for a given arXiv ID."""
+        record = self._fetch_record(arxiv_id)
+
+        logger.info(f"Fetching PDF for {arxiv_id} from {record['pdf_url']}")
+        pdf_content = self._fetch_pdf_content(record["pdf_url"])
+
+        # Calculate hash for immutability/provenance
+        content_hash = hashlib.sha256(pdf_content).hexdigest()
+        return self._build_document(record, content_hash), pdf_content
+
+    def fetch_to_store(self, arxiv_id: str, store: ArtifactStore, record: Optional[Dict[str, Any]] = None) -> Tuple[Document, str]:
+        """
+        Fetches metadata (unless a prefetched `record` from iter_metadata is given) and streams the
+        PDF into `store` without buffering it in memory.
+        Returns the document and the artifact digest (also its raw_content_hash).
+        """
+        record = record or self._fetch_record(arxiv_id)
+
+        logger.info(f"Fetching PDF for {arxiv_id} from {record['pdf_url']}")
+        digest = self._fetch_pdf_to_store(record["pdf_url"], store)
+        return self._build_document(record, digest), digest
+
+    def fetch_many(self, arxiv_ids: Iterable[str], store: ArtifactStore, batch_size: int = ARXIV_MAX_BATCH_SIZE,
+                   download_workers: int = 4) -> Iterator[Document]:
+        """
+        Fetches many papers: metadata via batched id_list queries, PDFs streamed into `store`.
+        Downloads start as soon as each metadata batch arrives, and Documents are yielded as their
+        downloads finish (completion order). Unknown IDs and failed downloads are logged and skipped.
+        """
+        metadata = self.iter_metadata(arxiv_ids, batch_size=batch_size)
+        max_in_flight = download_workers * 2
+        with ThreadPoolExecutor(max_workers=download_workers, thread_name_prefix="fsa-fetch") as pool:
+            in_flight = {}
+
+            def submit_next(count: int):
+                while count > 0:
+                    item = next(metadata, None)
+                    if item is None:
+                        return
+                    arxiv_id, record = item
+                    if record is None:
+                        logger.warning(f"ArXiv paper with ID {arxiv_id} not found; skipping.")
+                        continue
+                    in_flight[pool.submit(self.fetch_to_store, arxiv_id, store, record)] = arxiv_id
+                    count -= 1
+
+            submit_next(max_in_flight)
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    arxiv_id = in_flight.pop(future)
+                    try:
+                        document, _ = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to fetch ArXiv paper {arxiv_id}: {e}")
+                        continue
+                    yield document
+                submit_next(len(done))
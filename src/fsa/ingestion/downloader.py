@@ -0,0 +1,155 @@
+# src/fsa/ingestion/downloader.py
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import hashlib
+import json
+import logging
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from fsa.core.artifact_store import ArtifactStore
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def get_http_session(pool_size: int = 10) -> requests.Session:
+    """
+    Shared keep-alive session per pool size. Connections are reused across downloads (and across
+    the threads of a batch run) instead of opening a new TCP/TLS connection per PDF.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class RangeNotSupported(Exception):
+    """The server ignored a Range request; the caller falls back to a single stream."""
+
+class PDFDownloader:
+    """
+    Streams downloads straight into an ArtifactStore, hashing while writing.
+      - Large files (>= range_min_bytes) are split into `range_workers` HTTP range requests when
+        the server advertises `Accept-Ranges: bytes`.
+      - ETag/Last-Modified of each URL are remembered next to the store (`<root>/http/`), so a
+        re-fetch of an unchanged file is a conditional request answered with 304.
+    """
+    def __init__(self, session: Optional[requests.Session] = None, pool_size: int = 10,
+                 timeout: Tuple[float, float] = (10, 60), chunk_size: int = 256 * 1024,
+                 range_workers: int = 1, range_min_bytes: int = 8 * 1024 * 1024, conditional: bool = True):
+        self.session = session or get_http_session(pool_size)
+        # (connect, read) timeouts; requests has no timeout by default
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.range_workers = range_workers
+        self.range_min_bytes = range_min_bytes
+        self.conditional = conditional
+
+    # --- Validator records (conditional requests) ---
+
+    def _validator_path(self, store: ArtifactStore, url: str) -> str:
+        return os.path.join(store.root, "http", f"{hashlib.sha256(url.encode()).hexdigest()}.json")
+
+    def _load_validators(self, store: ArtifactStore, url: str) -> Optional[Dict[str, str]]:
+        try:
+            with open(self._validator_path(store, url), 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        # Only useful while the blob it validates is still stored
+        return record if store.exists(record.get("digest", "")) else None
+
+    def _save_validators(self, store: ArtifactStore, url: str, response: requests.Response, digest: str):
+        record = {"digest": digest, "etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+        if not record["etag"] and not record["last_modified"]:
+            return
+        path = self._validator_path(store, url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        os.replace(tmp_path, path)
+
+    def _conditional_headers(self, validators: Optional[Dict[str, str]]) -> Dict[str, str]:
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    # --- Downloads ---
+
+    def download(self, url: str, store: ArtifactStore) -> str:
+        """Downloads `url` into `store` and returns the content's SHA-256 digest."""
+        validators = self._load_validators(store, url) if self.conditional else None
+        headers = self._conditional_headers(validators)
+
+        if self.range_workers > 1:
+            head = self.session.head(url, headers=headers, timeout=self.timeout, allow_redirects=True)
+            if head.status_code == 304 and validators:
+                logger.info(f"Not modified since last fetch: {url}")
+                return validators["digest"]
+            head.raise_for_status()
+            size = int(head.headers.get("Content-Length") or 0)
+            if head.headers.get("Accept-Ranges") == "bytes" and size >= self.range_min_bytes:
+                try:
+                    digest = self._download_ranges(head.url, size, store)
+                    self._save_validators(store, url, head, digest)
+                    return digest
+                except RangeNotSupported:
+                    logger.info(f"Server ignored range requests for {url}; downloading as a single stream.")
+
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 304 and validators:
+                logger.info(f"Not modified since last fetch: {url}")
+                return validators["digest"]
+            response.raise_for_status()
+            with store.open_writer() as writer:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    writer.write(chunk)
+                digest = writer.commit()
+            self._save_validators(store, url, response, digest)
+        logger.info(f"Downloaded {writer.size} bytes from {url}")
+        return digest
+
+    def _download_ranges(self, url: str, size: int, store: ArtifactStore) -> str:
+        part = -(-size // self.range_workers)
+        ranges: List[Tuple[int, int]] = [(start, min(start + part, size) - 1) for start in range(0, size, part)]
+
+        tmp_path = store.temp_path()
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.truncate(size)
+            with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                # list() surfaces the first failure
+                list(pool.map(lambda r: self._fetch_range(url, r, tmp_path), ranges))
+            logger.info(f"Downloaded {size} bytes from {url} in {len(ranges)} ranges")
+            # Hashing needs the bytes in order, so it runs once all ranges are on disk
+            return store.put_file(tmp_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _fetch_range(self, url: str, byte_range: Tuple[int, int], tmp_path: str):
+        start, end = byte_range
+        headers = {"Range": f"bytes={start}-{end}"}
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code != 206:
+                response.raise_for_status()
+                raise RangeNotSupported(url)
+            fd = os.open(tmp_path, os.O_WRONLY)
+            try:
+                offset = start
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    os.pwrite(fd, chunk, offset)
+                    offset += len(chunk)
+            finally:
+                os.close(fd)
+        if offset != end + 1:
+            raise IOError(f"Short range response for {url}: expected bytes {start}-{end}, got {offset - start} bytes")
@@ -0,0 +1,46 @@
+# src/fsa/ingestion/metadata_cache.py
+from typing import Any, Dict, Optional
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+class ArxivMetadataCache:
+    """
+    On-disk cache of arXiv metadata records (one JSON file per ID), so repeated batch audits
+    do not query the API again for papers seen within `ttl_seconds`.
+    """
+    def __init__(self, cache_dir: str = "./cache/arxiv_metadata", ttl_seconds: float = 7 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, arxiv_id: str) -> str:
+        # Old-style IDs contain a slash (e.g. hep-th/9901001)
+        return os.path.join(self.cache_dir, f"{arxiv_id.replace('/', '_')}.json")
+
+    def get(self, arxiv_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached record, or None if it is missing or older than the TTL."""
+        path = self._path(arxiv_id)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable arXiv metadata cache entry {path}: {e}")
+            return None
+
+        if time.time() - entry.get("fetched_at", 0) > self.ttl_seconds:
+            return None
+        return entry["record"]
+
+    def put(self, arxiv_id: str, record: Dict[str, Any]):
+        path = self._path(arxiv_id)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write-then-rename so concurrent batches never read a partial entry
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"fetched_at": time.time(), "record": record}, f)
+        os.replace(tmp_path, path)
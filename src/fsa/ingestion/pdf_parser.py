@@ -1,61 +1,151 @@
 # src/fsa/ingestion/pdf_parser.py
 import fitz  # PyMuPDF
 from fsa.core.models import Document, ParsedSection
-from typing import List
+from typing import Iterator, List, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
 import logging
+import os
 import re
 
 logger = logging.getLogger(__name__)
 
+PDFContent = Union[bytes, memoryview]
+
+# --- Worker process helpers (page-parallel extraction) ---
+
+_worker_doc = None
+
+def _init_page_worker(pdf_content: bytes):
+    """Opens the PDF once per worker process; page ranges are then extracted from it."""
+    global _worker_doc
+    _worker_doc = fitz.open("pdf", pdf_content)
+
+def _extract_page_range(page_range: Tuple[int, int]) -> str:
+    start, stop = page_range
+    return "".join(_worker_doc[i].get_text("text") for i in range(start, stop))
+
 class PDFParser:
+    # Bump when the splitting logic changes output; cached parses of older versions are ignored
+    PARSER_VERSION = "1"
     # Heuristic pattern for academic headings
     SECTION_PATTERN = re.compile(r"\n(\d+(\.\d+)*\s+[A-Z][a-zA-Z\s\-]+|Abstract|Introduction|References|Conclusion|Methodology|Related Work)\n")
+    # Any character outside the heading title class; once one follows a heading match, more text
+    # cannot change that match, so the section before it can be emitted while streaming.
+    _TITLE_TERMINATOR = re.compile(r"[^a-zA-Z\s\-]")
+    # Characters that cannot appear anywhere inside a heading match (numbering included)
+    _HEADING_BLOCKER = re.compile(r"[^0-9.a-zA-Z\s\-]+")
 
-    def parse(self, document: Document, pdf_content: bytes) -> List[ParsedSection]:
+    def __init__(self, workers: int = 1, pages_per_task: int = 16):
+        # workers > 1 extracts page text in that many worker processes (PyMuPDF is CPU-bound)
+        self.workers = workers
+        self.pages_per_task = pages_per_task
+
+    @classmethod
+    def version(cls) -> str:
+        """Identifies the parser output format: the logic version plus a digest of SECTION_PATTERN."""
+        pattern_digest = hashlib.sha256(cls.SECTION_PATTERN.pattern.encode()).hexdigest()[:12]
+        return f"{cls.PARSER_VERSION}-{pattern_digest}"
+
+    def parse(self, document: Document, pdf_content: PDFContent) -> List[ParsedSection]:
         """
         Parses PDF content into structured sections using heuristics.
         """
+        sections = list(self.iter_sections(document, pdf_content))
+        logger.info(f"Parsed {len(sections)} sections from document {document.id}.")
+        return sections
+
+    def iter_sections(self, document: Document, pdf_content: PDFContent, workers: Optional[int] = None) -> Iterator[ParsedSection]:
+        """
+        Streaming parse: yields each section as soon as the pages following it reveal where it ends.
+        Produces exactly the sections `parse` returns. `pdf_content` may be bytes or a buffer such
+        as a memory-mapped view from the artifact store.
+        """
         try:
             doc = fitz.open("pdf", pdf_content)
         except Exception as e:
             logger.error(f"Failed to open PDF content for document {document.id}: {e}")
             raise
 
-        full_text = ""
-        for page in doc:
-            full_text += page.get_text("text")
+        workers = self.workers if workers is None else workers
+        if workers > 1 and doc.page_count > self.pages_per_task:
+            page_chunks = self._iter_pages_parallel(pdf_content, doc.page_count, workers)
+        else:
+            page_chunks = (page.get_text("text") for page in doc)
+
+        yield from self._split_sections(document, page_chunks)
 
-        sections = []
-        current_pos = 0
+    def _iter_pages_parallel(self, pdf_content: PDFContent, page_count: int, workers: int) -> Iterator[str]:
+        """Extracts page ranges in worker processes, yielding their text in page order."""
+        if not isinstance(pdf_content, bytes):
+            pdf_content = bytes(pdf_content)  # Buffers such as mmap views cannot be sent to workers
+        ranges = [(start, min(start + self.pages_per_task, page_count)) for start in range(0, page_count, self.pages_per_task)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges), os.cpu_count() or 1),
+                                 initializer=_init_page_worker, initargs=(pdf_content,)) as pool:
+            yield from pool.map(_extract_page_range, ranges)
+
+    def _split_sections(self, document: Document, text_chunks: Iterator[str]) -> Iterator[ParsedSection]:
+        # The current section's text is kept as `parts` (already scanned, no heading can start
+        # there) plus `tail` (may still hold the start of a heading), so each character is copied
+        # a bounded number of times instead of rebuilding one ever-growing string.
+        parts: List[str] = []
+        tail = ""
         current_title = "Preamble"
         current_level = 1
 
-        # Logic to split the text based on the regex pattern
-        for match in self.SECTION_PATTERN.finditer(full_text):
-            # Capture content of the previous section
-            content = full_text[current_pos:match.start()].strip()
-            if content:
-                sections.append(ParsedSection(
-                    document_id=document.id, title=current_title, content=content, level=current_level
-                ))
-
-            # Start the new section
-            current_title = match.group(1).strip()
-            current_pos = match.end()
-
-            # Determine level based on numbering (e.g., "1." vs "1.1.")
-            header_start = current_title.split()[0]
-            if re.match(r'^\d+(\.\d+)*$', header_start.replace('.', '')):
-                 current_level = header_start.count(".") + 1
-            else:
-                 current_level = 1
+        for chunk in text_chunks:
+            tail += chunk
+
+            # Logic to split the text based on the regex pattern
+            while True:
+                match = self.SECTION_PATTERN.search(tail)
+                if not match or not self._TITLE_TERMINATOR.search(tail, match.end()):
+                    break  # Wait for more text: the match may still grow or move
+                # Capture content of the previous section
+                section = self._make_section(document, current_title, current_level, "".join(parts) + tail[:match.start()])
+                if section:
+                    yield section
+                # Start the new section
+                current_title, current_level = self._heading(match)
+                parts = []
+                tail = tail[match.end():]
+
+            # A heading can only start after the last character that cannot occur inside one
+            last_blocker = max((m.end() for m in self._HEADING_BLOCKER.finditer(tail)), default=0)
+            if last_blocker:
+                parts.append(tail[:last_blocker])
+                tail = tail[last_blocker:]
+
+        # End of document: every remaining match is final
+        while True:
+            match = self.SECTION_PATTERN.search(tail)
+            if not match:
+                break
+            section = self._make_section(document, current_title, current_level, "".join(parts) + tail[:match.start()])
+            if section:
+                yield section
+            current_title, current_level = self._heading(match)
+            parts = []
+            tail = tail[match.end():]
 
         # Capture the last section
-        content = full_text[current_pos:].strip()
-        if content:
-            sections.append(ParsedSection(
-                document_id=document.id, title=current_title, content=content, level=current_level
-            ))
+        section = self._make_section(document, current_title, current_level, "".join(parts) + tail)
+        if section:
+            yield section
 
-        logger.info(f"Parsed {len(sections)} sections from document {document.id}.")
-        return sections
+    def _make_section(self, document: Document, title: str, level: int, text: str) -> Optional[ParsedSection]:
+        content = text.strip()
+        if not content:
+            return None
+        return ParsedSection.trusted(document.id, title, content, level)
+
+    @staticmethod
+    def _heading(match: re.Match) -> Tuple[str, int]:
+        title = match.group(1).strip()
+        # Determine level based on numbering (e.g., "1." vs "1.1.")
+        header_start = title.split()[0]
+        if re.match(r'^\d+(\.\d+)*$', header_start.replace('.', '')):
+             level = header_start.count(".") + 1
+        else:
+             level = 1
+        return title, level
@@ -0,0 +1,60 @@
+# src/fsa/ingestion/section_cache.py
+from fsa.core.models import Document, ParsedSection
+from typing import List, Optional
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+class ParsedSectionCache:
+    """
+    Caches parser output per PDF, keyed by Document.raw_content_hash and the parser version
+    (PDFParser.version()), so identical PDFs (re-runs, duplicate versions, mirrored submissions)
+    are parsed once. Entries of other parser versions are never read, which invalidates the
+    cache whenever SECTION_PATTERN or the parser logic changes.
+    """
+    def __init__(self, cache_dir: str = "./artifacts/parsed_sections"):
+        self.cache_dir = cache_dir
+
+    def _path(self, content_hash: str, parser_version: str) -> str:
+        # Shard by hash prefix to keep directories small
+        return os.path.join(self.cache_dir, content_hash[:2], f"{content_hash}.{parser_version}.json")
+
+    def get(self, document: Document, parser_version: str) -> Optional[List[ParsedSection]]:
+        """Returns the cached sections re-bound to `document`, or None on a miss."""
+        path = self._path(document.raw_content_hash, parser_version)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable parsed-section cache entry {path}: {e}")
+            return None
+
+        # Section IDs are per run; only the parsed content is shared
+        return [ParsedSection.trusted(document.id, e["title"], e["content"], e["level"]) for e in entries]
+
+    def put(self, document: Document, parser_version: str, sections: List[ParsedSection]):
+        path = self._path(document.raw_content_hash, parser_version)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entries = [{"title": s.title, "content": s.content, "level": s.level} for s in sections]
+
+        # Write-then-rename so concurrent runs never read a partial entry
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
+        logger.info(f"Cached {len(sections)} parsed sections for content hash {document.raw_content_hash[:16]}.")
+
+    def prune(self, parser_version: str) -> int:
+        """Deletes entries written by other parser versions; returns how many were removed."""
+        removed = 0
+        suffix = f".{parser_version}.json"
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json") and not name.endswith(suffix):
+                    os.remove(os.path.join(root, name))
+                    removed += 1
+        return removed
@@ -1,6 +1,6 @@
 # src/fsa/orchestration/abstractions.py
 from abc import ABC, abstractmethod
-from typing import Dict, Any, TYPE_CHECKING
+from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
 from pydantic import BaseModel, Field
 import logging
 
@@ -44,7 +44,14 @@ class WorkflowStep(ABC):
     """
     Abstract base class for a single, executable step.
     Steps are designed to be atomic and idempotent where possible.
+
+    For DAG execution (OrchestrationEngine.run_dag_workflow), steps declare the
+    WorkflowState fields they read (`inputs`) and write (`outputs`). A step whose
+    `inputs` is None is treated as depending on every step defined before it.
     """
+    inputs: Optional[Tuple[str, ...]] = None
+    outputs: Tuple[str, ...] = ()
+
     def __init__(self, name: str, agent: Agent):
         self.name = name
         self.agent = agent
@@ -0,0 +1,228 @@
+# src/fsa/orchestration/batch.py
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import argparse
+import itertools
+import json
+import logging
+import threading
+import time
+
+from fsa.orchestration.abstractions import WorkflowStep
+from fsa.orchestration.state import WorkflowState, StepStatus
+from fsa.orchestration.engine import OrchestrationEngine
+from fsa.orchestration.metrics import serve_metrics
+from fsa.orchestration.workflows import define_arxiv_audit_workflow_v1, ARXIV_AUDIT_WORKFLOW_NAME
+from fsa.agents.ingestor_agent import FetchArxivStep
+from fsa.ingestion.arxiv_fetcher import ArxivFetcher, ARXIV_MAX_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+class StageLimitedStep(WorkflowStep):
+    """
+    Wraps a step shared between concurrent runs so that at most `limit` runs execute it at once
+    (e.g. to cap parallel LLM extraction while fetching and parsing run wider).
+    """
+    def __init__(self, step: WorkflowStep, limit: int):
+        super().__init__(step.name, step.agent)
+        self.step = step
+        self.inputs = step.inputs
+        self.outputs = step.outputs
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit)
+
+    def execute(self, state: WorkflowState) -> WorkflowState:
+        with self._semaphore:
+            return self.step.execute(state)
+
+    def rollback(self, state: WorkflowState):
+        self.step.rollback(state)
+
+class JsonlResultSink:
+    """Appends one JSON record per finished run; safe to share between worker threads."""
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, record: Dict[str, Any]):
+        line = json.dumps(record, sort_keys=True, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            # Flush per record so partial batches are visible (and survive a crash)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+class BatchAuditRunner:
+    """
+    Runs the ArXiv audit workflow over many IDs with bounded parallelism.
+    The workflow steps (and their fetcher, parser and LLM clients) and the engine are
+    created once and shared by every run. ArXiv metadata is prefetched with batched id_list
+    queries (`metadata_fetcher`, by default the workflow's own fetcher) and handed to each run.
+    """
+    def __init__(self, env_config: Dict[str, Any], max_concurrent_runs: int = 8,
+                 stage_limits: Optional[Dict[str, int]] = None, use_dag: bool = False,
+                 engine: Optional[OrchestrationEngine] = None, steps: Optional[List[WorkflowStep]] = None,
+                 metadata_fetcher: Optional[ArxivFetcher] = None):
+        self.env_config = env_config
+        self.max_concurrent_runs = max_concurrent_runs
+        self.use_dag = use_dag
+        self.engine = engine or OrchestrationEngine(max_workers=env_config.get("max_parallel_steps", 4))
+
+        steps = steps if steps is not None else define_arxiv_audit_workflow_v1(env_config)
+        stage_limits = stage_limits or {}
+        unknown = set(stage_limits) - {step.name for step in steps}
+        if unknown:
+            raise ValueError(f"Stage limits reference unknown steps: {sorted(unknown)}")
+        self.steps = [StageLimitedStep(step, stage_limits[step.name]) if step.name in stage_limits else step for step in steps]
+
+        if metadata_fetcher is None and env_config.get("prefetch_arxiv_metadata", True):
+            metadata_fetcher = next((step.fetcher for step in steps if isinstance(step, FetchArxivStep)), None)
+        self.metadata_fetcher = metadata_fetcher
+        self.metadata_batch_size = env_config.get("arxiv_metadata_batch_size", ARXIV_MAX_BATCH_SIZE)
+
+    def run_one(self, arxiv_id: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Runs a single audit and returns its summary record (never raises)."""
+        context = {"arxiv_id": arxiv_id}
+        if metadata:
+            context["arxiv_metadata"] = metadata
+        state = WorkflowState(workflow_name=ARXIV_AUDIT_WORKFLOW_NAME, context=context)
+        started = time.monotonic()
+        error = None
+        try:
+            if self.use_dag:
+                state = self.engine.run_dag_workflow(self.steps, state)
+            else:
+                state = self.engine.run_workflow(self.steps, state)
+        except Exception as e:
+            logger.error(f"Audit run for {arxiv_id} raised: {e}")
+            state.status = StepStatus.FAILED
+            error = str(e)
+
+        if state.status == StepStatus.FAILED and error is None:
+            last_error_log = next((log for log in reversed(state.execution_history) if log.status == StepStatus.FAILED), None)
+            error = last_error_log.message if last_error_log else None
+
+        return {
+            "arxiv_id": arxiv_id,
+            "run_id": str(state.run_id),
+            "status": state.status.value,
+            "title": state.document.title if state.document else None,
+            "num_sections": len(state.sections),
+            "num_claims": len(state.claims),
+            "duration_seconds": round(time.monotonic() - started, 3),
+            "step_seconds": {name: round(seconds, 3) for name, seconds in state.step_durations().items()},
+            "error": error,
+        }
+
+    def iter_results(self, arxiv_ids: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Yields run records as runs finish (completion order).
+        IDs are consumed lazily, so at most a small multiple of `max_concurrent_runs` are in flight.
+        """
+        items = self._with_metadata(arxiv_ids)
+        max_in_flight = self.max_concurrent_runs * 2
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_runs, thread_name_prefix="fsa-audit") as pool:
+            in_flight = {pool.submit(self.run_one, *item) for item in itertools.islice(items, max_in_flight)}
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                for item in itertools.islice(items, len(done)):
+                    in_flight.add(pool.submit(self.run_one, *item))
+
+    def _with_metadata(self, arxiv_ids: Iterable[str]) -> Iterator[tuple]:
+        """Pairs IDs with prefetched metadata, one id_list query per batch (None if unavailable)."""
+        ids = iter(arxiv_ids)
+        if not self.metadata_fetcher:
+            yield from ((arxiv_id, None) for arxiv_id in ids)
+            return
+        while True:
+            batch = list(itertools.islice(ids, self.metadata_batch_size))
+            if not batch:
+                return
+            try:
+                items = list(self.metadata_fetcher.iter_metadata(batch, batch_size=self.metadata_batch_size))
+            except Exception as e:
+                # Each run then fetches its own metadata (with the fetch step's retries)
+                logger.warning(f"Metadata prefetch failed for {len(batch)} IDs: {e}")
+                items = [(arxiv_id, None) for arxiv_id in batch]
+            yield from items
+
+    def run(self, arxiv_ids: Iterable[str], sink: Optional[JsonlResultSink] = None) -> Dict[str, int]:
+        """Runs every ID, streaming records to `sink`, and returns counts per final status."""
+        summary: Dict[str, int] = {}
+        for record in self.iter_results(arxiv_ids):
+            if sink:
+                sink.write(record)
+            summary[record["status"]] = summary.get(record["status"], 0) + 1
+            logger.info(f"Finished {record['arxiv_id']} with status {record['status']} ({sum(summary.values())} done)")
+        return summary
+
+def read_arxiv_ids(path: str) -> Iterator[str]:
+    """Reads one arXiv ID per line, skipping blank lines and '#' comments."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            arxiv_id = line.split("#", 1)[0].strip()
+            if arxiv_id:
+                yield arxiv_id
+
+def run_arxiv_audit_batch(arxiv_ids: Iterable[str], env_config: Dict[str, Any], output_path: str,
+                          max_concurrent_runs: int = 8, stage_limits: Optional[Dict[str, int]] = None,
+                          use_dag: bool = False, metrics_path: Optional[str] = None) -> Dict[str, int]:
+    """
+    Helper function to audit many ArXiv IDs and stream per-run records to a JSONL file.
+    With `metrics_path`, the engine's step metrics are written there (Prometheus text format) at the end.
+    """
+    runner = BatchAuditRunner(env_config, max_concurrent_runs=max_concurrent_runs,
+                              stage_limits=stage_limits, use_dag=use_dag)
+    sink = JsonlResultSink(output_path)
+    try:
+        return runner.run(arxiv_ids, sink)
+    finally:
+        sink.close()
+        runner.engine.shutdown()
+        if metrics_path and runner.engine.metrics_registry:
+            runner.engine.metrics_registry.write_textfile(metrics_path)
+
+def _parse_stage_limit(value: str):
+    name, _, limit = value.partition("=")
+    if not name or not limit.isdigit() or int(limit) < 1:
+        raise argparse.ArgumentTypeError(f"Expected STEP_NAME=N, got '{value}'")
+    return name, int(limit)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the ArXiv forensic audit over many papers.")
+    parser.add_argument("arxiv_ids", nargs="*", help="ArXiv IDs to audit")
+    parser.add_argument("--ids-file", help="File with one ArXiv ID per line")
+    parser.add_argument("--output", default="audit_results.jsonl", help="JSONL file receiving one record per run")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of workflows running at once")
+    parser.add_argument("--stage-limit", type=_parse_stage_limit, action="append", default=[],
+                        help="Per-step concurrency limit, e.g. Extract_Atomic_Claims=4 (repeatable)")
+    parser.add_argument("--model", default="gpt-4o", help="LLM model used for claim extraction")
+    parser.add_argument("--dag", action="store_true", help="Schedule steps as a DAG within each run")
+    parser.add_argument("--metrics-file", help="Write step metrics (Prometheus text format) to this file at the end")
+    parser.add_argument("--metrics-port", type=int, help="Serve step metrics on http://127.0.0.1:PORT/metrics during the batch")
+    args = parser.parse_args(argv)
+
+    if not args.arxiv_ids and not args.ids_file:
+        parser.error("Provide ArXiv IDs as arguments or via --ids-file.")
+
+    if args.metrics_port:
+        serve_metrics(port=args.metrics_port)
+    arxiv_ids = itertools.chain(args.arxiv_ids, read_arxiv_ids(args.ids_file) if args.ids_file else [])
+    summary = run_arxiv_audit_batch(
+        arxiv_ids, {"llm_model": args.model}, args.output,
+        max_concurrent_runs=args.concurrency, stage_limits=dict(args.stage_limit), use_dag=args.dag,
+        metrics_path=args.metrics_file,
+    )
+    print(f"Batch finished: {summary}. Results written to {args.output}")
+
+if __name__ == '__main__':
+    # Requires environment variables (OPENAI_API_KEY, LANGFUSE_KEYS) to be set
+    import dotenv
+    dotenv.load_dotenv()
+    main()
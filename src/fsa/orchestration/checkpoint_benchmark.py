@@ -0,0 +1,83 @@
+# src/fsa/orchestration/checkpoint_benchmark.py
+"""
+Compares checkpoint snapshot encodings on a realistic WorkflowState (full-text sections and
+hundreds of claims): encoded size, checkpoint() time and load_checkpoint() time.
+
+    python -m fsa.orchestration.checkpoint_benchmark --sections 60 --claims 400 [--offload-sections]
+"""
+from typing import List, Optional, Tuple
+import argparse
+import random
+import string
+import tempfile
+import time
+
+from fsa.core.artifact_store import ArtifactStore
+from fsa.core.models import Document, DocumentSource, ParsedSection, ExtractedClaim, ClaimType
+from fsa.orchestration.state import WorkflowState, StepStatus
+from fsa.orchestration.checkpoint_store import InMemoryCheckpointStore
+from fsa.orchestration.serialization import CHECKPOINT_FORMATS, validate_format
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(words))
+
+def make_realistic_state(num_sections: int = 60, num_claims: int = 400, section_words: int = 1200, seed: int = 0) -> WorkflowState:
+    rng = random.Random(seed)
+    document = Document(source_url="http://arxiv.org/abs/1706.03762v7", title="Attention Is All You Need",
+                        authors=[f"Author {i}" for i in range(8)], source_type=DocumentSource.ARXIV,
+                        raw_content_hash="0" * 64, metadata={"summary": _text(rng, 200)})
+    sections = [ParsedSection(document_id=document.id, title=f"{i + 1} Section", content=_text(rng, section_words), level=1)
+                for i in range(num_sections)]
+    claims = [ExtractedClaim(claim_text=_text(rng, 30), claim_type=rng.choice(list(ClaimType)), confidence=rng.random())
+              for _ in range(num_claims)]
+    state = WorkflowState(workflow_name="benchmark", context={"arxiv_id": "1706.03762"}, document=document,
+                          sections=sections, claims=claims, raw_artifact_ref="sha256:" + "0" * 64)
+    for step in ("Fetch_Arxiv_Document", "Parse_PDF_Sections", "Extract_Atomic_Claims"):
+        state.add_log(step, StepStatus.RUNNING, attempt=1)
+        state.add_log(step, StepStatus.COMPLETED, attempt=1)
+    return state
+
+def benchmark(state: WorkflowState, format: str, compression: Optional[str], repeat: int = 5) -> Tuple[int, float, float]:
+    """Returns (snapshot bytes, best checkpoint seconds, best load seconds)."""
+    store = InMemoryCheckpointStore()
+    save_times, load_times = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        state.checkpoint(store=store, format=format, compression=compression)
+        save_times.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        WorkflowState.load_checkpoint(state.run_id, store=store)
+        load_times.append(time.perf_counter() - started)
+    return len(store.read_snapshot(str(state.run_id))), min(save_times), min(load_times)
+
+def available_combinations() -> List[Tuple[str, Optional[str]]]:
+    combos = []
+    for format in CHECKPOINT_FORMATS:
+        for compression in (None, "zstd"):
+            try:
+                validate_format(format, compression)
+            except RuntimeError:
+                continue  # Optional package not installed
+            combos.append((format, compression))
+    return combos
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark WorkflowState checkpoint encodings.")
+    parser.add_argument("--sections", type=int, default=60)
+    parser.add_argument("--claims", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--offload-sections", action="store_true", help="Store section text in an artifact store")
+    args = parser.parse_args(argv)
+
+    state = make_realistic_state(args.sections, args.claims)
+    if args.offload_sections:
+        state.offload_sections(ArtifactStore(tempfile.mkdtemp(prefix="fsa-bench-")))
+    print(f"{'format':<24}{'size (KiB)':>12}{'save (ms)':>12}{'load (ms)':>12}")
+    for format, compression in available_combinations():
+        size, save, load = benchmark(state, format, compression, args.repeat)
+        name = format + (f"+{compression}" if compression else "")
+        print(f"{name:<24}{size / 1024:>12.1f}{save * 1000:>12.2f}{load * 1000:>12.2f}")
+
+if __name__ == '__main__':
+    main()
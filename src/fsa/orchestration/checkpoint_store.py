@@ -0,0 +1,256 @@
+# src/fsa/orchestration/checkpoint_store.py
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set
+from functools import lru_cache
+import logging
+import os
+import sqlite3
+import threading
+
+from fsa.orchestration.serialization import SNAPSHOT_EXTENSIONS, snapshot_extension
+
+logger = logging.getLogger(__name__)
+
+class CheckpointStore(ABC):
+    """
+    Persists serialized WorkflowState checkpoints (Report Section 8.1).
+    A checkpoint is a snapshot plus an optional journal of delta records; the journal's
+    first record is a header written by reset_journal.
+    """
+
+    @abstractmethod
+    def write_snapshot(self, run_id: str, data: bytes):
+        """Atomically replaces the snapshot of a run."""
+
+    @abstractmethod
+    def read_snapshot(self, run_id: str) -> Optional[bytes]:
+        """Returns the snapshot of a run, or None if the run has no checkpoint."""
+
+    @abstractmethod
+    def reset_journal(self, run_id: str, header: bytes):
+        """Discards the run's journal and starts a new one with `header` as its first record."""
+
+    @abstractmethod
+    def append_journal(self, run_id: str, record: bytes):
+        """Appends one record to the run's journal."""
+
+    @abstractmethod
+    def read_journal(self, run_id: str) -> List[bytes]:
+        """Returns the run's journal records in order (empty if there is none)."""
+
+    def flush(self):
+        """Makes all writes so far durable (for stores that defer syncing)."""
+
+class FileCheckpointStore(CheckpointStore):
+    """
+    Stores `<run_id>.<ext>` snapshots (named by encoding: .json, .json.zst, .msgpack or
+    .msgpack.zst) and `<run_id>.journal` files in a directory.
+    Snapshots are written to a temporary file and renamed into place, so a crash never
+    leaves a truncated checkpoint behind; a snapshot in another encoding is removed afterwards. `fsync` controls durability against power loss:
+      - "always": fsync every write (and the directory after renames)
+      - "batch":  fsync all files written so far on every `fsync_every`-th write and on flush()
+      - "never":  leave syncing to the OS
+    """
+    FSYNC_POLICIES = ("always", "batch", "never")
+
+    def __init__(self, checkpoint_dir: str = "./checkpoints", fsync: str = "batch", fsync_every: int = 16):
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}'. Expected one of {self.FSYNC_POLICIES}.")
+        self.checkpoint_dir = checkpoint_dir
+        self.fsync = fsync
+        self.fsync_every = fsync_every
+        self._lock = threading.Lock()
+        self._dirty: Set[str] = set()
+        self._writes_since_sync = 0
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def for_directory(checkpoint_dir: str) -> 'FileCheckpointStore':
+        """Shared default store per directory, so fsync batching spans callers that only pass a path."""
+        return FileCheckpointStore(checkpoint_dir)
+
+    def snapshot_path(self, run_id: str, extension: str = ".json") -> str:
+        return os.path.join(self.checkpoint_dir, f"{run_id}{extension}")
+
+    def _existing_snapshot_paths(self, run_id: str) -> List[str]:
+        """Snapshots of the run in any encoding, newest first."""
+        paths = []
+        for extension in SNAPSHOT_EXTENSIONS:
+            path = self.snapshot_path(run_id, extension)
+            try:
+                paths.append((os.stat(path).st_mtime_ns, path))
+            except FileNotFoundError:
+                continue
+        return [path for _, path in sorted(paths, reverse=True)]
+
+    def journal_path(self, run_id: str) -> str:
+        return os.path.join(self.checkpoint_dir, f"{run_id}.journal")
+
+    def _write_atomic(self, path: str, data: bytes):
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                if self.fsync == "always":
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            # The previous checkpoint is untouched; just drop the partial temp file
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._after_write(path, renamed=True)
+
+    def _after_write(self, path: str, renamed: bool = False):
+        if self.fsync == "always":
+            if renamed:
+                self._fsync_directory()
+        elif self.fsync == "batch":
+            with self._lock:
+                self._dirty.add(path)
+                self._writes_since_sync += 1
+                due = self._writes_since_sync >= self.fsync_every
+            if due:
+                self.flush()
+
+    def _fsync_directory(self):
+        fd = os.open(self.checkpoint_dir, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def flush(self):
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            self._writes_since_sync = 0
+        if not dirty:
+            return
+        for path in dirty:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue  # Replaced or removed since it was written
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        self._fsync_directory()
+
+    def write_snapshot(self, run_id: str, data: bytes):
+        path = self.snapshot_path(run_id, snapshot_extension(data))
+        self._write_atomic(path, data)
+        # The run switched encodings: drop the older snapshot (if we crash first, the newest one wins on read)
+        for stale in self._existing_snapshot_paths(run_id):
+            if stale != path:
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+
+    def read_snapshot(self, run_id: str) -> Optional[bytes]:
+        for path in self._existing_snapshot_paths(run_id):
+            try:
+                with open(path, 'rb') as f:
+                    return f.read()
+            except FileNotFoundError:
+                continue  # Removed by a concurrent write in another encoding
+        return None
+
+    def reset_journal(self, run_id: str, header: bytes):
+        self._write_atomic(self.journal_path(run_id), header + b"\n")
+
+    def append_journal(self, run_id: str, record: bytes):
+        path = self.journal_path(run_id)
+        with open(path, 'ab') as f:
+            f.write(record + b"\n")
+            if self.fsync == "always":
+                f.flush()
+                os.fsync(f.fileno())
+        self._after_write(path)
+
+    def read_journal(self, run_id: str) -> List[bytes]:
+        try:
+            with open(self.journal_path(run_id), 'rb') as f:
+                return f.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """
+    Keeps all checkpoints of a deployment in one SQLite database (WAL mode).
+    `synchronous` maps to the SQLite pragma: "FULL" syncs every commit, "NORMAL" only at WAL
+    checkpoints (still crash-safe for the database, may lose the latest commits on power loss).
+    """
+    def __init__(self, path: str = "./checkpoints/checkpoints.sqlite3", synchronous: str = "NORMAL"):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS snapshots (run_id TEXT PRIMARY KEY, data BLOB)")
+        self._conn.execute("""CREATE TABLE IF NOT EXISTS journal (
+            run_id TEXT, seq INTEGER, record BLOB, PRIMARY KEY (run_id, seq)
+        )""")
+        self._conn.commit()
+
+    def write_snapshot(self, run_id: str, data: bytes):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO snapshots(run_id, data) VALUES(?, ?)", (run_id, data))
+
+    def read_snapshot(self, run_id: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM snapshots WHERE run_id = ?", (run_id,)).fetchone()
+        return bytes(row[0]) if row else None
+
+    def reset_journal(self, run_id: str, header: bytes):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM journal WHERE run_id = ?", (run_id,))
+            self._conn.execute("INSERT INTO journal(run_id, seq, record) VALUES(?, 0, ?)", (run_id, header))
+
+    def append_journal(self, run_id: str, record: bytes):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO journal(run_id, seq, record) "
+                "SELECT ?, COALESCE(MAX(seq), -1) + 1, ? FROM journal WHERE run_id = ?",
+                (run_id, record, run_id))
+
+    def read_journal(self, run_id: str) -> List[bytes]:
+        with self._lock:
+            rows = self._conn.execute("SELECT record FROM journal WHERE run_id = ? ORDER BY seq", (run_id,)).fetchall()
+        return [bytes(row[0]) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class InMemoryCheckpointStore(CheckpointStore):
+    """Keeps checkpoints in process memory; intended for tests and throwaway runs."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.snapshots: Dict[str, bytes] = {}
+        self.journals: Dict[str, List[bytes]] = {}
+
+    def write_snapshot(self, run_id: str, data: bytes):
+        with self._lock:
+            self.snapshots[run_id] = data
+
+    def read_snapshot(self, run_id: str) -> Optional[bytes]:
+        with self._lock:
+            return self.snapshots.get(run_id)
+
+    def reset_journal(self, run_id: str, header: bytes):
+        with self._lock:
+            self.journals[run_id] = [header]
+
+    def append_journal(self, run_id: str, record: bytes):
+        with self._lock:
+            self.journals.setdefault(run_id, []).append(record)
+
+    def read_journal(self, run_id: str) -> List[bytes]:
+        with self._lock:
+            return list(self.journals.get(run_id, []))
@@ -1,12 +1,23 @@
 # src/fsa/orchestration/engine.py
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import nullcontext
+from datetime import datetime, timezone
 import logging
+import pickle
+import threading
+import time
+import uuid
+from pydantic_core import to_jsonable_python
 from tenacity import Retrying, stop_after_attempt, wait_exponential, RetryError
 
 from fsa.orchestration.abstractions import WorkflowStep, ResiliencePolicy
 from fsa.orchestration.state import WorkflowState, StepStatus
-from fsa.core.observability import get_langfuse_client
-from langfuse.client import StatefulTraceClient
+from fsa.orchestration.checkpoint_store import CheckpointStore, FileCheckpointStore
+from fsa.orchestration.serialization import validate_format
+from fsa.orchestration.metrics import AttemptTimer, MetricsRegistry, get_metrics_registry
+from fsa.core.artifact_store import ArtifactStore
+from fsa.core.observability import TelemetryExporter, get_langfuse_client, get_telemetry_exporter
 
 logger = logging.getLogger(__name__)
 
@@ -14,18 +25,59 @@ class OrchestrationEngine:
     """
     Manages the execution of workflows, handling sequencing, state, resilience, and observability.
     """
-    def __init__(self, checkpoint_dir: str = "./checkpoints", artifact_dir: str = "./artifacts"):
+    # Fields managed by the engine itself; never merged back from a step executed in another process.
+    ENGINE_MANAGED_FIELDS = ("run_id", "execution_history", "current_step", "status")
+
+    def __init__(self, checkpoint_dir: str = "./checkpoints", artifact_dir: str = "./artifacts",
+                 max_workers: int = 4, step_executor: str = "thread",
+                 checkpoint_mode: str = "snapshot", journal_compact_every: int = 50,
+                 checkpoint_store: Optional[CheckpointStore] = None, checkpoint_format: str = "json",
+                 checkpoint_compression: Optional[str] = None, step_metrics: bool = True,
+                 metrics_registry: Optional[MetricsRegistry] = None, telemetry: Optional[TelemetryExporter] = None):
+        if step_executor not in ("thread", "process"):
+            raise ValueError(f"Unknown step executor '{step_executor}'. Expected 'thread' or 'process'.")
+        if checkpoint_mode not in ("snapshot", "journal"):
+            raise ValueError(f"Unknown checkpoint mode '{checkpoint_mode}'. Expected 'snapshot' or 'journal'.")
         self.checkpoint_dir = checkpoint_dir
+        # Fallback store for offloaded section text; steps that store artifacts take precedence (_artifact_store_for)
         self.artifact_dir = artifact_dir
+        # Where checkpoints go; pick FileCheckpointStore's fsync policy, SQLite or in-memory per deployment
+        self.checkpoint_store = checkpoint_store or FileCheckpointStore(checkpoint_dir)
+        # 'journal' appends per-attempt deltas instead of rewriting the whole state every time
+        self.checkpoint_mode = checkpoint_mode
+        self.journal_compact_every = journal_compact_every
+        # Snapshot encoding, e.g. "msgpack" + "zstd" for states holding full paper text (see serialization.py)
+        validate_format(checkpoint_format, checkpoint_compression)
+        self.checkpoint_format = checkpoint_format
+        self.checkpoint_compression = checkpoint_compression
+        # DAG mode settings: how many steps may run at once, and where step logic executes
+        self.max_workers = max_workers
+        self.step_executor = step_executor
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        # Engines are shared across threads (e.g. BatchAuditRunner): the pool is created once under this lock
+        self._process_pool_lock = threading.Lock()
+        # Per-step wall/CPU time, peak RSS growth, retries and checkpoint write time, summarized in
+        # state.metrics and aggregated in a Prometheus-style registry (step_metrics=False skips all timing)
+        self.step_metrics = step_metrics
+        self.metrics_registry = (metrics_registry or get_metrics_registry()) if step_metrics else None
+        # The step whose attempt runs on this thread, to attribute checkpoint writes
+        self._local = threading.local()
         self.langfuse_client = get_langfuse_client()
+        # Traces and spans are queued to a background exporter, so tracing never delays a step
+        self.telemetry = telemetry or (get_telemetry_exporter() if self.langfuse_client else None)
 
     def run_workflow(self, steps: List[WorkflowStep], initial_state: WorkflowState):
         """Executes the workflow steps sequentially."""
         state = initial_state
+        started = time.perf_counter()
         # Ensure status is RUNNING if starting or resuming
         if state.status != StepStatus.COMPLETED and state.status != StepStatus.FAILED:
              state.status = StepStatus.RUNNING
 
+        self._install_progress_hook(state)
+        # Resumed states may hold offloaded section text
+        state.bind_artifact_store(self._artifact_store_for(steps))
+
         # Initialize Langfuse Trace (Report Section 7.1)
         trace = self._initialize_trace(state)
         logger.info(f"Starting/Resuming workflow '{state.workflow_name}' (Run ID: {state.run_id})")
@@ -62,21 +114,215 @@ class OrchestrationEngine:
                 self._finalize_trace(trace, StepStatus.FAILED)
 
                 # Final checkpoint before exiting
-                state.checkpoint(self.checkpoint_dir)
+                self._record_run(state, started)
+                self._checkpoint(state, final=True)
                 return state
 
         # Workflow completion
         state.status = StepStatus.COMPLETED
         state.current_step = None
-        state.checkpoint(self.checkpoint_dir)
+        self._record_run(state, started)
+        self._checkpoint(state, final=True)
         self._finalize_trace(trace, StepStatus.COMPLETED)
         logger.info(f"Workflow '{state.workflow_name}' completed successfully.")
         return state
 
-    def _execute_step_with_resilience(self, step: WorkflowStep, state: WorkflowState) -> WorkflowState:
+    def run_dag_workflow(self, steps: List[WorkflowStep], initial_state: WorkflowState):
+        """
+        Executes the workflow as a DAG. Dependencies are derived from each step's declared
+        `inputs`/`outputs`; every step whose dependencies have completed is scheduled on a
+        pool of `max_workers` threads, so independent steps overlap.
+        Resumption is per node: steps whose last log entry is COMPLETED are skipped.
+        """
+        state = initial_state
+        started = time.perf_counter()
+        if state.status != StepStatus.COMPLETED and state.status != StepStatus.FAILED:
+             state.status = StepStatus.RUNNING
+
+        dependencies = self._resolve_dependencies(steps)
+        trace = self._initialize_trace(state)
+        logger.info(f"Starting/Resuming DAG workflow '{state.workflow_name}' (Run ID: {state.run_id})")
+
+        completed = self._get_completed_steps(steps, state)
+        pending = [step for step in steps if step.name not in completed]
+        if completed:
+            logger.info(f"Resuming workflow; skipping completed steps: {sorted(completed)}")
+
+        # Serializes history updates and checkpoint writes between concurrently running steps
+        state_lock = threading.RLock()
+        self._install_progress_hook(state, state_lock)
+        state.bind_artifact_store(self._artifact_store_for(steps))
+        failed_steps: List[str] = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fsa-step") as pool:
+            running = {}
+            while pending or running:
+                # Stop scheduling new work once any step has failed permanently
+                if not failed_steps:
+                    ready = [step for step in pending if dependencies[step.name] <= completed]
+                    for step in ready:
+                        pending.remove(step)
+                        state.current_step = step.name
+                        logger.info(f"--- Scheduling step: {step.name} ---")
+                        span = self._initialize_span(trace, step, state)
+                        future = pool.submit(self._execute_step_with_resilience, step, state, state_lock)
+                        running[future] = (step, span)
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step, span = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        # The final failure is already logged by _execute_step_with_resilience
+                        error_message = f"Step '{step.name}' failed permanently after max retries: {e}"
+                        logger.error(error_message)
+                        failed_steps.append(step.name)
+                        self._finalize_span(span, StepStatus.FAILED, state, error_message)
+                        continue
+
+                    completed.add(step.name)
+                    self._finalize_span(span, StepStatus.COMPLETED, state)
+                    logger.info(f"Step '{step.name}' completed successfully.")
+
+        if failed_steps:
+            state.status = StepStatus.FAILED
+            self._finalize_trace(trace, StepStatus.FAILED)
+            self._record_run(state, started)
+            self._checkpoint(state, final=True)
+            return state
+
+        state.status = StepStatus.COMPLETED
+        state.current_step = None
+        self._record_run(state, started)
+        self._checkpoint(state, final=True)
+        self._finalize_trace(trace, StepStatus.COMPLETED)
+        logger.info(f"Workflow '{state.workflow_name}' completed successfully.")
+        return state
+
+    def _checkpoint(self, state: WorkflowState, final: bool = False):
+        started = time.perf_counter() if self.step_metrics else None
+        state.checkpoint(self.checkpoint_dir, journal=self.checkpoint_mode == "journal",
+                         compact_every=self.journal_compact_every, store=self.checkpoint_store,
+                         format=self.checkpoint_format, compression=self.checkpoint_compression)
+        if started is not None:
+            self._record_checkpoint(state, time.perf_counter() - started)
+        if final:
+            # End of a run: make any batched (not yet fsynced) checkpoint writes durable
+            try:
+                self.checkpoint_store.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush checkpoint store for run {state.run_id}: {e}")
+
+    def _install_progress_hook(self, state: WorkflowState, state_lock: Optional[threading.RLock] = None):
+        """Lets steps checkpoint partial progress (WorkflowState.checkpoint_progress) mid-execution."""
+        guard = state_lock if state_lock is not None else nullcontext()
+
+        def checkpoint_progress(progress_state: WorkflowState):
+            with guard:
+                self._checkpoint(progress_state)
+
+        state._progress_hook = checkpoint_progress
+
+    def _resolve_dependencies(self, steps: List[WorkflowStep]) -> Dict[str, Set[str]]:
+        """
+        Maps each step name to the names of the steps it depends on.
+        A step depends on the producers of its declared inputs; inputs nobody produces
+        (e.g. 'context') are expected to be present on the initial state.
+        """
+        names = [step.name for step in steps]
+        if len(set(names)) != len(names):
+            raise ValueError("Step names must be unique to run a workflow as a DAG.")
+
+        producers: Dict[str, List[str]] = {}
+        for step in steps:
+            for field in step.outputs:
+                producers.setdefault(field, []).append(step.name)
+
+        dependencies: Dict[str, Set[str]] = {}
+        for i, step in enumerate(steps):
+            if step.inputs is None:
+                # Undeclared inputs: behave like the sequential engine (barrier on all earlier steps)
+                dependencies[step.name] = set(names[:i])
+            else:
+                dependencies[step.name] = {p for field in step.inputs for p in producers.get(field, []) if p != step.name}
+
+        # Reject cycles up front; they would otherwise stall the scheduler
+        resolved: Set[str] = set()
+        remaining = dict(dependencies)
+        while remaining:
+            ready = [name for name, deps in remaining.items() if deps <= resolved]
+            if not ready:
+                raise ValueError(f"Workflow contains a dependency cycle between steps: {sorted(remaining)}")
+            for name in ready:
+                resolved.add(name)
+                del remaining[name]
+
+        return dependencies
+
+    def _invoke_step(self, step: WorkflowStep, state: WorkflowState, state_lock: Optional[threading.RLock] = None) -> WorkflowState:
+        """
+        Runs the step logic, either inline or in the process pool.
+        In process mode the step (and the state) must be picklable. The worker reports the
+        fields the step changed (see _execute_step_in_worker) and they are applied to the live
+        state object; a step that declares `outputs` fails if it changes any other field.
+        """
+        if self.step_executor != "process":
+            return step.execute(state)
+
+        pool = self._get_process_pool()
+        guard = state_lock if state_lock is not None else nullcontext()
+        with guard:
+            payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        changes = pool.submit(_execute_step_in_worker, step, payload, self.ENGINE_MANAGED_FIELDS).result()
+
+        with guard:
+            for field, (value, removed_keys) in changes.items():
+                if removed_keys is None:
+                    setattr(state, field, value)
+                else:
+                    # Dict fields are merged per key, keeping keys other steps (or the engine) set meanwhile
+                    target = getattr(state, field)
+                    target.update(value)
+                    for key in removed_keys:
+                        target.pop(key, None)
+        return state
+
+    def _artifact_store_for(self, steps: List[WorkflowStep]) -> ArtifactStore:
+        """
+        The store offloaded section text is read from on resume: the one the steps themselves
+        write to (their `artifact_store`, from the agent's artifact_dir config). The engine's
+        artifact_dir only applies to workflows whose steps store no artifacts.
+        """
+        for step in steps:
+            store = getattr(step, "artifact_store", None)
+            if isinstance(store, ArtifactStore):
+                return store
+        return ArtifactStore.for_root(self.artifact_dir)
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._process_pool
+
+    def shutdown(self):
+        """Releases the process pool used for process-mode step execution."""
+        with self._process_pool_lock:
+            pool, self._process_pool = self._process_pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def _execute_step_with_resilience(self, step: WorkflowStep, state: WorkflowState,
+                                      state_lock: Optional[threading.RLock] = None) -> WorkflowState:
         """
         Wraps step execution with retry logic. Crucially, it logs and checkpoints EVERY attempt.
+        When steps run concurrently, `state_lock` guards the shared history and checkpoint writes.
         """
+        guard = state_lock if state_lock is not None else nullcontext()
         policy: ResiliencePolicy = step.agent.resilience_policy
 
         # Configure tenacity based on the agent's policy
@@ -101,26 +347,38 @@ class OrchestrationEngine:
 
             logger.info(f"Attempt {current_attempt} (Max: {policy.max_retries}) for step '{step.name}'")
 
-            # 1. Log RUNNING status and checkpoint (Durability)
-            state.add_log(step.name, StepStatus.RUNNING, attempt=current_attempt)
-            state.checkpoint(self.checkpoint_dir)
-
+            self._local.step = step.name
             try:
-                # 2. Execute the actual agent logic
-                new_state = step.execute(state)
-
-                # 3. Log COMPLETED status and checkpoint
-                new_state.add_log(step.name, StepStatus.COMPLETED, attempt=current_attempt)
-                new_state.checkpoint(self.checkpoint_dir)
-                return new_state
-
-            except Exception as e:
-                logger.warning(f"Attempt {current_attempt} failed for step '{step.name}': {e}")
-
-                # 3. Log FAILED status and checkpoint before raising for retry
-                state.add_log(step.name, StepStatus.FAILED, attempt=current_attempt, message=str(e))
-                state.checkpoint(self.checkpoint_dir)
-                raise # Raise to trigger tenacity retry
+                # 1. Log RUNNING status and checkpoint (Durability)
+                with guard:
+                    state.add_log(step.name, StepStatus.RUNNING, attempt=current_attempt)
+                    self._checkpoint(state)
+
+                timer = AttemptTimer() if self.step_metrics else None
+                try:
+                    # 2. Execute the actual agent logic
+                    new_state = self._invoke_step(step, state, state_lock)
+
+                    # 3. Log COMPLETED status and checkpoint
+                    with guard:
+                        if timer:
+                            self._record_attempt(new_state, step.name, timer, current_attempt, succeeded=True)
+                        new_state.add_log(step.name, StepStatus.COMPLETED, attempt=current_attempt)
+                        self._checkpoint(new_state)
+                    return new_state
+
+                except Exception as e:
+                    logger.warning(f"Attempt {current_attempt} failed for step '{step.name}': {e}")
+
+                    # 3. Log FAILED status and checkpoint before raising for retry
+                    with guard:
+                        if timer:
+                            self._record_attempt(state, step.name, timer, current_attempt, succeeded=False)
+                        state.add_log(step.name, StepStatus.FAILED, attempt=current_attempt, message=str(e))
+                        self._checkpoint(state)
+                    raise # Raise to trigger tenacity retry
+            finally:
+                self._local.step = None
 
         # Execute the wrapper using the retryer
         return retryer(attempt_wrapper)
@@ -130,26 +388,24 @@ class OrchestrationEngine:
         if not state.execution_history:
             return 0
 
-        # Find the last step name that appears in the history
-        last_step_name = state.execution_history[-1].step_name
-
-        try:
-            # Find the index of this step in the current workflow definition
-            last_step_index = next(i for i, step in enumerate(steps) if step.name == last_step_name)
-        except StopIteration:
-            logger.warning("Could not match last executed step in history with current workflow definition. Restarting.")
-            return 0
-
-        # Check the final status of that step (the status of the very last log entry)
-        final_status = state.execution_history[-1].status
-
-        if final_status == StepStatus.COMPLETED:
-            # If completed, start from the next step
-            return last_step_index + 1
-        else:
-            # If failed or running (crashed), restart the same step
-            logger.info(f"Resuming workflow by re-running step '{last_step_name}' due to previous status: {final_status}")
-            return last_step_index
+        # Resume at the first step that has not completed (evaluated per node, not by the last log entry)
+        completed = self._get_completed_steps(steps, state)
+        start_index = next((i for i, step in enumerate(steps) if step.name not in completed), len(steps))
+
+        if start_index < len(steps):
+            last_log = next((log for log in reversed(state.execution_history) if log.step_name == steps[start_index].name), None)
+            if last_log:
+                logger.info(f"Resuming workflow by re-running step '{last_log.step_name}' due to previous status: {last_log.status}")
+        return start_index
+
+    def _get_completed_steps(self, steps: List[WorkflowStep], state: WorkflowState) -> Set[str]:
+        """Returns the names of the steps whose most recent log entry is COMPLETED."""
+        known = {step.name for step in steps}
+        last_status: Dict[str, StepStatus] = {}
+        for log in state.execution_history:
+            if log.step_name in known:
+                last_status[log.step_name] = log.status
+        return {name for name, status in last_status.items() if status == StepStatus.COMPLETED}
 
     def _get_next_base_attempt_number(self, state: WorkflowState, step_name: str) -> int:
         """Determines the starting attempt number if resuming a step that previously failed."""
@@ -163,42 +419,113 @@ class OrchestrationEngine:
         return last_log.attempt + 1
 
 
-    # --- Observability Hooks (Langfuse) ---
+    # --- Metrics ---
+
+    def _record_attempt(self, state: WorkflowState, step_name: str, timer: AttemptTimer, attempt: int, succeeded: bool):
+        """Adds one attempt's measurements to state.metrics["steps"] and the registry (caller holds the state lock)."""
+        wall, cpu, rss_delta = timer.stop()
+        summary = state.metrics.setdefault("steps", {}).setdefault(step_name, _empty_step_summary())
+        summary["attempts"] += 1
+        summary["retries"] += attempt > 1
+        summary["wall_seconds"] = round(summary["wall_seconds"] + wall, 6)
+        summary["cpu_seconds"] = round(summary["cpu_seconds"] + cpu, 6)
+        summary["rss_peak_delta_mb"] = max(summary["rss_peak_delta_mb"], round(rss_delta / 2**20, 3))
+        self.metrics_registry.observe_attempt(state.workflow_name, step_name, succeeded, wall, cpu, rss_delta, retry=attempt > 1)
+
+    def _record_checkpoint(self, state: WorkflowState, seconds: float):
+        # Writes outside a step attempt (run start/end) count towards the workflow summary
+        step_name = getattr(self._local, "step", None)
+        if step_name:
+            summary = state.metrics.setdefault("steps", {}).setdefault(step_name, _empty_step_summary())
+        else:
+            summary = state.metrics.setdefault("workflow", _empty_workflow_summary())
+        summary["checkpoint_writes"] += 1
+        summary["checkpoint_seconds"] = round(summary["checkpoint_seconds"] + seconds, 6)
+        self.metrics_registry.observe_checkpoint(state.workflow_name, step_name, seconds)
+
+    def _record_run(self, state: WorkflowState, started: float):
+        if not self.step_metrics:
+            return
+        wall = time.perf_counter() - started
+        summary = state.metrics.setdefault("workflow", _empty_workflow_summary())
+        summary["wall_seconds"] = round(summary["wall_seconds"] + wall, 6)
+        self.metrics_registry.observe_run(state.workflow_name, state.status.value, wall)
 
-    def _initialize_trace(self, state: WorkflowState) -> Optional[StatefulTraceClient]:
-        if not self.langfuse_client: return None
-        try:
-            # Use Run ID as Trace ID for idempotency/resumption
-            return self.langfuse_client.trace(
-                name=f"FSA_Workflow_{state.workflow_name}", id=str(state.run_id),
-                metadata={"start_context": state.context}, tags=["orchestration", "fsa_v1"]
-            )
-        except Exception as e:
-            logger.warning(f"Failed to initialize Langfuse trace: {e}"); return None
-
-    def _finalize_trace(self, trace: Optional[StatefulTraceClient], status: StepStatus):
+    # --- Observability Hooks (Langfuse) ---
+    # Events are only queued here; the TelemetryExporter ships them from its own thread. Timestamps
+    # are taken now, so late export does not distort the trace.
+
+    def _initialize_trace(self, state: WorkflowState) -> Optional[str]:
+        if not self.telemetry: return None
+        # Use Run ID as Trace ID for idempotency/resumption
+        trace_id = str(state.run_id)
+        # Copy the context: steps keep mutating it before the event is exported
+        self.telemetry.emit("trace", id=trace_id, name=f"FSA_Workflow_{state.workflow_name}",
+                            metadata={"start_context": dict(state.context)}, tags=["orchestration", "fsa_v1"],
+                            timestamp=datetime.now(timezone.utc))
+        return trace_id
+
+    def _finalize_trace(self, trace: Optional[str], status: StepStatus):
         if trace:
             score_value = 1.0 if status == StepStatus.COMPLETED else 0.0
-            trace.score(name="workflow_success", value=score_value)
-
-    def _initialize_span(self, trace: Optional[StatefulTraceClient], step: WorkflowStep, state: WorkflowState):
-         if not trace: return None
-         try:
-             return trace.span(
-                 name=f"Step_{step.name}",
-                 metadata={
-                     "agent": step.agent.name,
-                     "policy": step.agent.define_policy(),
-                     "resilience_policy": step.agent.resilience_policy.model_dump()
-                 }
-            )
-         except Exception as e:
-            logger.warning(f"Failed to initialize Langfuse span: {e}"); return None
-
-    def _finalize_span(self, span, status: StepStatus, state: WorkflowState, error_message: Optional[str] = None):
+            self.telemetry.emit("score", trace_id=trace, name="workflow_success", value=score_value)
+
+    def _initialize_span(self, trace: Optional[str], step: WorkflowStep, state: WorkflowState) -> Optional[Tuple[str, str]]:
+        if not trace: return None
+        span_id = str(uuid.uuid4())
+        self.telemetry.emit(
+            "span", id=span_id, trace_id=trace, name=f"Step_{step.name}", start_time=datetime.now(timezone.utc),
+            metadata={
+                "agent": step.agent.name,
+                "policy": step.agent.define_policy(),
+                "resilience_policy": step.agent.resilience_policy.model_dump()
+            }
+        )
+        return trace, span_id
+
+    def _finalize_span(self, span: Optional[Tuple[str, str]], status: StepStatus, state: WorkflowState,
+                       error_message: Optional[str] = None):
         if span:
-            if error_message:
-                 span.update(output={"error": error_message})
+            trace_id, span_id = span
+            end = {"output": {"error": error_message}} if error_message else {}
+            self.telemetry.emit("span_end", id=span_id, trace_id=trace_id, end_time=datetime.now(timezone.utc), **end)
             score_value = 1.0 if status == StepStatus.COMPLETED else 0.0
-            span.score(name="step_success", value=score_value)
-            span.end()
+            self.telemetry.emit("score", trace_id=trace_id, observation_id=span_id, name="step_success", value=score_value)
+
+def _empty_step_summary() -> Dict[str, float]:
+    return {"attempts": 0, "retries": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "rss_peak_delta_mb": 0.0,
+            "checkpoint_writes": 0, "checkpoint_seconds": 0.0}
+
+def _empty_workflow_summary() -> Dict[str, float]:
+    return {"wall_seconds": 0.0, "checkpoint_writes": 0, "checkpoint_seconds": 0.0}
+
+def _execute_step_in_worker(step: WorkflowStep, payload: bytes, engine_fields: Tuple[str, ...]) -> Dict[str, Tuple]:
+    """
+    Process-pool entry point: runs the step on the pickled state and returns the fields it
+    changed as {field: (value, None)}, or {field: (changed_items, removed_keys)} for dicts.
+    Raises if a step with declared `outputs` changed an undeclared field, which would
+    otherwise be lost silently.
+    """
+    state = pickle.loads(payload)
+    before = pickle.loads(payload)  # Untouched copy to diff against
+    result = step.execute(state)
+
+    changes: Dict[str, Tuple] = {}
+    undeclared = []
+    for field in WorkflowState.model_fields:
+        if field in engine_fields:
+            continue
+        new, old = getattr(result, field), getattr(before, field)
+        if to_jsonable_python(new) == to_jsonable_python(old):
+            continue
+        if step.outputs and field not in step.outputs:
+            undeclared.append(field)
+        elif isinstance(new, dict) and isinstance(old, dict):
+            changed = {key: value for key, value in new.items()
+                       if key not in old or to_jsonable_python(value) != to_jsonable_python(old[key])}
+            changes[field] = (changed, [key for key in old if key not in new])
+        else:
+            changes[field] = (new, None)
+    if undeclared:
+        raise RuntimeError(f"Step '{step.name}' changed fields missing from its declared outputs: {undeclared}")
+    return changes
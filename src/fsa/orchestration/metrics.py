@@ -0,0 +1,208 @@
+# src/fsa/orchestration/metrics.py
+from typing import Dict, Optional, Tuple
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows: peak RSS is reported as 0
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# ru_maxrss is in KiB on Linux and in bytes on macOS
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+# Upper bounds (seconds) of the step attempt duration histogram
+STEP_SECONDS_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, float("inf"))
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process so far."""
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+class AttemptTimer:
+    """
+    Measures one step attempt: wall time, CPU time of the thread running the step (work done in
+    worker processes or other threads is not included) and growth of the process' peak RSS.
+    With steps running concurrently, the RSS growth is shared between them.
+    """
+    __slots__ = ("wall_start", "cpu_start", "rss_start")
+
+    def __init__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        self.rss_start = peak_rss_bytes()
+
+    def stop(self) -> Tuple[float, float, int]:
+        """Returns (wall_seconds, cpu_seconds, peak_rss_delta_bytes)."""
+        return (time.perf_counter() - self.wall_start, time.thread_time() - self.cpu_start,
+                peak_rss_bytes() - self.rss_start)
+
+class MetricsRegistry:
+    """
+    Aggregates engine measurements across runs and renders them in the Prometheus text
+    exposition format (scraped via serve_metrics, or written for node_exporter's textfile
+    collector via write_textfile). Thread-safe.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (workflow, step) -> counters
+        self._steps: Dict[Tuple[str, str], Dict[str, float]] = {}
+        # (workflow, step) -> cumulative histogram bucket counts
+        self._buckets: Dict[Tuple[str, str], list] = {}
+        # (workflow, status) -> [runs, wall seconds]
+        self._runs: Dict[Tuple[str, str], list] = {}
+
+    def _step(self, workflow: str, step: str) -> Dict[str, float]:
+        key = (workflow, step)
+        counters = self._steps.get(key)
+        if counters is None:
+            counters = self._steps[key] = {
+                "attempts_completed": 0, "attempts_failed": 0, "retries": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                "rss_peak_delta_bytes": 0, "checkpoint_writes": 0, "checkpoint_seconds": 0.0,
+            }
+            self._buckets[key] = [0] * len(STEP_SECONDS_BUCKETS)
+        return counters
+
+    def observe_attempt(self, workflow: str, step: str, succeeded: bool, wall_seconds: float, cpu_seconds: float,
+                        rss_delta_bytes: int, retry: bool = False):
+        with self._lock:
+            counters = self._step(workflow, step)
+            counters["attempts_completed" if succeeded else "attempts_failed"] += 1
+            counters["retries"] += retry
+            counters["wall_seconds"] += wall_seconds
+            counters["cpu_seconds"] += cpu_seconds
+            counters["rss_peak_delta_bytes"] = max(counters["rss_peak_delta_bytes"], rss_delta_bytes)
+            buckets = self._buckets[(workflow, step)]
+            for i, bound in enumerate(STEP_SECONDS_BUCKETS):
+                if wall_seconds <= bound:
+                    buckets[i] += 1
+
+    def observe_checkpoint(self, workflow: str, step: Optional[str], seconds: float):
+        with self._lock:
+            counters = self._step(workflow, step or "")
+            counters["checkpoint_writes"] += 1
+            counters["checkpoint_seconds"] += seconds
+
+    def observe_run(self, workflow: str, status: str, wall_seconds: float):
+        with self._lock:
+            run = self._runs.setdefault((workflow, status), [0, 0.0])
+            run[0] += 1
+            run[1] += wall_seconds
+
+    def render(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        with self._lock:
+            steps = {key: dict(counters) for key, counters in self._steps.items()}
+            buckets = {key: list(counts) for key, counts in self._buckets.items()}
+            runs = {key: list(run) for key, run in self._runs.items()}
+
+        lines = []
+
+        def family(name: str, kind: str, help_text: str, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{name}{{{label_text}}} {_format_value(value)}")
+
+        attempts = [((("workflow", w), ("step", s), ("status", status)), c[f"attempts_{status.lower()}"])
+                    for (w, s), c in sorted(steps.items()) if s for status in ("COMPLETED", "FAILED")]
+        family("fsa_step_attempts_total", "counter", "Step attempts by outcome.", attempts)
+
+        def per_step(key):
+            return [((("workflow", w), ("step", s)), c[key]) for (w, s), c in sorted(steps.items()) if s]
+
+        family("fsa_step_retries_total", "counter", "Step attempts that were retries of a failed attempt.", per_step("retries"))
+        family("fsa_step_wall_seconds_total", "counter", "Wall time spent in step attempts.", per_step("wall_seconds"))
+        family("fsa_step_cpu_seconds_total", "counter", "CPU time of the threads running step attempts.", per_step("cpu_seconds"))
+        family("fsa_step_rss_peak_delta_bytes", "gauge", "Largest growth of the process peak RSS during one attempt.",
+               per_step("rss_peak_delta_bytes"))
+
+        histogram = []
+        for (w, s), counts in sorted(buckets.items()):
+            if not s:
+                continue
+            for bound, count in zip(STEP_SECONDS_BUCKETS, counts):
+                histogram.append(((("workflow", w), ("step", s), ("le", "+Inf" if bound == float("inf") else repr(bound))), count))
+        lines.append("# HELP fsa_step_attempt_seconds Wall time of step attempts.")
+        lines.append("# TYPE fsa_step_attempt_seconds histogram")
+        for labels, value in histogram:
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+            lines.append(f"fsa_step_attempt_seconds_bucket{{{label_text}}} {value}")
+        for (w, s), c in sorted(steps.items()):
+            if s:
+                label_text = f'workflow="{_escape(w)}",step="{_escape(s)}"'
+                lines.append(f"fsa_step_attempt_seconds_sum{{{label_text}}} {_format_value(c['wall_seconds'])}")
+                lines.append(f"fsa_step_attempt_seconds_count{{{label_text}}} {c['attempts_completed'] + c['attempts_failed']}")
+
+        # Checkpoints written outside any step (run start/end) carry step=""
+        checkpoints = [((("workflow", w), ("step", s)), c) for (w, s), c in sorted(steps.items())]
+        family("fsa_checkpoint_writes_total", "counter", "Checkpoint writes.",
+               [(labels, c["checkpoint_writes"]) for labels, c in checkpoints])
+        family("fsa_checkpoint_write_seconds_total", "counter", "Time spent writing checkpoints.",
+               [(labels, c["checkpoint_seconds"]) for labels, c in checkpoints])
+
+        family("fsa_workflow_runs_total", "counter", "Finished workflow runs by final status.",
+               [((("workflow", w), ("status", status)), run[0]) for (w, status), run in sorted(runs.items())])
+        family("fsa_workflow_wall_seconds_total", "counter", "Wall time of finished workflow runs.",
+               [((("workflow", w), ("status", status)), run[1]) for (w, status), run in sorted(runs.items())])
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str):
+        """Atomically writes render() to `path` (e.g. for node_exporter's textfile collector)."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+@lru_cache(maxsize=1)
+def get_metrics_registry() -> MetricsRegistry:
+    """Process-wide registry used by engines that are not given their own."""
+    return MetricsRegistry()
+
+def serve_metrics(registry: Optional[MetricsRegistry] = None, host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+    """
+    Serves GET /metrics (Prometheus text format) from a daemon thread and returns the server
+    (call shutdown() to stop it). No tracing backend or extra package needed.
+    """
+    registry = registry or get_metrics_registry()
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="fsa-metrics", daemon=True).start()
+    logger.info(f"Serving metrics on http://{host}:{server.server_port}/metrics")
+    return server
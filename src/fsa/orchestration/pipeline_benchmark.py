@@ -0,0 +1,126 @@
+# src/fsa/orchestration/pipeline_benchmark.py
+"""
+End-to-end throughput benchmark of the ArXiv audit pipeline, fully offline: every paper is the
+fixture PDF (FixtureArxivFetcher) and claims come from the deterministic StubLLMBackend.
+Reports papers/min, p50/p99 latency per step and peak memory, so throughput regressions show
+up before deploying.
+
+    python -m fsa.orchestration.pipeline_benchmark --papers 50 --concurrency 8 --llm-latency 0.2
+"""
+from typing import Any, Dict, List, Optional
+import argparse
+import json
+import logging
+import os
+import resource
+import tempfile
+import time
+
+from fsa.extraction.backends import StubLLMBackend
+from fsa.ingestion.fixture_fetcher import DEFAULT_FIXTURE_PDF
+from fsa.orchestration.batch import BatchAuditRunner
+from fsa.orchestration.engine import OrchestrationEngine
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in [0, 100]); 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil(n * q / 100)
+    return ordered[int(rank) - 1]
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_benchmark(papers: int = 20, concurrency: int = 4, fixture_pdf: str = DEFAULT_FIXTURE_PDF,
+                  stub_options: Optional[Dict[str, Any]] = None, extraction_concurrency: int = 4,
+                  use_dag: bool = False, work_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Audits `papers` synthetic arXiv IDs (caches disabled, fresh checkpoint and artifact
+    directories) and returns throughput, per-step latency percentiles and memory figures.
+    """
+    work_dir = work_dir or tempfile.mkdtemp(prefix="fsa-pipeline-bench-")
+    artifact_dir = os.path.join(work_dir, "artifacts")
+    backend = StubLLMBackend(**(stub_options or {}))
+    env_config = {
+        "artifact_dir": artifact_dir,
+        "arxiv_fixture_pdf": fixture_pdf,
+        "llm_backend": backend,
+        "extraction_concurrency": extraction_concurrency,
+        # Measure the pipeline itself, not cache hits
+        "extraction_cache_path": None,
+        "parsed_section_cache_dir": None,
+    }
+    engine = OrchestrationEngine(checkpoint_dir=os.path.join(work_dir, "checkpoints"), artifact_dir=artifact_dir)
+    runner = BatchAuditRunner(env_config, max_concurrent_runs=concurrency, engine=engine, use_dag=use_dag)
+
+    rss_before = _peak_rss_mb()
+    started = time.monotonic()
+    records = list(runner.iter_results(f"fixture.{i:05d}" for i in range(papers)))
+    elapsed = time.monotonic() - started
+
+    step_seconds: Dict[str, List[float]] = {}
+    for record in records:
+        for name, seconds in record["step_seconds"].items():
+            step_seconds.setdefault(name, []).append(seconds)
+    run_seconds = [record["duration_seconds"] for record in records]
+    return {
+        "papers": papers,
+        "completed": sum(record["status"] == "COMPLETED" for record in records),
+        "failed": sum(record["status"] == "FAILED" for record in records),
+        "claims": sum(record["num_claims"] for record in records),
+        "llm_requests": backend.requests,
+        "llm_failures": backend.failures,
+        "elapsed_seconds": round(elapsed, 3),
+        "papers_per_minute": round(papers / elapsed * 60, 2) if elapsed else 0.0,
+        "run_p50_seconds": percentile(run_seconds, 50),
+        "run_p99_seconds": percentile(run_seconds, 99),
+        "steps": {name: {"p50_seconds": percentile(values, 50), "p99_seconds": percentile(values, 99)}
+                  for name, values in step_seconds.items()},
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "peak_rss_growth_mb": round(_peak_rss_mb() - rss_before, 1),
+    }
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the ArXiv audit pipeline offline (fixture PDF, stub LLM).")
+    parser.add_argument("--papers", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4, help="Workflows running at once")
+    parser.add_argument("--extraction-concurrency", type=int, default=4, help="Concurrent LLM requests per run")
+    parser.add_argument("--fixture-pdf", default=DEFAULT_FIXTURE_PDF)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Stub LLM latency per request (seconds)")
+    parser.add_argument("--llm-jitter", type=float, default=0.0, help="Uniform +/- jitter on the stub latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of stub LLM requests that fail")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dag", action="store_true", help="Schedule steps as a DAG within each run")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this JSON file")
+    parser.add_argument("--min-papers-per-minute", type=float,
+                        help="Exit with status 1 when throughput falls below this (regression gate)")
+    args = parser.parse_args(argv)
+    # Per-run INFO logs would dominate the output
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = run_benchmark(
+        papers=args.papers, concurrency=args.concurrency, fixture_pdf=args.fixture_pdf,
+        stub_options={"latency_seconds": args.llm_latency, "latency_jitter": args.llm_jitter,
+                      "failure_rate": args.failure_rate, "seed": args.seed},
+        extraction_concurrency=args.extraction_concurrency, use_dag=args.dag,
+    )
+    print(f"{results['papers']} papers in {results['elapsed_seconds']:.1f}s: {results['papers_per_minute']:.1f} papers/min "
+          f"({results['completed']} completed, {results['failed']} failed, {results['claims']} claims)")
+    print(f"{results['llm_requests']} stub LLM requests, {results['llm_failures']} injected failures")
+    print(f"run latency p50 {results['run_p50_seconds']:.3f}s, p99 {results['run_p99_seconds']:.3f}s; "
+          f"peak RSS {results['peak_rss_mb']:.1f} MiB (+{results['peak_rss_growth_mb']:.1f} MiB during the run)")
+    print(f"{'step':<28}{'p50 (s)':>10}{'p99 (s)':>10}")
+    for name, latency in results["steps"].items():
+        print(f"{name:<28}{latency['p50_seconds']:>10.3f}{latency['p99_seconds']:>10.3f}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.min_papers_per_minute is not None and results["papers_per_minute"] < args.min_papers_per_minute:
+        print(f"Throughput below the required {args.min_papers_per_minute} papers/min")
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
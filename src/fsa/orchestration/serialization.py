@@ -0,0 +1,105 @@
+# src/fsa/orchestration/serialization.py
+from typing import Any, Tuple
+from pydantic import BaseModel
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional dependency: only needed for format="orjson"
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency: only needed for format="msgpack"
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency: only needed for compression="zstd"
+    zstandard = None
+
+# Snapshot encodings for WorkflowState checkpoints:
+#   - "json":         pretty-printed JSON (the original format; readable, largest)
+#   - "json-compact": JSON without whitespace
+#   - "orjson":       JSON produced by orjson
+#   - "msgpack":      MessagePack of the JSON-mode dump
+# Uncompressed JSON variants are written as-is, so older checkpoints and external tools keep
+# working. msgpack and any compressed snapshot start with a header
+# (MAGIC + format byte + compression byte), which decode_snapshot uses to detect the format.
+CHECKPOINT_FORMATS = ("json", "json-compact", "orjson", "msgpack")
+CHECKPOINT_COMPRESSIONS = (None, "zstd")
+MAGIC = b"\x00FSA"
+_FORMAT_IDS = {"json": 0, "json-compact": 0, "orjson": 0, "msgpack": 1}
+_COMPRESSION_IDS = {None: 0, "zstd": 1}
+# File extensions of encoded snapshots (see snapshot_extension)
+SNAPSHOT_EXTENSIONS = (".json", ".json.zst", ".msgpack", ".msgpack.zst")
+
+def validate_format(format: str, compression: Any = None):
+    """Raises ValueError for unknown options and RuntimeError when the needed package is missing."""
+    if format not in CHECKPOINT_FORMATS:
+        raise ValueError(f"Unknown checkpoint format '{format}'. Expected one of {CHECKPOINT_FORMATS}.")
+    if compression not in CHECKPOINT_COMPRESSIONS:
+        raise ValueError(f"Unknown checkpoint compression '{compression}'. Expected one of {CHECKPOINT_COMPRESSIONS}.")
+    if format == "orjson" and orjson is None:
+        raise RuntimeError("The 'orjson' checkpoint format requires the 'orjson' package.")
+    if format == "msgpack" and msgpack is None:
+        raise RuntimeError("The 'msgpack' checkpoint format requires the 'msgpack' package.")
+    if compression == "zstd" and zstandard is None:
+        raise RuntimeError("zstd checkpoint compression requires the 'zstandard' package.")
+
+def encode_snapshot(model: BaseModel, format: str = "json", compression: Any = None, level: int = 3) -> bytes:
+    validate_format(format, compression)
+    if format == "json":
+        body = model.model_dump_json(indent=2).encode()
+    elif format == "json-compact":
+        body = model.model_dump_json().encode()
+    elif format == "orjson":
+        body = orjson.dumps(model.model_dump(mode="json"))
+    else:
+        body = msgpack.packb(model.model_dump(mode="json"), use_bin_type=True)
+
+    if _FORMAT_IDS[format] == 0 and compression is None:
+        return body
+    if compression == "zstd":
+        body = zstandard.ZstdCompressor(level=level).compress(body)
+    return MAGIC + bytes([_FORMAT_IDS[format], _COMPRESSION_IDS[compression]]) + body
+
+def snapshot_extension(data: bytes) -> str:
+    """File extension for an encoded snapshot: ".json", ".msgpack", plus ".zst" when compressed."""
+    if not data.startswith(MAGIC):
+        return ".json"
+    format_id, compression_id = data[len(MAGIC)], data[len(MAGIC) + 1]
+    extension = ".msgpack" if format_id == _FORMAT_IDS["msgpack"] else ".json"
+    return extension + (".zst" if compression_id == _COMPRESSION_IDS["zstd"] else "")
+
+def decode_snapshot(data: bytes) -> Tuple[str, Any]:
+    """
+    Detects the snapshot encoding. Returns ("json", json_bytes) for JSON variants, so callers
+    can validate them directly with model_validate_json, or ("object", decoded_data) otherwise.
+    """
+    if not data.startswith(MAGIC):
+        return "json", data
+
+    format_id, compression_id = data[len(MAGIC)], data[len(MAGIC) + 1]
+    body = data[len(MAGIC) + 2:]
+    if compression_id == _COMPRESSION_IDS["zstd"]:
+        if zstandard is None:
+            raise RuntimeError("Reading a zstd-compressed checkpoint requires the 'zstandard' package.")
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif compression_id != 0:
+        raise ValueError(f"Unknown checkpoint compression id {compression_id}")
+
+    if format_id == 0:
+        return "json", body
+    if format_id == _FORMAT_IDS["msgpack"]:
+        if msgpack is None:
+            raise RuntimeError("Reading a msgpack checkpoint requires the 'msgpack' package.")
+        return "object", msgpack.unpackb(body, raw=False)
+    raise ValueError(f"Unknown checkpoint format id {format_id}")
+
+def decode_snapshot_data(data: bytes) -> Any:
+    """Decodes a snapshot of any format to plain Python data (e.g. for journal replay)."""
+    kind, payload = decode_snapshot(data)
+    if kind == "json":
+        return orjson.loads(payload) if orjson is not None else json.loads(payload)
+    return payload
@@ -1,10 +1,15 @@
 # src/fsa/orchestration/state.py
-from pydantic import BaseModel, Field, UUID4
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, Field, PrivateAttr, UUID4
+from pydantic_core import to_json, to_jsonable_python
+from typing import List, Dict, Any, Optional, Callable, ClassVar, Set, Tuple, Union
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
 from enum import Enum
 from fsa.core.models import Document, ParsedSection, ExtractedClaim
+from fsa.orchestration.checkpoint_store import CheckpointStore, FileCheckpointStore
+from fsa.orchestration.serialization import encode_snapshot, decode_snapshot, decode_snapshot_data
+from fsa.core.artifact_store import ArtifactStore
 import logging
 import json
 import os
@@ -12,6 +17,10 @@ import hashlib
 
 logger = logging.getLogger(__name__)
 
+# Refs of the form "sha256:<digest>" point into the shared ArtifactStore; older checkpoints may
+# still hold per-run "raw_<hash16>.bin" refs, which are resolved under <artifact_dir>/<run_id>.
+ARTIFACT_REF_PREFIX = "sha256:"
+
 class StepStatus(str, Enum):
     PENDING = "PENDING"
     RUNNING = "RUNNING"
@@ -41,15 +50,66 @@ class WorkflowState(BaseModel):
     raw_artifact_ref: Optional[str] = None
     sections: List[ParsedSection] = Field(default_factory=list)
     claims: List[ExtractedClaim] = Field(default_factory=list)
+    # Intra-step progress of claim extraction: section_id -> claims, for every section already processed
+    extraction_progress: Dict[str, List[ExtractedClaim]] = Field(default_factory=dict)
+
+    # Run metrics by name: "steps" and "workflow" (timings, retries, checkpoint writes; recorded by the
+    # engine), "extraction_tokens" (LLM token usage incl. provider-cached prompt tokens)
+    metrics: Dict[str, Any] = Field(default_factory=dict)
 
     # History and Status
     execution_history: List[ExecutionLog] = Field(default_factory=list)
     current_step: Optional[str] = None
     status: StepStatus = StepStatus.PENDING
 
+    # Installed by the OrchestrationEngine so steps can persist intra-step progress (not serialized)
+    _progress_hook: Optional[Callable[['WorkflowState'], None]] = PrivateAttr(default=None)
+    # Journal bookkeeping: what the last checkpoint already persisted (see checkpoint(journal=True)).
+    # Dict fields are tracked per key (digest of each value); other fields are journaled when assigned.
+    _journal_key_digests: Optional[Dict[str, Dict[str, str]]] = PrivateAttr(default=None)
+    _dirty_fields: Set[str] = PrivateAttr(default_factory=set)
+    _journal_history_len: int = PrivateAttr(default=0)
+    _journal_records: int = PrivateAttr(default=0)
+    _journal_bytes: int = PrivateAttr(default=0)
+    _journal_snapshot_bytes: int = PrivateAttr(default=0)
+
+    # Fields journaled as per-key deltas
+    JOURNAL_DICT_FIELDS: ClassVar[Tuple[str, ...]] = ("context", "extraction_progress", "metrics")
+    # The journal is compacted once it outgrows the snapshot (or this many bytes, if larger)
+    JOURNAL_MIN_COMPACT_BYTES: ClassVar[int] = 64 * 1024
+
+    def __setattr__(self, name: str, value: Any):
+        if name in type(self).model_fields:
+            self._dirty_fields.add(name)
+        super().__setattr__(name, value)
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        # The hook closes over the engine; drop it so the state stays picklable (process-mode steps)
+        state = super().__getstate__()
+        private = state.get('__pydantic_private__')
+        if private and private.get('_progress_hook') is not None:
+            state['__pydantic_private__'] = {**private, '_progress_hook': None}
+        return state
+
     def add_log(self, step_name: str, status: StepStatus, attempt: int, message: Optional[str] = None):
         self.execution_history.append(ExecutionLog(step_name=step_name, status=status, attempt=attempt, message=message))
 
+    def step_durations(self) -> Dict[str, float]:
+        """Seconds from each step's first RUNNING log to its COMPLETED log (retries included)."""
+        started: Dict[str, datetime] = {}
+        durations: Dict[str, float] = {}
+        for log in self.execution_history:
+            if log.status == StepStatus.RUNNING:
+                started.setdefault(log.step_name, log.timestamp)
+            elif log.status == StepStatus.COMPLETED and log.step_name in started:
+                durations[log.step_name] = (log.timestamp - started[log.step_name]).total_seconds()
+        return durations
+
+    def checkpoint_progress(self):
+        """Persists intra-step progress. A no-op when the state is not run by an engine."""
+        if self._progress_hook:
+            self._progress_hook(self)
+
     # --- Artifact Management ---
 
     def _get_artifact_path(self, artifact_dir: str, ref: str) -> str:
@@ -58,60 +118,218 @@ class WorkflowState(BaseModel):
         os.makedirs(run_dir, exist_ok=True)
         return os.path.join(run_dir, ref)
 
-    def save_raw_artifact(self, content: bytes, artifact_dir: str = "./artifacts"):
-        """Saves large binary artifacts separately and stores a reference."""
-        # Use a hash as the reference name
-        ref = f"raw_{hashlib.sha256(content).hexdigest()[:16]}.bin"
-        path = self._get_artifact_path(artifact_dir, ref)
+    def save_raw_artifact(self, content: bytes, artifact_dir: str = "./artifacts", store: Optional[ArtifactStore] = None):
+        """Saves large binary artifacts in the content-addressed store and stores a reference."""
+        store = store or ArtifactStore.for_root(artifact_dir)
+        # Deduplicated across runs: identical content is written once
+        self.attach_raw_artifact(store.put(content), store=store)
 
-        # Idempotent write
-        if not os.path.exists(path):
-            with open(path, 'wb') as f:
-                f.write(content)
+    def attach_raw_artifact(self, digest: str, artifact_dir: str = "./artifacts", store: Optional[ArtifactStore] = None):
+        """References a blob already in the store (e.g. streamed there by the fetcher)."""
+        store = store or ArtifactStore.for_root(artifact_dir)
+        store.add_ref(digest, str(self.run_id))
 
+        ref = f"{ARTIFACT_REF_PREFIX}{digest}"
         self.raw_artifact_ref = ref
         logger.info(f"Saved raw artifact with ref {ref}")
 
-    def load_raw_artifact(self, artifact_dir: str = "./artifacts") -> bytes:
+    def load_raw_artifact(self, artifact_dir: str = "./artifacts", store: Optional[ArtifactStore] = None) -> bytes:
         """Loads the large binary artifact using the stored reference."""
+        return bytes(self._read_raw_artifact(artifact_dir, store, view=False))
+
+    def open_raw_artifact(self, artifact_dir: str = "./artifacts", store: Optional[ArtifactStore] = None) -> Union[memoryview, bytes]:
+        """
+        Like load_raw_artifact, but returns a read-only memory-mapped view when the blob is stored
+        uncompressed, avoiding a full in-memory copy (fitz.open("pdf", view) accepts it directly).
+        """
+        return self._read_raw_artifact(artifact_dir, store, view=True)
+
+    def _read_raw_artifact(self, artifact_dir: str, store: Optional[ArtifactStore], view: bool) -> Union[memoryview, bytes]:
         if not self.raw_artifact_ref:
             raise FileNotFoundError("No raw artifact reference found in state.")
 
-        path = self._get_artifact_path(artifact_dir, self.raw_artifact_ref)
         try:
+            if self.raw_artifact_ref.startswith(ARTIFACT_REF_PREFIX):
+                store = store or ArtifactStore.for_root(artifact_dir)
+                digest = self.raw_artifact_ref[len(ARTIFACT_REF_PREFIX):]
+                return store.open_view(digest) if view else store.get(digest)
+
+            # Legacy per-run artifact
+            path = self._get_artifact_path(artifact_dir, self.raw_artifact_ref)
             with open(path, 'rb') as f:
                 return f.read()
         except Exception as e:
             logger.error(f"Failed to load raw artifact {self.raw_artifact_ref}: {e}")
             raise
 
+    def offload_sections(self, store: ArtifactStore):
+        """
+        Moves section text into the content-addressed store, so checkpoints (and this state)
+        only hold section metadata and hashes. The text is read back on access.
+        """
+        for section in self.sections:
+            store.add_ref(section.offload(store), str(self.run_id))
+        self._dirty_fields.add("sections")  # Changed in place
+
+    @contextmanager
+    def holding_section_content(self, sections: Optional[List[ParsedSection]] = None):
+        """
+        Reads offloaded section text once and keeps it in memory for the block (e.g. a step that
+        accesses `content` several times per section); it is released again afterwards.
+        """
+        held = [section for section in (self.sections if sections is None else sections) if section.hold()]
+        try:
+            yield
+        finally:
+            for section in held:
+                section.release()
+
+    def bind_artifact_store(self, store: ArtifactStore):
+        """Tells offloaded sections (e.g. of a loaded checkpoint) which store holds their text."""
+        for section in self.sections:
+            section.bind_store(store)
+
     # --- Checkpointing Methods (Report Section 8.1) ---
 
-    def checkpoint(self, checkpoint_dir: str = "./checkpoints"):
-        """Saves the current state (excluding large artifacts) to a checkpoint file."""
-        os.makedirs(checkpoint_dir, exist_ok=True)
-        checkpoint_path = os.path.join(checkpoint_dir, f"{self.run_id}.json")
+    def checkpoint(self, checkpoint_dir: str = "./checkpoints", journal: bool = False, compact_every: int = 50,
+                   store: Optional[CheckpointStore] = None, format: str = "json", compression: Optional[str] = None):
+        """
+        Saves the current state (excluding large artifacts) to a checkpoint.
+        With `journal`, only the delta since the previous checkpoint (new ExecutionLog entries,
+        added/changed/removed keys of the dict fields and reassigned fields) is appended to the
+        run's journal. Mutate list and model fields by assigning them, in-place changes are not
+        journaled. The journal is compacted into a fresh snapshot every `compact_every` records
+        and once it outgrows the snapshot.
+        `store` defaults to the file store for `checkpoint_dir`. `format` and `compression` select
+        the snapshot encoding (see fsa.orchestration.serialization); load_checkpoint detects it.
+        """
+        store = store or FileCheckpointStore.for_directory(checkpoint_dir)
 
         try:
-            with open(checkpoint_path, 'w') as f:
+            if journal:
+                self._append_journal(store, compact_every, format, compression)
+            else:
                 # Pydantic V2 serialization
-                f.write(self.model_dump_json(indent=2))
+                store.write_snapshot(str(self.run_id), encode_snapshot(self, format, compression))
             logger.info(f"Checkpoint saved successfully for run {self.run_id}")
         except Exception as e:
             logger.error(f"Failed to save checkpoint for run {self.run_id}: {e}")
 
+    def _key_digests(self) -> Dict[str, Dict[str, str]]:
+        """Hashes each value of the dict fields to detect which keys changed."""
+        return {name: {key: hashlib.sha256(to_json(value)).hexdigest() for key, value in getattr(self, name).items()}
+                for name in self.JOURNAL_DICT_FIELDS}
+
+    def _write_journal_snapshot(self, store: CheckpointStore, format: str = "json", compression: Optional[str] = None):
+        """Compaction: writes a full snapshot and starts a new journal bound to it."""
+        # Journal snapshots are rewritten often; never pretty-print them
+        snapshot = encode_snapshot(self, "json-compact" if format == "json" else format, compression)
+        store.write_snapshot(str(self.run_id), snapshot)
+        # The header ties the journal to this snapshot; a journal left over from an older
+        # snapshot (e.g. crash between the two writes) is ignored on load.
+        header = {"snapshot": hashlib.sha256(snapshot).hexdigest()}
+        store.reset_journal(str(self.run_id), json.dumps(header).encode())
+
+        self._journal_key_digests = self._key_digests()
+        self._dirty_fields.clear()
+        self._journal_history_len = len(self.execution_history)
+        self._journal_records = 0
+        self._journal_bytes = 0
+        self._journal_snapshot_bytes = len(snapshot)
+
+    def _append_journal(self, store: CheckpointStore, compact_every: int, format: str = "json", compression: Optional[str] = None):
+        if (self._journal_key_digests is None or self._journal_records >= compact_every
+                or self._journal_bytes > max(self._journal_snapshot_bytes, self.JOURNAL_MIN_COMPACT_BYTES)
+                or len(self.execution_history) < self._journal_history_len):
+            self._write_journal_snapshot(store, format, compression)
+            return
+
+        # Reassigned dict fields are diffed per key too
+        changed = self._dirty_fields - set(self.JOURNAL_DICT_FIELDS) - {"execution_history"}
+        digests = self._key_digests()
+        merge: Dict[str, Dict[str, Any]] = {}
+        unset: Dict[str, List[str]] = {}
+        for name, key_digests in digests.items():
+            previous = self._journal_key_digests[name]
+            keys = [key for key, digest in key_digests.items() if previous.get(key) != digest]
+            if keys:
+                values = getattr(self, name)
+                merge[name] = {key: values[key] for key in keys}
+            removed = [key for key in previous if key not in key_digests]
+            if removed:
+                unset[name] = removed
+        new_logs = self.execution_history[self._journal_history_len:]
+        if not changed and not merge and not unset and not new_logs:
+            return
+
+        record = {
+            "set": self.model_dump(mode="json", include=changed),
+            "merge": to_jsonable_python(merge),
+            "unset": unset,
+            "history": [log.model_dump(mode="json") for log in new_logs],
+        }
+        line = json.dumps(record).encode()
+        store.append_journal(str(self.run_id), line)
+
+        self._journal_key_digests = digests
+        self._dirty_fields.clear()
+        self._journal_history_len = len(self.execution_history)
+        self._journal_records += 1
+        self._journal_bytes += len(line) + 1
+
+    @classmethod
+    def _replay_journal(cls, data: Dict[str, Any], snapshot: bytes, records: List[bytes]) -> Dict[str, Any]:
+        """Applies journal records written after `snapshot` onto its decoded data."""
+        if not records:
+            return data
+
+        header = json.loads(records[0])
+        if header.get("snapshot") != hashlib.sha256(snapshot).hexdigest():
+            logger.warning("Ignoring checkpoint journal: it does not belong to the current snapshot.")
+            return data
+
+        for i, line in enumerate(records[1:], start=1):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Only a torn final record (crash mid-append) is expected here
+                logger.warning(f"Stopping journal replay at unreadable record {i}.")
+                break
+            data.update(record["set"])
+            for name, values in record.get("merge", {}).items():
+                data[name] = {**data.get(name, {}), **values}
+            for name, keys in record.get("unset", {}).items():
+                data[name] = {key: value for key, value in data.get(name, {}).items() if key not in keys}
+            data["execution_history"] = data.get("execution_history", []) + record["history"]
+        return data
+
     @classmethod
-    def load_checkpoint(cls, run_id: UUID4, checkpoint_dir: str = "./checkpoints") -> 'WorkflowState':
-        """Loads a workflow state from a checkpoint file."""
-        checkpoint_path = os.path.join(checkpoint_dir, f"{run_id}.json")
-        if not os.path.exists(checkpoint_path):
+    def load_checkpoint(cls, run_id: UUID4, checkpoint_dir: str = "./checkpoints",
+                        store: Optional[CheckpointStore] = None,
+                        artifact_store: Optional[ArtifactStore] = None) -> 'WorkflowState':
+        """
+        Loads a workflow state from a checkpoint, replaying its journal if one exists.
+        Offloaded section text is read from `artifact_store`; without one it can only be read
+        once a store is bound (bind_artifact_store, or by the engine when the run resumes).
+        """
+        store = store or FileCheckpointStore.for_directory(checkpoint_dir)
+        snapshot = store.read_snapshot(str(run_id))
+        if snapshot is None:
             raise FileNotFoundError(f"Checkpoint file not found for run {run_id}")
 
         try:
-            with open(checkpoint_path, 'r') as f:
-                data = json.load(f)
+            records = store.read_journal(str(run_id))
+            if len(records) > 1:
+                data = decode_snapshot_data(snapshot)
+                data = cls._replay_journal(data, snapshot, records)
                 # Pydantic V2 validation and deserialization
                 state = cls.model_validate(data)
+            else:
+                # No deltas: validate straight from the encoded snapshot (JSON is parsed by pydantic-core)
+                kind, payload = decode_snapshot(snapshot)
+                state = cls.model_validate_json(payload) if kind == "json" else cls.model_validate(payload)
+            if artifact_store is not None:
+                state.bind_artifact_store(artifact_store)
             logger.info(f"Checkpoint loaded successfully for run {run_id}")
             return state
         except Exception as e:
@@ -12,6 +12,8 @@ from fsa.agents.extractor_agent import ExtractorAgent, ExtractClaimsStep
 # Setup structured logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
 
+ARXIV_AUDIT_WORKFLOW_NAME = "ArXiv_Forensic_Audit_V1"
+
 def define_arxiv_audit_workflow_v1(env_config: Dict[str, Any]) -> List[WorkflowStep]:
     """Defines the composition of the ArXiv Forensic Audit Workflow V1."""
 
@@ -31,10 +33,13 @@ def define_arxiv_audit_workflow_v1(env_config: Dict[str, Any]) -> List[WorkflowS
     ]
     return steps
 
-def run_arxiv_audit(arxiv_id: str, env_config: Dict[str, Any]):
-    """Helper function to initialize and run the ArXiv audit workflow."""
+def run_arxiv_audit(arxiv_id: str, env_config: Dict[str, Any], use_dag: bool = False):
+    """
+    Helper function to initialize and run the ArXiv audit workflow.
+    With `use_dag`, steps are scheduled by their declared inputs/outputs instead of list order.
+    """
 
-    workflow_name = "ArXiv_Forensic_Audit_V1"
+    workflow_name = ARXIV_AUDIT_WORKFLOW_NAME
 
     # 1. Define the workflow
     steps = define_arxiv_audit_workflow_v1(env_config)
@@ -44,11 +49,14 @@ def run_arxiv_audit(arxiv_id: str, env_config: Dict[str, Any]):
     state = WorkflowState(workflow_name=workflow_name, context=initial_context)
 
     # 3. Initialize the engine
-    engine = OrchestrationEngine()
+    engine = OrchestrationEngine(max_workers=env_config.get("max_parallel_steps", 4))
 
     # 4. Run the workflow
     print(f"Starting workflow {workflow_name} (Run ID: {state.run_id})...")
-    final_state = engine.run_workflow(steps, state)
+    if use_dag:
+        final_state = engine.run_dag_workflow(steps, state)
+    else:
+        final_state = engine.run_workflow(steps, state)
 
     return final_state
 
@@ -0,0 +1,49 @@
+import requests
+
+from agents.jules import jules
+
+
+def test_watch_submissions_backs_off_on_every_reconnect(monkeypatch):
+    # What each connection does: close normally, fail, or deliver one event and then close
+    script = iter(["close", "fail", "close", "event", "close", "event"])
+    cursors = []
+
+    def stream_events(action=None, cursor=None):
+        cursors.append(cursor)
+        step = next(script)
+        if step == "fail":
+            raise requests.ConnectionError("down")
+        if step == "event":
+            yield f"c{len(cursors)}", {"payload": {"text": "claim"}}
+
+    monkeypatch.setattr(jules, "stream_events", stream_events)
+    monkeypatch.setattr(jules.random, "uniform", lambda low, high: high)
+    sleeps = []
+    watcher = jules.watch_submissions(sleep=sleeps.append)
+
+    assert next(watcher)["canonical_text"] == "claim"
+    # Closed and failed streams both wait, doubling the delay
+    assert sleeps == [1.0, 2.0, 4.0]
+
+    next(watcher)
+    # The delay resets once an event arrived, and the stream resumes from its cursor
+    assert sleeps == [1.0, 2.0, 4.0, 1.0, 2.0]
+    assert cursors == [None, None, None, None, "c4", "c4"]
+
+
+def test_watch_mode_handles_the_latest_submission_before_streaming(monkeypatch):
+    processed, started_from = [], []
+
+    def watch_submissions(cursor=None):
+        started_from.append(cursor)
+        yield {"claim_id": "live"}
+
+    monkeypatch.setattr(jules, "execute_plan_tasks", lambda: None)
+    monkeypatch.setattr(jules, "latest_submission", lambda: ({"claim_id": "earlier"}, "cursor-1"))
+    monkeypatch.setattr(jules, "watch_submissions", watch_submissions)
+    monkeypatch.setattr(jules, "process_claim", lambda claim: processed.append(claim["claim_id"]))
+
+    jules.main(watch=True)
+
+    assert processed == ["earlier", "live"]
+    assert started_from == ["cursor-1"]
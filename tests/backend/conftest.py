@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The backend and the jules agent are deployed as flat module directories (see their
+# Dockerfiles); make both importable.
+ROOT = Path(__file__).resolve().parents[2]
+for module_dir in (ROOT / "backend", ROOT / "agents" / "jules"):
+    if str(module_dir) not in sys.path:
+        sys.path.insert(0, str(module_dir))
+
+
+@pytest.fixture
+def backend_app(tmp_path, monkeypatch):
+    """The FastAPI app backed by a fresh database in tmp_path."""
+    import main
+    monkeypatch.setattr(main, "DB", str(tmp_path / "provenance.db"))
+    monkeypatch.setattr(main, "store", None)
+    monkeypatch.setattr(main, "chain", None)
+    return main
+
+
+@pytest.fixture
+def client(backend_app):
+    from fastapi.testclient import TestClient
+    with TestClient(backend_app.app) as test_client:
+        yield test_client
@@ -0,0 +1,42 @@
+import pytest
+
+
+@pytest.fixture
+def seeded(client, backend_app):
+    rows = [(f"e{i:03d}", f"agent:{i % 3}", "submission" if i % 5 == 0 else "update", "{}", "sig", 1000.0 + i // 2)
+            for i in range(50)]
+    backend_app.store.insert_many(rows)
+    return rows
+
+
+def test_cursor_pagination_visits_every_event_once(client, seeded):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 7, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/events", params=params)
+        seen += [e["event_id"] for e in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert sorted(seen) == sorted(r[0] for r in seeded)
+    assert len(seen) == len(set(seen))
+
+
+def test_filters(client, seeded):
+    events = client.get("/events", params={"actor": "agent:1", "action": "update", "since": 1005, "until": 1015}).json()
+    expected = {r[0] for r in seeded if r[1] == "agent:1" and r[2] == "update" and 1005 <= r[5] < 1015}
+    assert {e["event_id"] for e in events} == expected
+    assert [e["ts"] for e in events] == sorted((e["ts"] for e in events), reverse=True)
+
+
+def test_latest(client, seeded):
+    latest = client.get("/events/latest", params={"action": "submission"}).json()
+    assert latest["event_id"] == "e045"
+    assert client.get("/events/latest", params={"action": "missing"}).status_code == 404
+
+
+def test_filtered_queries_use_indexes(backend_app, seeded):
+    plan = backend_app.store.query("EXPLAIN QUERY PLAN SELECT rowid FROM events WHERE action = ? ORDER BY ts DESC, rowid DESC LIMIT 1", ("submission",))
+    detail = " ".join(str(row[-1]) for row in plan)
+    assert "idx_events_action_ts" in detail and "TEMP B-TREE" not in detail
@@ -0,0 +1,50 @@
+import hashlib
+import hmac
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from event_store import EventStore
+
+
+def row(event_id, ts=1.0):
+    return (event_id, "agent:test", "intent", "{}", "sig", ts)
+
+
+@pytest.mark.parametrize("group_commit", [False, True])
+def test_concurrent_inserts_are_all_committed(tmp_path, group_commit):
+    store = EventStore(str(tmp_path / "events.db"), pool_size=4, group_commit=group_commit)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(lambda i: store.insert(row(f"e{i}")), range(400)))
+
+    assert store.query("SELECT COUNT(*) FROM events") == [(400,)]
+    assert store.query("PRAGMA journal_mode") == [("wal",)]
+    store.close()
+
+
+def test_group_commit_isolates_failing_requests(tmp_path):
+    store = EventStore(str(tmp_path / "events.db"), group_commit=True)
+    store.insert(row("dup"))
+
+    futures = [store.submit([row("ok-1")]), store.submit([row("dup")]), store.submit([row("ok-2")])]
+
+    assert futures[0].result() == 1 and futures[2].result() == 1
+    with pytest.raises(sqlite3.IntegrityError):
+        futures[1].result()
+    assert store.query("SELECT COUNT(*) FROM events") == [(3,)]
+    store.close()
+
+
+def test_posted_events_are_signed_and_listed(client, backend_app):
+    response = client.post("/events", json={"actor": "a", "action": "intent", "payload": {"x": 1}})
+    assert response.status_code == 200
+    client.post("/submit", json={"text": "Claim."})
+
+    events = client.get("/events").json()
+    assert [e["action"] for e in events] == ["submission", "intent"]
+    intent = events[1]
+    message = json.dumps(intent["payload"], sort_keys=True) + intent["actor"] + intent["action"] + str(intent["ts"])
+    expected = hmac.new(backend_app.SECRET.encode(), message.encode(), hashlib.sha256).hexdigest()
+    assert intent["signature"] == expected == response.json()["signature"]
@@ -0,0 +1,113 @@
+import asyncio
+import base64
+import json
+
+from event_broker import EventBroker
+
+
+class ConnectedRequest:
+    async def is_disconnected(self):
+        return False
+
+
+def parse(message):
+    fields = dict(line.split(": ", 1) for line in message.strip().splitlines())
+    return fields.get("id"), json.loads(fields["data"])
+
+
+def test_stream_replays_from_cursor_then_pushes_live_events(client, backend_app, monkeypatch):
+    monkeypatch.setattr(backend_app, "STREAM_HEARTBEAT_SECONDS", 0.05)
+    backend_app.store.insert_many([
+        ("a", "agent:x", "submission", "{}", "sig", 1.0),
+        ("b", "agent:x", "update", "{}", "sig", 2.0),
+        ("c", "agent:y", "submission", "{}", "sig", 3.0),
+        ("d", "agent:y", "submission", "{}", "sig", 4.0),
+    ])
+    cursor = backend_app.encode_stream_cursor(backend_app.store.rowid_of("a"))
+
+    async def scenario():
+        stream = backend_app.event_stream(ConnectedRequest(), None, "submission", backend_app.decode_stream_cursor(cursor))
+        replayed = [parse(await stream.__anext__())[1]["event_id"] for _ in range(2)]
+
+        row = backend_app.make_event("agent:z", "submission", {"text": "live"})
+        await backend_app.write_events([row, backend_app.make_event("agent:z", "update", {})])
+        while True:
+            message = await stream.__anext__()
+            if not message.startswith(":"):  # Skip keepalives
+                break
+        await stream.aclose()
+        return replayed, parse(message)
+
+    replayed, (live_id, live) = asyncio.run(scenario())
+    assert replayed == ["c", "d"]
+    assert live["payload"] == {"text": "live"}
+    assert backend_app.decode_stream_cursor(live_id) == backend_app.store.rowid_of(live["event_id"])
+    assert backend_app.broker.subscriber_count() == 0
+
+
+def test_stream_follows_commit_order_not_timestamps(client, backend_app, monkeypatch):
+    monkeypatch.setattr(backend_app, "STREAM_HEARTBEAT_SECONDS", 0.05)
+    # "late" got its timestamp first but committed second
+    early, late = backend_app.make_event("agent:x", "submission", {}), backend_app.make_event("agent:x", "submission", {})
+    late = (late[0], late[1], late[2], late[3], late[4], early[5] - 10)
+
+    async def first_message(after):
+        stream = backend_app.event_stream(ConnectedRequest(), None, "submission", after)
+        message = await stream.__anext__()
+        await stream.aclose()
+        return parse(message)
+
+    async def scenario():
+        stream = backend_app.event_stream(ConnectedRequest(), None, "submission", None)
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.01)
+        await backend_app.write_events([early])
+        first_id, _ = parse(await first)
+        await stream.aclose()
+        await backend_app.write_events([late])
+        # Reconnecting from the first event still delivers the later commit with the lower ts
+        return await first_message(backend_app.decode_stream_cursor(first_id))
+
+    _, event = asyncio.run(scenario())
+    assert event["event_id"] == late[0]
+
+
+def test_legacy_stream_cursor_resolves_to_its_event(client, backend_app):
+    backend_app.store.insert_many([("a", "agent:x", "submission", "{}", "sig", 1.0),
+                                   ("b", "agent:x", "submission", "{}", "sig", 2.0)])
+    legacy = base64.urlsafe_b64encode(json.dumps([1.0, "a"]).encode()).decode()
+    assert backend_app.decode_stream_cursor(legacy) == "a"
+    assert client.get("/events/stream", params={"cursor": base64.urlsafe_b64encode(b'[5.0, "zz"]').decode()}).status_code == 400
+
+
+def test_slow_subscriber_is_cut_off():
+    async def scenario():
+        broker = EventBroker(max_queue=2)
+        slow = broker.subscribe()
+        filtered = broker.subscribe(action="submission")
+        broker.publish({"event_id": str(i), "actor": "a", "action": "update"} for i in range(5))
+        await asyncio.sleep(0)
+        return [slow.queue.get_nowait() for _ in range(slow.queue.qsize())], filtered.queue.qsize()
+
+    drained, filtered_size = asyncio.run(scenario())
+    assert drained == [None]
+    assert filtered_size == 0
+
+
+def test_latest_event_cursor_continues_the_stream(client, backend_app):
+    response = client.get("/events/latest", params={"action": "submission"})
+    assert response.status_code == 404
+    cursor = response.headers["X-Stream-Cursor"]
+    # Posted after the lookup but before the stream connects
+    client.post("/submit", json={"text": "early"})
+
+    async def first_event():
+        stream = backend_app.event_stream(ConnectedRequest(), None, "submission", backend_app.decode_stream_cursor(cursor))
+        message = await stream.__anext__()
+        await stream.aclose()
+        return parse(message)
+
+    event_id, event = asyncio.run(first_event())
+    assert event["payload"] == {"text": "early"}
+    latest = client.get("/events/latest", params={"action": "submission"})
+    assert latest.headers["X-Stream-Cursor"] == event_id
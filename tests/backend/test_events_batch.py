@@ -0,0 +1,46 @@
+import json
+
+from event_emitter import BufferedEventEmitter
+
+
+def events(n):
+    return [{"actor": "agent:test", "action": "update", "payload": {"i": i}} for i in range(n)]
+
+
+def test_batch_returns_results_in_order(client, backend_app):
+    response = client.post("/events/batch", json=events(5))
+    assert response.status_code == 200
+    results = response.json()
+
+    stored = {e["event_id"]: e for e in client.get("/events").json()}
+    assert [stored[r["event_id"]]["payload"]["i"] for r in results] == list(range(5))
+    for r in results:
+        event = stored[r["event_id"]]
+        message = json.dumps(event["payload"], sort_keys=True) + event["actor"] + event["action"] + str(event["ts"])
+        assert r["signature"] == event["signature"] == backend_app.sign_event(message)
+
+
+def test_ndjson_body(client):
+    body = "\n".join(json.dumps(e) for e in events(3)) + "\n"
+    response = client.post("/events/batch", content=body, headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+
+def test_invalid_event_rejects_whole_batch(client):
+    batch = events(2) + [{"actor": "agent:test", "payload": {}}]
+    response = client.post("/events/batch", json=batch)
+    assert response.status_code == 422
+    assert response.json()["detail"]["index"] == 2
+    assert client.get("/events").json() == []
+
+
+def test_emitter_flushes_by_count_and_on_close(client):
+    emitter = BufferedEventEmitter("http://testserver", "agent:test", max_batch=3, flush_interval=None, session=client)
+    for i in range(4):
+        emitter.emit("update", {"i": i})
+    assert len(client.get("/events").json()) == 3
+
+    emitter.close()
+    assert len(emitter.results) == 4
+    assert len(client.get("/events").json()) == 4
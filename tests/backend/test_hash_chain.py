@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from hash_chain import HashChain
+from verify_log import segments_from_db, segments_from_export, verify_segments
+
+
+@pytest.fixture
+def chained(backend_app, monkeypatch):
+    monkeypatch.setattr(backend_app, "CHAIN_CHECKPOINT_EVERY", 4)
+    with TestClient(backend_app.app) as test_client:
+        events = [{"actor": "agent:test", "action": "update", "payload": {"i": i}} for i in range(10)]
+        assert test_client.post("/events/batch", json=events).status_code == 200
+        backend_app.chain.extend()
+        yield test_client, backend_app
+
+
+def tamper(backend_app, seq):
+    with backend_app.store.connection() as conn, conn:
+        conn.execute("UPDATE events SET payload = ? WHERE rowid = ?", ('{"i": -1}', seq))
+
+
+def test_verify_checks_from_latest_checkpoint(chained):
+    client, backend_app = chained
+    assert [c["seq"] for c in backend_app.chain.checkpoints()] == [4, 8]
+
+    result = client.get("/events/verify").json()
+    assert result["ok"] and result["from_seq"] == 8 and result["verified_events"] == 2
+
+    full = client.get("/events/verify", params={"full": "true"}).json()
+    assert full["ok"] and full["verified_events"] == 10
+
+
+def test_tampering_is_detected(chained):
+    client, backend_app = chained
+    tamper(backend_app, 9)
+    assert client.get("/events/verify").json()["seq"] == 9
+
+    # Changes before the latest checkpoint are caught by a ranged or full check
+    tamper(backend_app, 2)
+    assert client.get("/events/verify", params={"from_seq": 3}).json()["seq"] == 2
+    full = client.get("/events/verify", params={"full": "true"}).json()
+    assert full["ok"] is False and full["seq"] == 2
+
+
+def test_bulk_verifier_on_export_and_db(chained, tmp_path):
+    client, backend_app = chained
+    export = tmp_path / "events.ndjson"
+    export.write_text(client.get("/events/export").text)
+
+    assert verify_segments(segments_from_export(str(export)), backend_app.SECRET, workers=2)["ok"]
+    assert verify_segments(segments_from_db(backend_app.DB), backend_app.SECRET, workers=2)["segments"] == 3
+
+    lines = export.read_text().splitlines()
+    record = json.loads(lines[5])
+    record["actor"] = "agent:forged"
+    lines[5] = json.dumps(record)
+    export.write_text("\n".join(lines) + "\n")
+    result = verify_segments(segments_from_export(str(export)), backend_app.SECRET, workers=2)
+    assert not result["ok"] and result["first_failure"]["seq"] == record["seq"]
+
+
+def test_background_failures_are_logged(chained, monkeypatch, caplog):
+    _, backend_app = chained
+    chain = HashChain(backend_app.store, backend_app.SECRET)
+
+    def failing_extend():
+        chain._stopped.set()
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(chain, "extend", failing_extend)
+    with caplog.at_level("ERROR", logger="hash_chain"):
+        chain._run(interval=0)
+
+    assert "Hash chain extension failed" in caplog.text and "disk full" in caplog.text
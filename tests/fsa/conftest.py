@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The fsa package lives under src/ (see flake.nix); make it importable for the tests.
+SRC = Path(__file__).resolve().parents[2] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from fsa.orchestration.abstractions import Agent, Environment, ResiliencePolicy  # noqa: E402
+from fsa.orchestration.engine import OrchestrationEngine  # noqa: E402
+
+
+class DummyAgent(Agent):
+    name: str = "Dummy_Agent"
+    description: str = "Test agent"
+
+    def define_policy(self) -> str:
+        return "test"
+
+
+@pytest.fixture
+def make_agent():
+    """Builds DummyAgents that retry `max_retries` times without waiting; extra kwargs become their config."""
+    def make(max_retries=1, **config):
+        policy = ResiliencePolicy(max_retries=max_retries, retry_wait_min_seconds=0, retry_wait_max_seconds=0)
+        return DummyAgent(environment=Environment(config=config), resilience_policy=policy)
+    return make
+
+
+@pytest.fixture
+def make_engine(tmp_path, monkeypatch):
+    """Builds engines checkpointing under tmp_path with Langfuse disabled; all are shut down after the test."""
+    monkeypatch.setattr("fsa.orchestration.engine.get_langfuse_client", lambda: None)
+    engines = []
+
+    def make(**kwargs):
+        kwargs.setdefault("checkpoint_dir", str(tmp_path / "checkpoints"))
+        engines.append(OrchestrationEngine(**kwargs))
+        return engines[-1]
+    yield make
+    for engine in engines:
+        engine.shutdown()
@@ -0,0 +1,86 @@
+import os
+
+import fitz
+import pytest
+
+from fsa.core.artifact_store import ArtifactStore
+from fsa.orchestration.state import WorkflowState
+
+
+def blob_files(root):
+    return [name for _, _, files in os.walk(os.path.join(root, "blobs")) for name in files]
+
+
+@pytest.mark.parametrize("compression", [None, "zstd"])
+def test_identical_content_is_stored_once_across_runs(tmp_path, compression):
+    store = ArtifactStore(str(tmp_path), compression=compression)
+    runs = [WorkflowState(workflow_name="dedup") for _ in range(3)]
+    for state in runs:
+        state.save_raw_artifact(b"%PDF-1.7 same paper" * 100, store=store)
+
+    assert len({state.raw_artifact_ref for state in runs}) == 1
+    assert len(blob_files(tmp_path)) == 1
+    digest = runs[0].raw_artifact_ref.split(":", 1)[1]
+    assert store.refcount(digest) == 3
+    for state in runs:
+        assert state.load_raw_artifact(store=store) == b"%PDF-1.7 same paper" * 100
+        assert bytes(state.open_raw_artifact(store=store)) == b"%PDF-1.7 same paper" * 100
+
+
+def test_zstd_blobs_are_compressed(tmp_path):
+    store = ArtifactStore(str(tmp_path), compression="zstd")
+    digest = store.put(b"a" * 100_000)
+    assert store.path(digest).endswith(".zst")
+    assert os.path.getsize(store.path(digest)) < 1000
+
+
+def test_gc_removes_only_unreferenced_blobs(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    kept, dropped = store.put(b"kept"), store.put(b"dropped")
+    store.add_ref(kept, "run-a")
+    store.add_ref(dropped, "run-b")
+    store.release(dropped, "run-b")
+
+    assert store.gc(min_age_seconds=3600) == 0  # Too young to collect
+    assert store.gc(min_age_seconds=0) == 1
+    assert store.exists(kept) and not store.exists(dropped)
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_re_put_protects_an_old_unreferenced_blob_from_gc(tmp_path, streamed):
+    store = ArtifactStore(str(tmp_path))
+    digest = store.put(b"old paper")
+    path = store.path(digest)
+    os.utime(path, (0, 0))  # Stored long ago, every reference since released
+
+    # A new run stores the same content but has not called add_ref yet
+    if streamed:
+        with store.open_writer() as writer:
+            writer.write(b"old paper")
+            assert writer.commit() == digest
+    else:
+        assert store.put(b"old paper") == digest
+    assert store.gc(min_age_seconds=3600) == 0
+
+    store.add_ref(digest, "run-c")
+    assert store.get(digest) == b"old paper"
+
+
+def test_mmap_view_opens_in_pymupdf(tmp_path):
+    pdf = fitz.open()
+    pdf.new_page().insert_text((72, 72), "Abstract", fontsize=10)
+    store = ArtifactStore(str(tmp_path))
+    digest = store.put(pdf.tobytes())
+
+    view = store.open_view(digest)
+    assert isinstance(view, memoryview)
+    assert "Abstract" in fitz.open("pdf", view)[0].get_text("text")
+
+
+def test_legacy_per_run_refs_still_load(tmp_path):
+    state = WorkflowState(workflow_name="legacy", raw_artifact_ref="raw_0123456789abcdef.bin")
+    run_dir = tmp_path / str(state.run_id)
+    run_dir.mkdir()
+    (run_dir / "raw_0123456789abcdef.bin").write_bytes(b"old layout")
+
+    assert state.load_raw_artifact(artifact_dir=str(tmp_path)) == b"old layout"
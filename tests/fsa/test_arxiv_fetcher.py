@@ -0,0 +1,71 @@
+import datetime
+from types import SimpleNamespace
+
+from fsa.core.artifact_store import ArtifactStore
+from fsa.ingestion.arxiv_fetcher import ArxivFetcher
+from fsa.ingestion.metadata_cache import ArxivMetadataCache
+
+
+class FakeResult(SimpleNamespace):
+    def get_short_id(self):
+        return self.short_id
+
+
+class FakeClient:
+    """Stands in for arxiv.Client: answers id_list searches from a fixed catalogue."""
+    def __init__(self, known):
+        self.known = known
+        self.queries = []
+
+    def results(self, search):
+        self.queries.append(list(search.id_list))
+        for arxiv_id in search.id_list:
+            if arxiv_id in self.known:
+                yield FakeResult(
+                    short_id=f"{arxiv_id}v2", entry_id=f"http://arxiv.org/abs/{arxiv_id}v2", title=f"Paper {arxiv_id}",
+                    authors=[SimpleNamespace(name="A. Author")], published=datetime.datetime(2024, 1, 1),
+                    summary="Summary.", pdf_url=f"http://arxiv.org/pdf/{arxiv_id}v2",
+                )
+
+
+class FakeDownloader:
+    def download(self, url, store):
+        return store.put(f"%PDF {url}".encode())
+
+
+def test_metadata_is_batched_and_cached(tmp_path):
+    ids = [f"2401.{i:05d}" for i in range(250)]
+    client = FakeClient(known=set(ids))
+    cache = ArxivMetadataCache(str(tmp_path / "meta"))
+    fetcher = ArxivFetcher(downloader=FakeDownloader(), metadata_cache=cache, client=client)
+
+    records = list(fetcher.iter_metadata(ids))
+    assert [arxiv_id for arxiv_id, _ in records] == ids
+    assert [len(q) for q in client.queries] == [100, 100, 50]
+
+    again = ArxivFetcher(downloader=FakeDownloader(), metadata_cache=cache, client=client)
+    assert list(again.iter_metadata(ids)) == records
+    assert len(client.queries) == 3  # Served from the on-disk cache
+
+
+def test_expired_metadata_is_refetched(tmp_path):
+    client = FakeClient(known={"2401.00001"})
+    cache = ArxivMetadataCache(str(tmp_path / "meta"), ttl_seconds=-1)
+    fetcher = ArxivFetcher(downloader=FakeDownloader(), metadata_cache=cache, client=client)
+
+    list(fetcher.iter_metadata(["2401.00001"]))
+    list(fetcher.iter_metadata(["2401.00001"]))
+    assert len(client.queries) == 2
+
+
+def test_fetch_many_yields_documents_and_skips_unknown_ids(tmp_path):
+    client = FakeClient(known={"2401.00001", "2401.00003"})
+    store = ArtifactStore(str(tmp_path / "artifacts"))
+    fetcher = ArxivFetcher(downloader=FakeDownloader(), client=client)
+
+    documents = list(fetcher.fetch_many(["2401.00001", "2401.00002", "2401.00003"], store, download_workers=2))
+
+    assert sorted(d.metadata["arxiv_id"] for d in documents) == ["2401.00001", "2401.00003"]
+    assert client.queries == [["2401.00001", "2401.00002", "2401.00003"]]
+    for document in documents:
+        assert store.get(document.raw_content_hash).startswith(b"%PDF")
@@ -0,0 +1,97 @@
+import asyncio
+import random
+import uuid
+
+import pytest
+
+from fsa.core.models import ClaimExtractionResult, ClaimType, ExtractedClaim, ParsedSection
+from fsa.extraction.rate_limiter import AsyncRateLimiter
+from fsa.extraction.service import ClaimExtractionService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_limiter_enforces_request_budget():
+    clock = FakeClock()
+    limiter = AsyncRateLimiter(requests_per_minute=2, tokens_per_minute=1000, clock=clock)
+
+    assert limiter._try_acquire(10) == 0
+    assert limiter._try_acquire(10) == 0
+    # Third request has to wait for one request's worth of refill (30s at 2 rpm)
+    assert limiter._try_acquire(10) == pytest.approx(30.0)
+    clock.now = 30.0
+    assert limiter._try_acquire(10) == 0
+
+
+def test_rate_limiter_enforces_token_budget_and_pause():
+    clock = FakeClock()
+    limiter = AsyncRateLimiter(tokens_per_minute=600, clock=clock)
+
+    assert limiter._try_acquire(500) == 0
+    assert limiter._try_acquire(200) == pytest.approx(10.0)
+    # Oversized requests are clamped to the bucket size instead of waiting forever
+    clock.now = 60.0
+    assert limiter._try_acquire(5000) == 0
+
+    limiter.pause(5)
+    assert limiter._try_acquire(0) == pytest.approx(5.0)
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, messages, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(random.uniform(0, 0.01))
+        self.active -= 1
+        title = messages[-1]["content"].split("Title: ")[1].split("\n")[0]
+        if title == "broken":
+            raise ValueError("invalid output")
+        return ClaimExtractionResult(claims=[ExtractedClaim(claim_text=title, claim_type=ClaimType.ASSERTION, confidence=1.0)])
+
+
+class FakeAsyncClient:
+    def __init__(self):
+        self.chat = type("Chat", (), {"completions": FakeCompletions()})()
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr("fsa.extraction.service.get_langfuse_client", lambda: None)
+    service = ClaimExtractionService(rate_limiter=AsyncRateLimiter(requests_per_minute=10_000))
+    client = FakeAsyncClient()
+    monkeypatch.setattr(service, "_create_async_client", lambda: (client, client))
+    return service, client
+
+
+def test_concurrent_extraction_preserves_section_order(service):
+    service, client = service
+    document_id = uuid.uuid4()
+    sections = [ParsedSection(document_id=document_id, title=f"s{i}", content="text", level=1) for i in range(20)]
+    sections.insert(5, ParsedSection(document_id=document_id, title="broken", content="text", level=1))
+    done = []
+
+    results = service.extract_claims_concurrently(
+        document_id, sections, max_concurrency=4,
+        on_section_done=lambda section, claims: done.append(section.title), raise_on_error=True,
+    )
+
+    assert isinstance(results[5], ValueError)
+    assert [r[0].claim_text for i, r in enumerate(results) if i != 5] == [f"s{i}" for i in range(20)]
+    assert sorted(done) == sorted(f"s{i}" for i in range(20))
+    assert client.chat.completions.peak <= 4
+    assert client.closed
@@ -0,0 +1,64 @@
+import json
+import threading
+import time
+
+import pytest
+
+from fsa.orchestration.abstractions import WorkflowStep
+from fsa.orchestration.batch import BatchAuditRunner, JsonlResultSink, read_arxiv_ids
+
+
+class TrackingStep(WorkflowStep):
+    """Counts how many runs execute the step at the same time."""
+
+    def __init__(self, name, agent):
+        super().__init__(name, agent)
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def execute(self, state):
+        if state.context["arxiv_id"] == "bad":
+            raise RuntimeError("not found")
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+        return state
+
+
+@pytest.fixture
+def engine(make_engine):
+    return make_engine()
+
+
+def test_batch_streams_records_with_stage_limits(tmp_path, engine, make_agent):
+    fetch, extract = TrackingStep("fetch", make_agent()), TrackingStep("extract", make_agent())
+    runner = BatchAuditRunner({}, max_concurrent_runs=6, stage_limits={"extract": 2},
+                              engine=engine, steps=[fetch, extract])
+    sink = JsonlResultSink(str(tmp_path / "results.jsonl"))
+    ids = [f"2401.{i:05d}" for i in range(12)] + ["bad"]
+
+    summary = runner.run(ids, sink)
+    sink.close()
+
+    assert summary == {"COMPLETED": 12, "FAILED": 1}
+    assert extract.peak <= 2
+    assert fetch.peak > 2
+    records = [json.loads(line) for line in (tmp_path / "results.jsonl").read_text().splitlines()]
+    assert sorted(r["arxiv_id"] for r in records) == sorted(ids)
+    failed = next(r for r in records if r["arxiv_id"] == "bad")
+    assert failed["status"] == "FAILED" and "not found" in failed["error"]
+
+
+def test_unknown_stage_limit_is_rejected(engine, make_agent):
+    with pytest.raises(ValueError):
+        BatchAuditRunner({}, stage_limits={"missing": 1}, engine=engine, steps=[TrackingStep("fetch", make_agent())])
+
+
+def test_read_arxiv_ids_skips_comments(tmp_path):
+    path = tmp_path / "ids.txt"
+    path.write_text("1706.03762\n\n# category dump\n2401.00001  # trailing note\n")
+    assert list(read_arxiv_ids(str(path))) == ["1706.03762", "2401.00001"]
@@ -0,0 +1,100 @@
+import uuid
+
+from fsa.core.models import ParsedSection
+from fsa.orchestration.state import StepStatus, WorkflowState
+
+
+def make_state():
+    state = WorkflowState(workflow_name="journal", context={"arxiv_id": "1706.03762"})
+    document_id = uuid.uuid4()
+    state.sections = [ParsedSection(document_id=document_id, title=f"S{i}", content="text " * 200, level=1) for i in range(20)]
+    return state
+
+
+def journal_lines(tmp_path, state):
+    return (tmp_path / f"{state.run_id}.journal").read_text().splitlines()
+
+
+def test_journal_appends_only_deltas_and_replays(tmp_path):
+    state = make_state()
+    state.checkpoint(str(tmp_path), journal=True)
+    snapshot_size = (tmp_path / f"{state.run_id}.json").stat().st_size
+
+    state.add_log("Parse", StepStatus.RUNNING, attempt=1)
+    state.checkpoint(str(tmp_path), journal=True)
+    state.add_log("Parse", StepStatus.COMPLETED, attempt=1)
+    state.current_step = "Extract"
+    state.checkpoint(str(tmp_path), journal=True)
+    # Nothing changed: no record is written
+    state.checkpoint(str(tmp_path), journal=True)
+
+    lines = journal_lines(tmp_path, state)
+    assert len(lines) == 3
+    # Deltas stay small; the sections are not rewritten
+    assert all(len(line) < snapshot_size / 10 for line in lines[1:])
+
+    loaded = WorkflowState.load_checkpoint(state.run_id, str(tmp_path))
+    assert loaded.model_dump() == state.model_dump()
+
+
+def test_journal_compaction_and_torn_tail(tmp_path):
+    state = make_state()
+    for attempt in range(1, 8):
+        state.add_log("Extract", StepStatus.FAILED, attempt=attempt, message="retry")
+        state.checkpoint(str(tmp_path), journal=True, compact_every=3)
+    assert len(journal_lines(tmp_path, state)) <= 4
+
+    # A crash mid-append leaves a partial line, which is ignored
+    with open(tmp_path / f"{state.run_id}.journal", "a") as f:
+        f.write('{"set": {"status": "COMPL')
+    loaded = WorkflowState.load_checkpoint(state.run_id, str(tmp_path))
+    assert [log.attempt for log in loaded.execution_history] == list(range(1, 8))
+
+
+def test_stale_journal_is_ignored_after_snapshot_checkpoint(tmp_path):
+    state = make_state()
+    state.checkpoint(str(tmp_path), journal=True)
+    state.status = StepStatus.FAILED
+    state.checkpoint(str(tmp_path), journal=True)
+
+    state.status = StepStatus.COMPLETED
+    state.checkpoint(str(tmp_path))
+
+    loaded = WorkflowState.load_checkpoint(state.run_id, str(tmp_path))
+    assert loaded.status == StepStatus.COMPLETED
+
+
+def test_dict_fields_are_journaled_per_key(tmp_path):
+    state = make_state()
+    state.checkpoint(str(tmp_path), journal=True)
+
+    for i in range(30):
+        state.extraction_progress[f"section-{i}"] = []
+        state.metrics["sections_done"] = i + 1
+        state.checkpoint(str(tmp_path), journal=True)
+    state.context.pop("arxiv_id")
+    state.checkpoint(str(tmp_path), journal=True)
+
+    # Every record carries only its own section, so records do not grow with the progress
+    lines = journal_lines(tmp_path, state)
+    assert len(lines[-2]) <= len(lines[1]) + 2
+    assert '"section-0"' not in lines[-2]
+    assert '"unset": {"context": ["arxiv_id"]}' in lines[-1]
+
+    loaded = WorkflowState.load_checkpoint(state.run_id, str(tmp_path))
+    assert loaded.model_dump() == state.model_dump()
+
+
+def test_journal_is_compacted_once_it_outgrows_the_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(WorkflowState, "JOURNAL_MIN_COMPACT_BYTES", 0)
+    state = make_state()
+    state.checkpoint(str(tmp_path), journal=True, compact_every=1000)
+    snapshot_size = (tmp_path / f"{state.run_id}.json").stat().st_size
+
+    for i in range(200):
+        state.metrics[f"metric-{i}"] = "x" * 500
+        state.checkpoint(str(tmp_path), journal=True, compact_every=1000)
+        assert (tmp_path / f"{state.run_id}.journal").stat().st_size <= 2 * snapshot_size + 1000
+
+    loaded = WorkflowState.load_checkpoint(state.run_id, str(tmp_path))
+    assert loaded.metrics == state.metrics
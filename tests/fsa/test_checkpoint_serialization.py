@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from fsa.orchestration.checkpoint_benchmark import make_realistic_state
+from fsa.orchestration.checkpoint_store import FileCheckpointStore, InMemoryCheckpointStore
+from fsa.orchestration.engine import OrchestrationEngine
+from fsa.orchestration.serialization import CHECKPOINT_COMPRESSIONS, CHECKPOINT_FORMATS, MAGIC
+from fsa.orchestration.state import StepStatus, WorkflowState
+
+
+# Optional package needed by each encoding; a missing one shows up as a skip, not a silently dropped case
+REQUIRED_PACKAGES = {"orjson": "orjson", "msgpack": "msgpack", "zstd": "zstandard"}
+
+
+@pytest.mark.parametrize("compression", CHECKPOINT_COMPRESSIONS)
+@pytest.mark.parametrize("format", CHECKPOINT_FORMATS)
+@pytest.mark.parametrize("journal", [False, True])
+def test_formats_round_trip(tmp_path, format, compression, journal):
+    for option in (format, compression):
+        if option in REQUIRED_PACKAGES:
+            pytest.importorskip(REQUIRED_PACKAGES[option])
+    store = FileCheckpointStore(str(tmp_path))
+    state = make_realistic_state(num_sections=5, num_claims=20, section_words=100)
+    state.checkpoint(journal=journal, store=store, format=format, compression=compression)
+    state.add_log("Verify", StepStatus.COMPLETED, attempt=1)
+    state.checkpoint(journal=journal, store=store, format=format, compression=compression)
+
+    loaded = WorkflowState.load_checkpoint(state.run_id, store=store)
+    assert loaded.model_dump() == state.model_dump()
+
+
+def test_compact_and_compressed_snapshots_are_smaller():
+    state = make_realistic_state(num_sections=10, num_claims=50, section_words=300)
+    sizes = {}
+    for format, compression in [("json", None), ("json-compact", None), ("json-compact", "zstd")]:
+        store = InMemoryCheckpointStore()
+        state.checkpoint(store=store, format=format, compression=compression)
+        sizes[format, compression] = store.read_snapshot(str(state.run_id))
+    assert len(sizes["json-compact", None]) < len(sizes["json", None])
+    assert len(sizes["json-compact", "zstd"]) < len(sizes["json-compact", None])
+    # Uncompressed JSON stays plain JSON; everything else is tagged
+    assert sizes["json-compact", None].startswith(b"{")
+    assert sizes["json-compact", "zstd"].startswith(MAGIC)
+
+
+def test_switching_format_between_checkpoints(tmp_path):
+    # A run resumed with different settings still loads its older checkpoints
+    store = FileCheckpointStore(str(tmp_path))
+    state = WorkflowState(workflow_name="switch", context={"arxiv_id": "1706.03762"})
+    state.checkpoint(store=store)
+    assert WorkflowState.load_checkpoint(state.run_id, store=store).model_dump() == state.model_dump()
+
+    state.status = StepStatus.RUNNING
+    state.checkpoint(store=store, format="json-compact", compression="zstd")
+    assert WorkflowState.load_checkpoint(state.run_id, store=store).status == StepStatus.RUNNING
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        OrchestrationEngine(checkpoint_dir=str(tmp_path), checkpoint_format="pickle")
+    with pytest.raises(ValueError):
+        OrchestrationEngine(checkpoint_dir=str(tmp_path), checkpoint_compression="gzip")
+
+
+def test_snapshot_files_are_named_by_encoding(tmp_path):
+    pytest.importorskip("msgpack")
+    pytest.importorskip("zstandard")
+    store = FileCheckpointStore(str(tmp_path))
+    state = WorkflowState(workflow_name="names")
+
+    for format, compression, name in [("json", None, ".json"), ("json-compact", "zstd", ".json.zst"),
+                                      ("msgpack", None, ".msgpack"), ("msgpack", "zstd", ".msgpack.zst")]:
+        state.checkpoint(store=store, format=format, compression=compression)
+        # The snapshot of the previous encoding is replaced, not left behind
+        assert os.listdir(tmp_path) == [f"{state.run_id}{name}"]
+        assert WorkflowState.load_checkpoint(state.run_id, store=store).model_dump() == state.model_dump()
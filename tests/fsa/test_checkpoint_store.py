@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from fsa.orchestration.checkpoint_store import FileCheckpointStore, InMemoryCheckpointStore, SQLiteCheckpointStore
+from fsa.orchestration.state import StepStatus, WorkflowState
+
+
+@pytest.fixture(params=["file", "sqlite", "memory"])
+def store(request, tmp_path):
+    if request.param == "file":
+        return FileCheckpointStore(str(tmp_path), fsync="always")
+    if request.param == "sqlite":
+        return SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    return InMemoryCheckpointStore()
+
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_state_round_trips_through_store(store, journal):
+    state = WorkflowState(workflow_name="store", context={"arxiv_id": "1706.03762"})
+    state.checkpoint(journal=journal, store=store)
+    state.add_log("Fetch", StepStatus.COMPLETED, attempt=1)
+    state.status = StepStatus.RUNNING
+    state.checkpoint(journal=journal, store=store)
+
+    loaded = WorkflowState.load_checkpoint(state.run_id, store=store)
+    assert loaded.model_dump() == state.model_dump()
+
+
+def test_missing_checkpoint_raises(store):
+    with pytest.raises(FileNotFoundError):
+        WorkflowState.load_checkpoint("00000000-0000-4000-8000-000000000000", store=store)
+
+
+def test_failed_snapshot_write_keeps_previous_checkpoint(tmp_path, monkeypatch):
+    store = FileCheckpointStore(str(tmp_path), fsync="never")
+    state = WorkflowState(workflow_name="atomic")
+    state.checkpoint(store=store)
+
+    def crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("fsa.orchestration.checkpoint_store.os.replace", crash)
+    state.status = StepStatus.FAILED
+    state.checkpoint(store=store)  # Logged, not raised
+
+    assert WorkflowState.load_checkpoint(state.run_id, store=store).status == StepStatus.PENDING
+    assert os.listdir(tmp_path) == [f"{state.run_id}.json"]
+
+
+def test_batched_fsync(tmp_path, monkeypatch):
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr("fsa.orchestration.checkpoint_store.os.fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+    store = FileCheckpointStore(str(tmp_path), fsync="batch", fsync_every=4)
+
+    state = WorkflowState(workflow_name="batch")
+    for _ in range(3):
+        state.checkpoint(store=store)
+    assert synced == []
+
+    state.checkpoint(store=store)
+    # One file plus the directory, not one fsync per write
+    assert len(synced) == 2
+
+    state.checkpoint(store=store)
+    store.flush()
+    assert len(synced) == 4
+    assert not [name for name in os.listdir(tmp_path) if ".tmp-" in name]
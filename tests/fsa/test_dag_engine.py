@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+from fsa.orchestration.abstractions import WorkflowStep
+from fsa.orchestration.state import StepStatus, WorkflowState
+
+
+class ContextStep(WorkflowStep):
+    """Records its name in the context; optionally waits on a barrier to prove concurrency."""
+
+    def __init__(self, name, agent, inputs=None, outputs=(), barrier=None, fail_times=0):
+        super().__init__(name, agent)
+        self.inputs = inputs
+        self.outputs = outputs
+        self.barrier = barrier
+        self.fail_times = fail_times
+        self.calls = 0
+
+    def execute(self, state):
+        self.calls += 1
+        if self.calls <= self.fail_times:
+            raise RuntimeError("transient")
+        if self.barrier:
+            self.barrier.wait(timeout=5)
+        state.context[self.name] = True
+        return state
+
+
+@pytest.fixture
+def engine(make_engine):
+    return make_engine(max_workers=4)
+
+
+@pytest.fixture
+def agent(make_agent):
+    return make_agent(max_retries=2)
+
+
+def test_independent_steps_run_concurrently(engine, agent):
+    barrier = threading.Barrier(2)
+    steps = [
+        ContextStep("root", agent, inputs=("context",), outputs=("document",)),
+        ContextStep("left", agent, inputs=("document",), outputs=("sections",), barrier=barrier),
+        ContextStep("right", agent, inputs=("document",), outputs=("raw_artifact_ref",), barrier=barrier),
+        ContextStep("join", agent, inputs=("sections", "raw_artifact_ref"), outputs=("claims",)),
+    ]
+    state = engine.run_dag_workflow(steps, WorkflowState(workflow_name="dag"))
+
+    assert state.status == StepStatus.COMPLETED
+    assert all(state.context[name] for name in ("root", "left", "right", "join"))
+    order = [log.step_name for log in state.execution_history if log.status == StepStatus.COMPLETED]
+    assert order[0] == "root" and order[-1] == "join"
+
+
+def test_dependency_cycle_is_rejected(engine, agent):
+    steps = [
+        ContextStep("a", agent, inputs=("claims",), outputs=("sections",)),
+        ContextStep("b", agent, inputs=("sections",), outputs=("claims",)),
+    ]
+    with pytest.raises(ValueError):
+        engine.run_dag_workflow(steps, WorkflowState(workflow_name="dag"))
+
+
+def test_resume_skips_completed_nodes(engine, agent):
+    steps = [
+        ContextStep("fetch", agent, inputs=("context",), outputs=("document",)),
+        ContextStep("parse", agent, inputs=("document",), outputs=("sections",)),
+    ]
+    state = WorkflowState(workflow_name="dag")
+    state.add_log("fetch", StepStatus.COMPLETED, attempt=1)
+    state.add_log("parse", StepStatus.FAILED, attempt=1, message="boom")
+
+    state = engine.run_dag_workflow(steps, state)
+
+    assert state.status == StepStatus.COMPLETED
+    assert steps[0].calls == 0
+    assert steps[1].calls == 1
+    # The retried node continues its attempt numbering
+    assert state.execution_history[-1].attempt == 2
+    assert engine._get_start_index(steps, state) == len(steps)
+
+
+def test_failed_node_stops_scheduling(engine, agent):
+    steps = [
+        ContextStep("flaky", agent, inputs=("context",), outputs=("document",), fail_times=5),
+        ContextStep("after", agent, inputs=("document",), outputs=("sections",)),
+    ]
+    state = engine.run_dag_workflow(steps, WorkflowState(workflow_name="dag"))
+
+    assert state.status == StepStatus.FAILED
+    assert steps[1].calls == 0
@@ -0,0 +1,114 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from fsa.core.artifact_store import ArtifactStore
+from fsa.ingestion.downloader import PDFDownloader
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+ETAG = '"v1"'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    supports_ranges = True
+
+    def log_message(self, *args):
+        pass
+
+    def _record(self):
+        self.server.requests.append((self.command, self.headers.get("Range"), self.headers.get("If-None-Match")))
+
+    def _send_headers(self, status, length, extra=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        self.send_header("ETag", ETAG)
+        if self.supports_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        for key, value in (extra or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._record()
+        if self.headers.get("If-None-Match") == ETAG:
+            return self._send_headers(304, 0)
+        self._send_headers(200, len(PAYLOAD))
+
+    def do_GET(self):
+        self._record()
+        if self.headers.get("If-None-Match") == ETAG:
+            return self._send_headers(304, 0)
+        byte_range = self.headers.get("Range")
+        if byte_range and self.supports_ranges:
+            start, end = (int(x) for x in byte_range.split("=")[1].split("-"))
+            body = PAYLOAD[start:end + 1]
+            self._send_headers(206, len(body), {"Content-Range": f"bytes {start}-{end}/{len(PAYLOAD)}"})
+        else:
+            body = PAYLOAD
+            self._send_headers(200, len(body))
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    StubHandler.supports_ranges = True
+
+
+def url_of(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/paper.pdf"
+
+
+@pytest.mark.parametrize("compression", [None, "zstd"])
+def test_streamed_download_lands_in_store(server, tmp_path, compression):
+    store = ArtifactStore(str(tmp_path), compression=compression)
+    downloader = PDFDownloader(session=requests.Session(), chunk_size=64 * 1024)
+
+    digest = downloader.download(url_of(server), store)
+
+    assert digest == hashlib.sha256(PAYLOAD).hexdigest()
+    assert store.get(digest) == PAYLOAD
+    assert not list((tmp_path / "tmp").iterdir())
+
+
+def test_refetch_is_conditional(server, tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    downloader = PDFDownloader(session=requests.Session())
+
+    first = downloader.download(url_of(server), store)
+    second = downloader.download(url_of(server), store)
+
+    assert first == second
+    assert server.requests[-1] == ("GET", None, ETAG)
+
+
+def test_large_files_are_split_into_ranges(server, tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    downloader = PDFDownloader(session=requests.Session(), range_workers=4, range_min_bytes=1024, conditional=False)
+
+    digest = downloader.download(url_of(server), store)
+
+    assert store.get(digest) == PAYLOAD
+    ranges = sorted(r for method, r, _ in server.requests if method == "GET")
+    assert len(ranges) == 4 and all(r.startswith("bytes=") for r in ranges)
+
+
+def test_falls_back_to_single_stream_without_range_support(server, tmp_path):
+    StubHandler.supports_ranges = False
+    store = ArtifactStore(str(tmp_path))
+    downloader = PDFDownloader(session=requests.Session(), range_workers=4, range_min_bytes=1024)
+
+    digest = downloader.download(url_of(server), store)
+
+    assert store.get(digest) == PAYLOAD
+    assert [method for method, _, _ in server.requests] == ["HEAD", "GET"]
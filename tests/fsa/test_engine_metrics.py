@@ -0,0 +1,97 @@
+import urllib.request
+
+import pytest
+
+from fsa.orchestration.abstractions import WorkflowStep
+from fsa.orchestration.metrics import MetricsRegistry, serve_metrics
+from fsa.orchestration.state import StepStatus, WorkflowState
+
+
+class BusyStep(WorkflowStep):
+    """Burns some CPU, checkpoints progress once and fails its first `fail_times` attempts."""
+
+    def __init__(self, name, agent, fail_times=0):
+        super().__init__(name, agent)
+        self.fail_times = fail_times
+        self.calls = 0
+
+    def execute(self, state):
+        self.calls += 1
+        sum(i * i for i in range(20000))
+        state.checkpoint_progress()
+        if self.calls <= self.fail_times:
+            raise RuntimeError("transient")
+        return state
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def make_engine(make_engine, registry):
+    def make(**kwargs):
+        return make_engine(metrics_registry=registry, **kwargs)
+    return make
+
+
+@pytest.fixture
+def agent(make_agent):
+    return make_agent(max_retries=3)
+
+
+@pytest.mark.parametrize("dag", [False, True])
+def test_step_summary_on_state(make_engine, agent, dag):
+    engine = make_engine()
+    steps = [BusyStep("fetch", agent), BusyStep("parse", agent, fail_times=1)]
+    run = engine.run_dag_workflow if dag else engine.run_workflow
+
+    state = run(steps, WorkflowState(workflow_name="metrics"))
+
+    assert state.status == StepStatus.COMPLETED
+    fetch, parse = state.metrics["steps"]["fetch"], state.metrics["steps"]["parse"]
+    assert (fetch["attempts"], fetch["retries"]) == (1, 0)
+    assert (parse["attempts"], parse["retries"]) == (2, 1)
+    assert parse["wall_seconds"] > 0 and parse["cpu_seconds"] > 0
+    # RUNNING, progress and COMPLETED/FAILED checkpoints of every attempt
+    assert fetch["checkpoint_writes"] == 3 and parse["checkpoint_writes"] == 6
+    assert state.metrics["workflow"]["wall_seconds"] >= fetch["wall_seconds"] + parse["wall_seconds"]
+    assert state.metrics["workflow"]["checkpoint_writes"] == 1
+
+
+def test_prometheus_rendering(make_engine, agent, registry, tmp_path):
+    make_engine().run_workflow([BusyStep("parse", agent, fail_times=1)], WorkflowState(workflow_name="metrics"))
+
+    text = registry.render()
+    assert 'fsa_step_attempts_total{workflow="metrics",step="parse",status="COMPLETED"} 1' in text
+    assert 'fsa_step_attempts_total{workflow="metrics",step="parse",status="FAILED"} 1' in text
+    assert 'fsa_step_retries_total{workflow="metrics",step="parse"} 1' in text
+    assert 'fsa_step_attempt_seconds_bucket{workflow="metrics",step="parse",le="+Inf"} 2' in text
+    assert 'fsa_workflow_runs_total{workflow="metrics",status="COMPLETED"} 1' in text
+    assert "# TYPE fsa_checkpoint_write_seconds_total counter" in text
+
+    path = tmp_path / "textfile" / "fsa.prom"
+    registry.write_textfile(str(path))
+    assert path.read_text() == text
+
+
+def test_metrics_endpoint(registry):
+    registry.observe_run("metrics", "COMPLETED", 1.5)
+    server = serve_metrics(registry, port=0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as response:
+            body = response.read().decode()
+        assert 'fsa_workflow_wall_seconds_total{workflow="metrics",status="COMPLETED"} 1.5' in body
+    finally:
+        server.shutdown()
+
+
+def test_disabled_metrics_record_nothing(make_engine, agent, registry):
+    engine = make_engine(step_metrics=False)
+    state = engine.run_workflow([BusyStep("fetch", agent)], WorkflowState(workflow_name="metrics"))
+
+    assert state.status == StepStatus.COMPLETED
+    assert state.metrics == {}
+    assert engine.metrics_registry is None
+    assert "fsa_step_attempts_total{" not in registry.render()
@@ -0,0 +1,77 @@
+import uuid
+
+import pytest
+
+from fsa.core.models import ClaimExtractionResult, ClaimType, ExtractedClaim, ParsedSection
+from fsa.extraction.cache import ExtractionCache
+from fsa.extraction.service import ClaimExtractionService
+
+
+def claim(text):
+    return ExtractedClaim(claim_text=text, claim_type=ClaimType.EMPIRICAL, confidence=0.5)
+
+
+def test_key_depends_on_model_messages_and_prompt_version():
+    messages = [{"role": "user", "content": "x"}]
+    key = ExtractionCache.make_key("gpt-4o", messages, "v1")
+    assert key == ExtractionCache.make_key("gpt-4o", [dict(m) for m in messages], "v1")
+    assert key != ExtractionCache.make_key("gpt-4o-mini", messages, "v1")
+    assert key != ExtractionCache.make_key("gpt-4o", messages, "v2")
+    assert key != ExtractionCache.make_key("gpt-4o", [{"role": "user", "content": "y"}], "v1")
+
+
+def test_lru_eviction_and_stats(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite3"), max_bytes=300)
+    for name in ("a", "b", "c"):
+        cache.put(name, "gpt-4o", [claim(name * 20)])
+    # Touch "a" so "b" becomes the least recently used entry
+    assert cache.get("a")[0].claim_text == "a" * 20
+    cache.put("d", "gpt-4o", [claim("d" * 20)])
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("d") is not None
+    assert cache.stats["evictions"] >= 1
+    assert cache.stats["misses"] == 1
+
+    # Persistent across instances
+    reopened = ExtractionCache(str(tmp_path / "cache.sqlite3"), max_bytes=300)
+    assert reopened.get("d")[0].claim_text == "d" * 20
+
+
+class CountingCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return ClaimExtractionResult(claims=[claim("fresh")])
+
+
+@pytest.fixture
+def service_factory(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr("fsa.extraction.service.get_langfuse_client", lambda: None)
+    completions = CountingCompletions()
+
+    def make(**kwargs):
+        service = ClaimExtractionService(cache=ExtractionCache(str(tmp_path / "cache.sqlite3")), **kwargs)
+        service.client = type("Client", (), {"chat": type("Chat", (), {"completions": completions})()})()
+        return service
+
+    return make, completions
+
+
+def test_service_reuses_cached_results_across_documents(service_factory):
+    make, completions = service_factory
+    section = ParsedSection(document_id=uuid.uuid4(), title="Results", content="We measured x.", level=1)
+    rerun = ParsedSection(document_id=uuid.uuid4(), title="Results", content="We measured x.", level=1)
+
+    service = make()
+    assert service.extract_claims(section.document_id, section)[0].claim_text == "fresh"
+    assert service.extract_claims(rerun.document_id, rerun)[0].claim_text == "fresh"
+    assert completions.calls == 1
+    assert service.cache.stats["hits"] == 1
+
+    bypassing = make(bypass_cache=True)
+    bypassing.extract_claims(rerun.document_id, rerun)
+    assert completions.calls == 2
@@ -0,0 +1,99 @@
+import re
+import uuid
+
+import pytest
+
+from fsa.agents.extractor_agent import ExtractClaimsStep, ExtractorAgent
+from fsa.core.models import (ClaimExtractionResult, ClaimType, Document, DocumentSource, ExtractedClaim,
+                             PackedClaimExtractionResult, PackedExtractedClaim, ParsedSection)
+from fsa.extraction.chunking import plan_chunks, split_text
+from fsa.extraction.rate_limiter import estimate_tokens
+from fsa.orchestration.abstractions import Environment
+from fsa.orchestration.state import WorkflowState
+
+
+def section(title, content, document_id=None):
+    return ParsedSection(document_id=document_id or uuid.uuid4(), title=title, content=content, level=1)
+
+
+def test_split_prefers_paragraph_boundaries():
+    paragraphs = [f"Paragraph {i}. " + "word " * 150 for i in range(6)]
+    pieces = split_text("\n\n".join(paragraphs), max_tokens=500)
+    assert len(pieces) == 3
+    assert all(estimate_tokens(piece) <= 500 for piece in pieces)
+    assert pieces[0].startswith("Paragraph 0.") and pieces[1].startswith("Paragraph 2.")
+
+    # A single unbroken run of text is still cut to the budget
+    assert all(estimate_tokens(piece) <= 100 for piece in split_text("x" * 2000, max_tokens=100))
+
+
+def test_plan_packs_small_sections_and_splits_large_ones():
+    sections = [section("Abstract", "short " * 20), section("Intro", "short " * 20),
+                section("Method", ("line " * 100 + "\n") * 30), section("Results", "short " * 20)]
+    chunks = plan_chunks(sections, max_tokens=1000)
+
+    titles = [[(p.section.title, p.index, p.count) for p in chunk.pieces] for chunk in chunks]
+    assert titles[0] == [("Abstract", 0, 1), ("Intro", 0, 1)]
+    assert all(len(chunk) == 1 and chunk[0][0] == "Method" for chunk in titles[1:-1])
+    assert [piece[1] for chunk in titles[1:-1] for piece in chunk] == list(range(len(titles) - 2))
+    assert titles[-1] == [("Results", 0, 1)]
+    assert all(sum(estimate_tokens(p.text) for p in chunk.pieces) <= 1000 for chunk in chunks)
+
+    assert len(plan_chunks(sections[:2], max_tokens=1000, max_sections=1)) == 2
+
+
+def test_packed_part_is_validated_against_the_request():
+    with pytest.raises(ValueError):
+        PackedExtractedClaim.model_validate({"claim_text": "x", "claim_type": "ASSERTION", "confidence": 1.0, "part": 3},
+                                            context={"parts": 2})
+
+
+class PartEchoCompletions:
+    """Returns one claim per section (or piece) named after its title."""
+
+    def __init__(self):
+        self.requests = []
+
+    def create(self, response_model, messages, **kwargs):
+        self.requests.append(kwargs)
+        prompt = messages[-1]["content"]
+        if issubclass(response_model, PackedClaimExtractionResult):
+            parts = re.findall(r"\[Part (\d+)\]\nTitle: (.*)\n", prompt)
+            return PackedClaimExtractionResult(claims=[
+                PackedExtractedClaim(claim_text=title, claim_type=ClaimType.ASSERTION, confidence=1.0, part=int(number))
+                for number, title in parts
+            ])
+        title = prompt.split("Title: ")[1].split("\n")[0]
+        return ClaimExtractionResult(claims=[ExtractedClaim(claim_text=title, claim_type=ClaimType.ASSERTION, confidence=1.0)])
+
+
+@pytest.fixture
+def step(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr("fsa.extraction.service.get_langfuse_client", lambda: None)
+    agent = ExtractorAgent(environment=Environment(config={"extraction_cache_path": None, "extraction_chunk_tokens": 1000}))
+    step = ExtractClaimsStep(agent=agent)
+    completions = PartEchoCompletions()
+    step.service.client = type("Client", (), {"chat": type("Chat", (), {"completions": completions})()})()
+    return step, completions
+
+
+def test_step_maps_claims_back_to_source_sections(step):
+    step, completions = step
+    document = Document(source_url=None, title="Paper", source_type=DocumentSource.ARXIV, raw_content_hash="abc")
+    body = "A claim about the method. " * 10
+    sections = [section(title, body, document.id) for title in ("Abstract", "Introduction", "Background")]
+    sections.insert(2, section("Method", ("The model is trained. " * 40 + "\n\n") * 6, document.id))
+    state = WorkflowState(workflow_name="chunked", document=document, sections=sections)
+
+    state = step.execute(state)
+
+    # Abstract+Introduction packed, Method split into pieces, Background alone
+    assert completions.requests[0]["validation_context"] == {"parts": 2}
+    assert len(completions.requests) < 2 + 6
+    by_section = {s.title: [c.claim_text for c in state.extraction_progress[str(s.section_id)]] for s in sections}
+    assert by_section["Abstract"] == ["Abstract"] and by_section["Introduction"] == ["Introduction"]
+    assert len(by_section["Method"]) > 1 and all(t.startswith("Method (part ") for t in by_section["Method"])
+    assert [c.claim_text for c in state.claims][:2] == ["Abstract", "Introduction"]
+    assert state.claims[-1].claim_text == "Background"
+    assert all(type(c) is ExtractedClaim for c in state.claims)
@@ -0,0 +1,78 @@
+import pytest
+
+from fsa.agents.extractor_agent import ExtractClaimsStep, ExtractorAgent
+from fsa.core.models import ClaimType, Document, DocumentSource, ExtractedClaim, ParsedSection
+from fsa.orchestration.abstractions import Environment, ResiliencePolicy
+from fsa.orchestration.state import StepStatus, WorkflowState
+
+
+class FlakyService:
+    """Fails once for the section titled 'Results', otherwise returns one claim per section."""
+
+    def __init__(self, model="gpt-4o", **kwargs):
+        self.calls = []
+        self.failed = False
+        self.cache = None
+
+    def extract_claims(self, document_id, section, raise_on_error=False):
+        self.calls.append(section.title)
+        if section.title == "Results" and not self.failed:
+            self.failed = True
+            raise RuntimeError("rate limited")
+        return [ExtractedClaim(claim_text=f"Claim from {section.title}", claim_type=ClaimType.ASSERTION, confidence=0.9)]
+
+
+@pytest.fixture
+def step(monkeypatch):
+    monkeypatch.setattr("fsa.agents.extractor_agent.ClaimExtractionService", FlakyService)
+    agent = ExtractorAgent(
+        # One request per section, so the fake service sees each section individually
+        environment=Environment(config={"extraction_cache_path": None, "extraction_chunk_tokens": None}),
+        resilience_policy=ResiliencePolicy(max_retries=3, retry_wait_min_seconds=0, retry_wait_max_seconds=0),
+    )
+    return ExtractClaimsStep(agent=agent)
+
+
+def make_state():
+    document = Document(source_url=None, title="Paper", source_type=DocumentSource.ARXIV, raw_content_hash="abc")
+    body = "x" * 80
+    sections = [
+        ParsedSection(document_id=document.id, title=title, content=body, level=1)
+        for title in ("Introduction", "Methods", "Results", "Discussion")
+    ]
+    sections.append(ParsedSection(document_id=document.id, title="References", content=body, level=1))
+    return WorkflowState(workflow_name="extract", document=document, sections=sections)
+
+
+def test_retry_only_processes_outstanding_sections(step, make_engine):
+    engine = make_engine()
+
+    state = engine.run_workflow([step], make_state())
+
+    assert state.status == StepStatus.COMPLETED
+    assert step.service.calls == ["Introduction", "Methods", "Results", "Discussion", "Results"]
+    # Claims keep document order regardless of the order sections finished in
+    assert [c.claim_text for c in state.claims] == [
+        "Claim from Introduction", "Claim from Methods", "Claim from Results", "Claim from Discussion",
+    ]
+    attempts = [log.status for log in state.execution_history]
+    assert attempts == [StepStatus.RUNNING, StepStatus.FAILED, StepStatus.RUNNING, StepStatus.COMPLETED]
+
+
+def test_progress_is_checkpointed_and_resumable(step, tmp_path):
+    state = make_state()
+    checkpoints = []
+    state._progress_hook = lambda s: checkpoints.append(len(s.extraction_progress))
+
+    with pytest.raises(RuntimeError):
+        step.execute(state)
+    assert checkpoints == [2, 3, 4]
+
+    state.checkpoint(str(tmp_path))
+    resumed = WorkflowState.load_checkpoint(state.run_id, str(tmp_path))
+    assert len(resumed.extraction_progress) == 4
+
+    step.service.calls.clear()
+    resumed = step.execute(resumed)
+    assert step.service.calls == ["Results"]
+    assert len(resumed.claims) == 4
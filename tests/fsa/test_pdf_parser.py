@@ -0,0 +1,63 @@
+import fitz
+import pytest
+
+from fsa.core.models import Document, DocumentSource
+from fsa.ingestion.pdf_parser import PDFParser
+from fsa.ingestion.section_cache import ParsedSectionCache
+
+
+def make_pdf(pages):
+    pdf = fitz.open()
+    for text in pages:
+        page = pdf.new_page()
+        page.insert_text((72, 72), text, fontsize=10)
+    return pdf.tobytes()
+
+
+@pytest.fixture
+def document():
+    return Document(source_url=None, title="Sample", source_type=DocumentSource.ARXIV, raw_content_hash="abc")
+
+
+def paper_pages(count):
+    pages = []
+    for i in range(count):
+        heading = f"{i + 1} Findings of Part\n" if i % 3 == 0 else ""
+        pages.append(f"Body text of page {i}, with results (p < 0.05).\n{heading}More text on page {i}.")
+    return ["A Sample Paper\nAbstract\nWe study things.\nIntroduction\nMotivation, 2025."] + pages
+
+
+def test_streaming_yields_sections_before_document_end(document):
+    parser = PDFParser()
+    chunks = iter(["Title\nAbstract\nWe study x.\n1 Results\nWe find y.", " More.\n2 Discussion\nDone."])
+    sections = parser._split_sections(document, chunks)
+
+    assert next(sections).title == "Preamble"
+    abstract = next(sections)
+    assert (abstract.title, abstract.content) == ("Abstract", "We study x.")
+    assert [s.title for s in sections] == ["1 Results", "2 Discussion"]
+
+
+def test_parallel_page_extraction_matches_serial_parse(document):
+    pdf_content = make_pdf(paper_pages(12))
+
+    serial = PDFParser().parse(document, pdf_content)
+    parallel = list(PDFParser(workers=2, pages_per_task=2).iter_sections(document, pdf_content))
+
+    assert len(serial) > 3
+    assert [(s.title, s.content, s.level) for s in parallel] == [(s.title, s.content, s.level) for s in serial]
+
+
+def test_section_cache_reuses_parse_until_parser_version_changes(document, tmp_path, monkeypatch):
+    cache = ParsedSectionCache(str(tmp_path))
+    sections = PDFParser().parse(document, make_pdf(paper_pages(4)))
+    cache.put(document, PDFParser.version(), sections)
+
+    rerun = Document(source_url=None, title="Mirror", source_type=DocumentSource.ARXIV, raw_content_hash=document.raw_content_hash)
+    cached = cache.get(rerun, PDFParser.version())
+    assert [(s.title, s.content) for s in cached] == [(s.title, s.content) for s in sections]
+    assert all(s.document_id == rerun.id for s in cached)
+
+    monkeypatch.setattr(PDFParser, "PARSER_VERSION", "2")
+    assert cache.get(rerun, PDFParser.version()) is None
+    assert cache.prune(PDFParser.version()) == 1
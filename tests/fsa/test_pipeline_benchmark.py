@@ -0,0 +1,130 @@
+import uuid
+
+import pytest
+
+from fsa.core.artifact_store import ArtifactStore
+from fsa.core.models import ParsedSection
+from fsa.extraction.backends import StubLLMBackend, StubLLMError, backend_from_config
+from fsa.extraction.chunking import plan_chunks
+from fsa.extraction.service import ClaimExtractionService
+from fsa.agents.ingestor_agent import FetchArxivStep, IngestorAgent, ParsePDFStep
+from fsa.orchestration.abstractions import Environment
+from fsa.ingestion.fixture_fetcher import DEFAULT_FIXTURE_PDF, FixtureArxivFetcher
+from fsa.orchestration.pipeline_benchmark import percentile, run_benchmark
+
+TEXT = ("Sparse experts reduce the compute per token. The router balances load across experts. "
+        "Our model matches the dense baseline at a third of the cost. Training is stable at scale.")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr("fsa.extraction.service.get_langfuse_client", lambda: None)
+    return ClaimExtractionService(backend=StubLLMBackend(latency_seconds=0, claims_per_part=2, cached_prompt_tokens=50))
+
+
+def section(title="1 Introduction", content=TEXT):
+    return ParsedSection(document_id=uuid.uuid4(), title=title, content=content, level=1)
+
+
+def test_stub_backend_is_deterministic(service):
+    s = section()
+    first = service.extract_claims(s.document_id, s)
+    second = service.extract_claims(s.document_id, s)
+
+    assert len(first) == 2
+    assert [c.claim_text for c in first] == [c.claim_text for c in second]
+    assert all(c.claim_text in TEXT for c in first)
+    assert service.usage.requests == 2
+    assert service.usage.cached_prompt_tokens == 100
+
+
+def test_stub_backend_answers_packed_requests_per_part(service):
+    document_id = uuid.uuid4()
+    sections = [section(f"{i} Part", TEXT.replace("experts", f"experts-{i}")) for i in range(3)]
+    chunk, = plan_chunks(sections, max_tokens=3000)
+
+    claims = service.extract_chunk_claims(document_id, chunk)
+
+    assert [len(piece_claims) for piece_claims in claims] == [2, 2, 2]
+    assert all(c.claim_text in sections[1].content for c in claims[1])
+
+
+def test_stub_backend_failure_rate():
+    request = {"response_model": None, "messages": [{"role": "user", "content": "x"}]}
+    with pytest.raises(StubLLMError):
+        StubLLMBackend(latency_seconds=0, failure_rate=1.0).complete(request)
+
+    backend = StubLLMBackend(latency_seconds=0, failure_rate=0.3, seed=7)
+    outcomes = [backend._should_fail() for _ in range(1000)]
+    assert 200 < sum(outcomes) < 400
+    assert backend.failures == sum(outcomes) and backend.requests == 1000
+
+
+def test_backend_from_config():
+    assert backend_from_config({}) is None
+    assert isinstance(backend_from_config({"llm_backend": "stub", "llm_stub": {"seed": 3}}), StubLLMBackend)
+    with pytest.raises(ValueError):
+        backend_from_config({"llm_backend": "mystery"})
+
+
+def test_fixture_fetcher_serves_the_sample_pdf(tmp_path):
+    fetcher = FixtureArxivFetcher()
+    store = ArtifactStore(str(tmp_path))
+
+    document, digest = fetcher.fetch_to_store("2401.00001", store)
+
+    assert document.metadata["arxiv_id"] == "2401.00001"
+    with open(DEFAULT_FIXTURE_PDF, "rb") as f:
+        assert store.get(digest) == f.read()
+    with pytest.raises(FileNotFoundError):
+        FixtureArxivFetcher(str(tmp_path / "missing.pdf"))
+
+
+def test_fixture_fetcher_is_a_fully_initialized_arxiv_fetcher(tmp_path):
+    fetcher = FixtureArxivFetcher()
+    store = ArtifactStore(str(tmp_path))
+
+    # Base-class state is set up, so inherited methods work unchanged
+    assert fetcher.client is not None and fetcher.downloader is not None
+    documents = list(fetcher.fetch_many(["2401.00001", "2401.00002"], store))
+
+    assert sorted(d.metadata["arxiv_id"] for d in documents) == ["2401.00001", "2401.00002"]
+    assert {d.raw_content_hash for d in documents} == {store.put(fetcher.pdf_content)}
+
+
+def test_fixture_runs_never_touch_the_metadata_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = {"arxiv_fixture_pdf": DEFAULT_FIXTURE_PDF, "artifact_dir": str(tmp_path / "artifacts"),
+              "arxiv_metadata_cache_dir": str(tmp_path / "metadata")}
+    step = FetchArxivStep(IngestorAgent(environment=Environment(config=config)))
+
+    assert step.fetcher.metadata_cache is None
+    assert list(step.fetcher.iter_metadata(["2401.00001"]))[0][1]["pdf_url"].startswith("file://")
+    assert not (tmp_path / "metadata").exists() and not (tmp_path / "cache").exists()
+
+
+def test_section_cache_lives_under_the_artifact_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    artifact_dir = tmp_path / "relocated" / "artifacts"
+    step = ParsePDFStep(IngestorAgent(environment=Environment(config={"artifact_dir": str(artifact_dir)})))
+    assert step.cache.cache_dir == str(artifact_dir / "parsed_sections")
+
+    disabled = ParsePDFStep(IngestorAgent(environment=Environment(config={"parsed_section_cache_dir": None})))
+    assert disabled.cache is None
+    assert not (tmp_path / "artifacts").exists()
+
+
+def test_percentile():
+    assert percentile([], 50) == 0.0
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile(list(range(1, 101)), 99) == 99
+
+
+def test_pipeline_benchmark_runs_offline(tmp_path):
+    results = run_benchmark(papers=3, concurrency=2, stub_options={"latency_seconds": 0}, work_dir=str(tmp_path))
+
+    assert results["completed"] == 3
+    assert results["claims"] > 0
+    assert results["papers_per_minute"] > 0
+    assert set(results["steps"]) >= {"Fetch_Arxiv_Document", "Parse_PDF_Sections", "Extract_Atomic_Claims"}
+    assert results["peak_rss_mb"] > 0
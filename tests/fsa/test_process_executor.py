@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+from fsa.orchestration.abstractions import WorkflowStep
+from fsa.orchestration.state import StepStatus, WorkflowState
+
+
+class ProgressStep(WorkflowStep):
+    """Writes a declared output plus per-key progress and metrics, like ExtractClaimsStep."""
+    outputs = ("context", "extraction_progress", "metrics")
+
+    def execute(self, state):
+        state.context["done"] = self.name
+        state.extraction_progress[self.name] = []
+        state.metrics["extraction_tokens"] = 42
+        return state
+
+
+class UndeclaredStep(WorkflowStep):
+    outputs = ("context",)
+
+    def execute(self, state):
+        state.context["done"] = self.name
+        state.extraction_progress[self.name] = []
+        return state
+
+
+@pytest.fixture
+def engine(make_engine):
+    return make_engine(step_executor="process", max_workers=1)
+
+
+def test_every_written_field_is_copied_back(engine, make_agent):
+    state = WorkflowState(workflow_name="process", extraction_progress={"earlier": []})
+
+    state = engine.run_workflow([ProgressStep("extract", make_agent())], state)
+
+    assert state.status == StepStatus.COMPLETED
+    assert state.context["done"] == "extract"
+    assert set(state.extraction_progress) == {"earlier", "extract"}
+    assert state.metrics["extraction_tokens"] == 42
+    # Per-key merge keeps what the engine recorded in the parent while the step ran
+    assert state.metrics["steps"]["extract"]["attempts"] == 1
+
+
+def test_undeclared_writes_fail_the_step(engine, make_agent):
+    state = WorkflowState(workflow_name="process")
+
+    state = engine.run_dag_workflow([UndeclaredStep("extract", make_agent())], state)
+
+    assert state.status == StepStatus.FAILED
+    assert "extraction_progress" in state.execution_history[-1].message
+    assert state.extraction_progress == {}
+
+
+def test_concurrent_first_use_creates_one_pool(engine):
+    barrier = threading.Barrier(8)
+    pools = []
+
+    def first_use():
+        barrier.wait()
+        pools.append(engine._get_process_pool())
+
+    threads = [threading.Thread(target=first_use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(pool) for pool in pools}) == 1
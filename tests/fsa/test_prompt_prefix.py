@@ -0,0 +1,134 @@
+import importlib.metadata
+import inspect
+import json
+import uuid
+
+import httpx
+import instructor
+import pytest
+from instructor.process_response import handle_response_model
+from instructor.utils import classproperty
+from openai.types.chat import ChatCompletion
+
+from fsa.core.models import ClaimExtractionResult, PackedClaimExtractionResult, ParsedSection
+from fsa.extraction.prompts import CLAIM_EXTRACTION_SYSTEM_PROMPT
+from fsa.extraction.service import INSTRUCTOR_VERSION_SERIES, ClaimExtractionService, compile_response_model
+from fsa.extraction.usage import TokenUsage, track_usage
+from fsa.core.observability import InMemorySink, TelemetryExporter
+
+
+def completion(arguments, cached_tokens):
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {
+            "role": "assistant", "content": None,
+            "tool_calls": [{"id": "call-1", "type": "function",
+                            "function": {"name": "ClaimExtractionResult", "arguments": json.dumps(arguments)}}],
+        }}],
+        "usage": {"prompt_tokens": 1500, "completion_tokens": 40, "total_tokens": 1540,
+                  "prompt_tokens_details": {"cached_tokens": cached_tokens}},
+    })
+
+
+@pytest.fixture
+def http_requests(monkeypatch):
+    """Serves chat completions at the httpx transport level, so the real openai client validates every argument."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr("fsa.extraction.service.get_langfuse_client", lambda: None)
+    requests = []
+
+    def respond(request):
+        requests.append(json.loads(request.read()))
+        claims = {"claims": [{"claim_text": "x holds.", "claim_type": "THEOREM", "confidence": 0.8}]}
+        body = completion(claims, cached_tokens=0 if len(requests) == 1 else 1280).model_dump(mode="json")
+        return httpx.Response(200, json=body, request=request)
+
+    async def respond_async(request):
+        await request.aread()
+        return respond(request)
+
+    monkeypatch.setattr(httpx.HTTPTransport, "handle_request", lambda transport, request: respond(request))
+    monkeypatch.setattr(httpx.AsyncHTTPTransport, "handle_async_request", lambda transport, request: respond_async(request))
+    return requests
+
+
+@pytest.fixture
+def service(http_requests):
+    return ClaimExtractionService(), http_requests
+
+
+def test_schema_is_compiled_once():
+    assert compile_response_model(ClaimExtractionResult) is compile_response_model(ClaimExtractionResult)
+    compiled = compile_response_model(ClaimExtractionResult)
+    assert compiled.openai_schema is compiled.openai_schema
+
+
+def test_static_prefix_is_identical_and_cached_tokens_are_counted(service):
+    service, requests = service
+    document_id = uuid.uuid4()
+    run_usage = TokenUsage()
+    with track_usage(run_usage):
+        for title in ("Intro", "Results"):
+            section = ParsedSection(document_id=document_id, title=title, content=f"{title} text.", level=1)
+            assert service.extract_claims(document_id, section)[0].claim_text == "x holds."
+
+    first, second = requests
+    assert json.dumps(first["tools"]) == json.dumps(second["tools"])
+    assert first["messages"][0] == second["messages"][0]
+    assert first["prompt_cache_key"] == second["prompt_cache_key"]
+
+    assert run_usage.as_dict() == {"requests": 2, "prompt_tokens": 3000, "cached_prompt_tokens": 1280,
+                                   "completion_tokens": 80, "cached_prompt_ratio": 0.4267}
+    assert service.usage.cached_prompt_tokens == 1280
+
+    # Outside track_usage only the service totals move
+    section = ParsedSection(document_id=document_id, title="Outro", content="Outro text.", level=1)
+    service.extract_claims(document_id, section)
+    assert run_usage.requests == 2 and service.usage.requests == 3
+    assert TokenUsage.from_dict(run_usage.as_dict()).as_dict() == run_usage.as_dict()
+
+
+def test_requests_pass_through_the_real_openai_client(http_requests):
+    service = ClaimExtractionService()
+    sink = InMemorySink()
+    service.telemetry = TelemetryExporter(sink, flush_interval_seconds=0.01)
+    document_id = uuid.uuid4()
+    sections = [ParsedSection(document_id=document_id, title=title, content=f"{title} text.", level=1)
+                for title in ("Intro", "Results")]
+
+    assert service.extract_claims(document_id, sections[0], raise_on_error=True)[0].claim_text == "x holds."
+    results = service.extract_claims_concurrently(document_id, sections, raise_on_error=True)
+    assert [claims[0].claim_text for claims in results] == ["x holds.", "x holds."]
+
+    assert len(http_requests) == 3
+    for body in http_requests:
+        assert body["metadata"]["document_id"] == str(document_id)
+        assert body["prompt_cache_key"] == service.prompt_cache_key
+        assert "tags" not in body and "name" not in body
+    assert service.usage.requests == 3
+
+    # Trace name and tags travel with the telemetry instead
+    assert service.telemetry.flush(timeout=5)
+    traces = sink.of_kind("trace")
+    assert {trace["id"] for trace in traces} == {generation["trace_id"] for generation in sink.of_kind("generation")}
+    assert traces[0]["tags"] == ["extraction", "fsa_phase1", "instructor"]
+    service.telemetry.close()
+
+
+def test_instructor_internals_used_by_compiled_models():
+    # compile_response_model patches Instructor internals; re-verify it before upgrading instructor
+    assert importlib.metadata.version("instructor").startswith(INSTRUCTOR_VERSION_SERIES)
+    compiled = compile_response_model(PackedClaimExtractionResult)
+    assert isinstance(inspect.getattr_static(compiled, "openai_schema"), classproperty)
+
+    # Instructor must use the compiled class as is, sending its cached schema object
+    response_model, kwargs = handle_response_model(compiled, mode=instructor.Mode.TOOLS)
+    assert response_model is compiled
+    assert kwargs["tools"][0]["function"] is compiled.openai_schema
+    assert "part" in compiled.openai_schema["parameters"]["$defs"]["PackedExtractedClaim"]["required"]
+
+
+def test_system_prefix_is_schema_neutral():
+    # The same prefix is sent with single and packed (PackedClaimExtractionResult) requests
+    assert "ClaimExtractionResult" not in CLAIM_EXTRACTION_SYSTEM_PROMPT
+    assert "tool schema" in CLAIM_EXTRACTION_SYSTEM_PROMPT
@@ -0,0 +1,114 @@
+import pickle
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from fsa.core.artifact_store import ArtifactStore
+from fsa.core.models import ParsedSection
+from fsa.orchestration.abstractions import WorkflowStep
+from fsa.orchestration.state import StepStatus, WorkflowState
+
+
+def make_state():
+    state = WorkflowState(workflow_name="offload", context={"arxiv_id": "1706.03762"})
+    document_id = uuid.uuid4()
+    state.sections = [ParsedSection(document_id=document_id, title=f"S{i}", content=f"section {i} " * 2000, level=1)
+                      for i in range(10)]
+    return state
+
+
+def test_checkpoint_holds_only_hashes(tmp_path):
+    store = ArtifactStore(str(tmp_path / "artifacts"))
+    state = make_state()
+    inline_size = len(state.model_dump_json())
+
+    state.offload_sections(store)
+    assert len(state.model_dump_json()) < inline_size / 50
+    assert all(store.refcount(section.content_hash) == 1 for section in state.sections)
+
+    state.checkpoint(str(tmp_path / "checkpoints"))
+    loaded = WorkflowState.load_checkpoint(state.run_id, str(tmp_path / "checkpoints"), artifact_store=store)
+    assert [s.content for s in loaded.sections] == [f"section {i} " * 2000 for i in range(10)]
+
+    unbound = WorkflowState.load_checkpoint(state.run_id, str(tmp_path / "checkpoints"))
+    with pytest.raises(RuntimeError, match="no ArtifactStore is bound"):
+        unbound.sections[0].content
+    unbound.bind_artifact_store(store)
+    assert unbound.sections[0].content == "section 0 " * 2000
+
+
+def test_legacy_inline_sections_still_load(tmp_path):
+    state = make_state()
+    state.checkpoint(str(tmp_path))
+    loaded = WorkflowState.load_checkpoint(state.run_id, str(tmp_path))
+    assert loaded.sections[3].content_hash is None
+    assert loaded.sections[3].content == state.sections[3].content
+    assert loaded.model_dump() == state.model_dump()
+
+
+def test_identical_sections_are_stored_once(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    first, second = make_state(), make_state()
+    first.offload_sections(store)
+    second.offload_sections(store)
+    assert [s.content_hash for s in first.sections] == [s.content_hash for s in second.sections]
+    assert store.refcount(first.sections[0].content_hash) == 2
+
+
+def test_offloaded_section_pickles_and_can_be_rewritten(tmp_path):
+    section = ParsedSection(document_id=uuid.uuid4(), title="Intro", content="We show x.", level=1)
+    section.offload(ArtifactStore(str(tmp_path)))
+    assert pickle.loads(pickle.dumps(section)).content == "We show x."
+
+    section.content = "We show y."
+    assert section.content_hash is None
+    assert section.model_dump()["content"] == "We show y."
+
+
+def test_section_requires_content_or_hash():
+    with pytest.raises(ValidationError):
+        ParsedSection(document_id=uuid.uuid4(), title="Empty", level=1)
+
+
+class ReadSectionsStep(WorkflowStep):
+    def __init__(self, artifact_store, agent):
+        super().__init__("Read_Sections", agent)
+        self.artifact_store = artifact_store
+
+    def execute(self, state):
+        state.context["lengths"] = [len(section.content) for section in state.sections]
+        return state
+
+
+def test_resumed_run_reads_sections_from_the_steps_store(tmp_path, make_engine, make_agent):
+    store = ArtifactStore(str(tmp_path / "configured"))
+    state = make_state()
+    state.offload_sections(store)
+    state.checkpoint(str(tmp_path / "checkpoints"))
+    resumed = WorkflowState.load_checkpoint(state.run_id, str(tmp_path / "checkpoints"))
+
+    # The engine's own artifact_dir points elsewhere; the steps' store wins
+    engine = make_engine(artifact_dir=str(tmp_path / "engine"))
+    resumed = engine.run_workflow([ReadSectionsStep(store, make_agent(artifact_dir=store.root))], resumed)
+
+    assert resumed.status == StepStatus.COMPLETED
+    assert resumed.context["lengths"] == [len(f"section {i} " * 2000) for i in range(10)]
+
+
+def test_held_section_text_is_read_from_the_store_once(tmp_path, monkeypatch):
+    store = ArtifactStore(str(tmp_path))
+    state = make_state()
+    state.offload_sections(store)
+    reads = []
+    real_get = store.get
+    monkeypatch.setattr(store, "get", lambda digest: reads.append(digest) or real_get(digest))
+
+    with state.holding_section_content(state.sections[:2]):
+        for _ in range(3):
+            assert [len(section.content) for section in state.sections[:2]] == [len("section 0 " * 2000)] * 2
+        assert "content" not in state.sections[0].model_dump()  # Checkpoints still hold only the hash
+    assert len(reads) == 2
+
+    state.sections[0].content
+    assert len(reads) == 3  # Released after the block
@@ -0,0 +1,156 @@
+import threading
+import time
+
+import pytest
+
+from fsa.core import observability
+from fsa.core.observability import InMemorySink, LangfuseSink, TelemetryExporter, TelemetryEvent, TelemetrySink
+from fsa.orchestration.abstractions import WorkflowStep
+from fsa.orchestration.state import StepStatus, WorkflowState
+
+
+class NoopStep(WorkflowStep):
+    def __init__(self, name, agent, fail=False):
+        super().__init__(name, agent)
+        self.fail = fail
+
+    def execute(self, state):
+        if self.fail:
+            raise RuntimeError("boom")
+        return state
+
+
+class BlockingSink(TelemetrySink):
+    def __init__(self):
+        self.release = threading.Event()
+        self.events = []
+
+    def export(self, events):
+        self.release.wait(timeout=5)
+        self.events.extend(events)
+
+
+def test_events_are_exported_in_batches():
+    sink = InMemorySink()
+    exporter = TelemetryExporter(sink, batch_size=100, flush_interval_seconds=0.05)
+
+    for i in range(250):
+        assert exporter.emit("score", name="n", value=i)
+    assert exporter.flush(timeout=5)
+
+    assert [event.data["value"] for event in sink.events] == list(range(250))
+    assert sink.batches >= 3
+    assert exporter.stats()["exported"] == 250
+    exporter.close()
+
+
+def test_full_queue_drops_instead_of_blocking():
+    sink = BlockingSink()
+    exporter = TelemetryExporter(sink, max_queue_size=5, batch_size=1, flush_interval_seconds=0.01)
+    exporter.emit("score", value=0)
+    time.sleep(0.1)  # The worker now blocks inside export()
+
+    started = time.monotonic()
+    accepted = [exporter.emit("score", value=i) for i in range(1, 21)]
+    assert time.monotonic() - started < 0.5
+    assert accepted.count(True) == 5
+    assert exporter.stats()["dropped"] == 15
+
+    sink.release.set()
+    assert exporter.flush(timeout=5)
+    assert len(sink.events) == 6
+    exporter.close()
+    assert not exporter.emit("score", value=99)
+
+
+def test_failing_sink_does_not_stop_the_exporter():
+    class FlakySink(InMemorySink):
+        def export(self, events):
+            if not self.batches:
+                self.batches += 1
+                raise RuntimeError("backend down")
+            super().export(events)
+
+    sink = FlakySink()
+    exporter = TelemetryExporter(sink, batch_size=1, flush_interval_seconds=0.01)
+    exporter.emit("score", value=1)
+    exporter.emit("score", value=2)
+    assert exporter.flush(timeout=5)
+    assert exporter.stats()["failed_batches"] == 1
+    assert [event.data["value"] for event in sink.events] == [2]
+    exporter.close()
+
+
+class FakeLangfuse:
+    def __init__(self, authenticated):
+        self.authenticated = authenticated
+        self.calls = []
+
+    def auth_check(self):
+        self.calls.append(("auth_check", {}))
+        return self.authenticated
+
+    def __getattr__(self, name):
+        return lambda **kwargs: self.calls.append((name, kwargs))
+
+
+def test_langfuse_sink_checks_auth_lazily():
+    client = FakeLangfuse(authenticated=True)
+    sink = LangfuseSink(client)
+    assert client.calls == []
+
+    sink.export([TelemetryEvent("trace", {"id": "t"}), TelemetryEvent("span_end", {"id": "s", "trace_id": "t"})])
+    sink.export([TelemetryEvent("score", {"name": "n", "value": 1.0})])
+
+    assert [name for name, _ in client.calls] == ["auth_check", "trace", "span", "score"]
+
+    rejected = FakeLangfuse(authenticated=False)
+    LangfuseSink(rejected).export([TelemetryEvent("trace", {"id": "t"})])
+    assert [name for name, _ in rejected.calls] == ["auth_check"]
+
+
+def test_langfuse_client_is_not_created_without_keys(monkeypatch):
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+    observability.get_langfuse_client.cache_clear()
+    try:
+        assert observability.get_langfuse_client() is None
+    finally:
+        observability.get_langfuse_client.cache_clear()
+
+
+@pytest.fixture
+def traced_engine(make_engine):
+    sink = InMemorySink()
+    exporter = TelemetryExporter(sink, flush_interval_seconds=0.01)
+    yield make_engine(telemetry=exporter), exporter, sink
+    exporter.close()
+
+
+def test_engine_traces_through_the_exporter(traced_engine, make_agent):
+    engine, exporter, sink = traced_engine
+    state = WorkflowState(workflow_name="traced", context={"arxiv_id": "1706.03762"})
+
+    state = engine.run_dag_workflow([NoopStep("fetch", make_agent()), NoopStep("parse", make_agent(), fail=True)], state)
+    assert exporter.flush(timeout=5)
+
+    assert state.status == StepStatus.FAILED
+    trace, = sink.of_kind("trace")
+    assert trace["id"] == str(state.run_id)
+    assert trace["metadata"] == {"start_context": {"arxiv_id": "1706.03762"}}
+    spans = sink.of_kind("span")
+    assert [span["name"] for span in spans] == ["Step_fetch", "Step_parse"]
+    ends = {end["id"]: end for end in sink.of_kind("span_end")}
+    assert set(ends) == {span["id"] for span in spans}
+    assert "error" in ends[spans[1]["id"]]["output"]
+    scores = {(score["name"], score.get("observation_id")): score["value"] for score in sink.of_kind("score")}
+    assert scores == {("step_success", spans[0]["id"]): 1.0, ("step_success", spans[1]["id"]): 0.0,
+                      ("workflow_success", None): 0.0}
+
+
+def test_sinks_must_implement_export():
+    class NoExport(TelemetrySink):
+        pass
+
+    with pytest.raises(TypeError):
+        NoExport()
@@ -0,0 +1,31 @@
+import uuid
+
+from fsa.core.artifact_store import ArtifactStore
+from fsa.core.models import ParsedSection
+
+
+def test_trusted_section_matches_validated_section(tmp_path):
+    document_id = uuid.uuid4()
+    trusted = ParsedSection.trusted(document_id, "2 Methods", "We train on WMT.", 2)
+    validated = ParsedSection(section_id=trusted.section_id, document_id=document_id, title="2 Methods",
+                              content="We train on WMT.", level=2)
+    assert trusted.model_dump() == validated.model_dump()
+    assert trusted.model_dump_json() == validated.model_dump_json()
+    assert ParsedSection.model_validate_json(trusted.model_dump_json()).content == "We train on WMT."
+
+    # Mutation and offloading behave like on a validated instance
+    trusted.title = "2 Method"
+    assert "title" in trusted.model_fields_set
+    trusted.offload(ArtifactStore(str(tmp_path)))
+    assert trusted.content == "We train on WMT."
+    assert "content" not in trusted.model_dump()
+
+
+def test_trusted_sections_do_not_share_state():
+    document_id = uuid.uuid4()
+    first = ParsedSection.trusted(document_id, "A", "a", 1)
+    second = ParsedSection.trusted(document_id, "B", "b", 1)
+    first.level = 3
+    assert first.section_id != second.section_id
+    assert second.level == 1 and "level" in second.model_fields_set
+    assert first.model_fields_set is not second.model_fields_set